@@ -0,0 +1,120 @@
+# 비동기 게임 루프
+# Game.run 의 흐름을 이벤트 루프 위에서 돌린다. 선택 지점까지는 평소처럼 동기로 진행하고,
+# 그 사이의 서술과 연출 대기는 AsyncNarrator 에 쌓아 두었다가 선택 직전에 await 하며 내보낸다.
+# 선택은 async decide(game, kind, options, subject) 를 가진 결정자에게 묻는다.
+# 세션 하나는 Game 과 서술 버퍼뿐이라 한 프로세스의 한 루프에서 수백 판을 동시에 돌릴 수 있다.
+#
+#   python async_game.py --sessions 500 --speed 0.01
+
+import abc
+import argparse
+import asyncio
+import inspect
+import time
+
+import i_was_bored
+
+# say/wait 를 (먼저 기다릴 초, 문구) 로 쌓는다. sink 는 보통 함수나 코루틴 함수 모두 된다.
+class AsyncNarrator(i_was_bored.Narrator):
+    def __init__(self, sink=None, pacing=True, speed=1.0):
+        super().__init__(sink, pacing)
+        self.speed = speed
+        self.pending = []
+        self.delay = 0.0
+
+    def say(self, text=""):
+        self.pending.append((self.delay, text))
+        self.delay = 0.0
+
+    def wait(self, seconds):
+        if self.pacing:
+            self.delay += seconds
+
+    async def flush(self):
+        pending, self.pending = self.pending, []
+        for delay, text in pending:
+            if delay and self.speed:
+                await asyncio.sleep(delay * self.speed)
+            if self.sink is not None:
+                result = self.sink(text)
+                if inspect.isawaitable(result):
+                    await result
+        if self.delay and self.speed:
+            await asyncio.sleep(self.delay * self.speed)
+        self.delay = 0.0
+
+# 비동기 결정자: decide 가 Decider.decide 처럼 고른 선택지의 번호를 돌려주되 await 할 수 있다
+class AsyncDecider(abc.ABC):
+    @abc.abstractmethod
+    async def decide(self, game, kind, options, subject=None):
+        pass
+
+# 기존 동기 결정자(RandomDecider, GreedyDecider 등)를 그대로 쓴다
+class SyncDecider(AsyncDecider):
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def decide(self, game, kind, options, subject=None):
+        return self.inner.decide(game, kind, options, subject)
+
+# 키보드 입력을 루프를 막지 않고 기다린다 (HumanDecider 와 같은 안내)
+class ConsoleDecider(AsyncDecider):
+    async def decide(self, game, kind, options, subject=None):
+        prompt = i_was_bored.HumanDecider.prompts[kind].format(n=len(options))
+        loop = asyncio.get_running_loop()
+        while True:
+            answer = await loop.run_in_executor(None, input, prompt)
+            try:
+                choice = int(answer)
+            except ValueError:
+                game.narrator.say("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
+            else:
+                if 1 <= choice <= len(options):
+                    return choice - 1
+                game.narrator.say("어둠 속에서 길을 잃었는가? 다시 선택하라.")
+            await game.narrator.flush()
+
+def new_game(decider=None, sink=None, speed=1.0, pacing=True, **kwargs):
+    narrator = AsyncNarrator(sink, pacing=pacing, speed=speed)
+    return i_was_bored.Game(headless=True, narrator=narrator, **kwargs), decider or ConsoleDecider()
+
+# Game.play 의 비동기판: 흐름을 돌리다 선택마다 서술을 내보내고 decider 를 await 한다
+async def play(game, decider, flow=None):
+    flow = flow or game.run()
+    narrator = game.narrator
+    try:
+        request = next(flow)
+        while True:
+            await narrator.flush()
+            choice = await decider.decide(game, request.kind, request.options, request.subject)
+            request = flow.send(choice)
+    except StopIteration as stop:
+        await narrator.flush()
+        return stop.value
+
+async def host(sessions, speed, seed=0, policy="greedy"):
+    from simulate import POLICIES
+
+    async def session(i):
+        game, decider = new_game(SyncDecider(POLICIES[policy](seed + i)), speed=speed, seed=seed + i)
+        return await play(game, decider), game.stage
+
+    return await asyncio.gather(*(session(i) for i in range(sessions)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="한 이벤트 루프에서 여러 판을 동시에 돌린다")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--speed", type=float, default=0.01, help="연출 대기 배율 (1 이면 실제 속도)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", default="greedy")
+    parser.add_argument("--play", action="store_true", help="키보드로 한 판을 직접 한다")
+    args = parser.parse_args()
+
+    if args.play:
+        game, decider = new_game(sink=print, speed=args.speed)
+        asyncio.run(play(game, decider))
+    else:
+        start = time.perf_counter()
+        results = asyncio.run(host(args.sessions, args.speed, args.seed, args.policy))
+        elapsed = time.perf_counter() - start
+        print(f"{args.sessions}판 동시 진행, {elapsed:.2f}s, 평균 도달 {sum(stage for _, stage in results) / len(results):.2f}장")
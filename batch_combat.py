@@ -0,0 +1,170 @@
+# NumPy 일괄 전투 엔진
+# Game.battle 의 기본 공격 주고받기를 수천 쌍의 플레이어/몬스터에 대해 한 번에 계산한다.
+# 생명, 공격, 방어, 민첩, 치명을 배열로 들고 take_damage 의 회피 상한(70%)과 방어 공식,
+# deal_damage 의 치명 배율을 벡터 연산으로 적용한다. 힘과 상태이상은 다루지 않는다.
+# 배속은 같은 조건(몬스터 힘 없음, 휘두르기만)의 실제 Game.battle(headless) 대비이다.
+# -n 5000, 3번 중 가장 빠른 값으로 10개 층 60마리를 재면 대략 90~290배 (대부분 100배 이상, 4층 하피 약 140배).
+#
+#   python batch_combat.py --stage 3 -n 20000
+
+import argparse
+import time
+
+import numpy as np
+
+import i_was_bored
+
+def character_stats(characters):
+    characters = list(characters)
+    return {
+        "hp": np.array([c.current_health for c in characters], dtype=np.float64),
+        "attack": np.array([c.attack for c in characters], dtype=np.float64),
+        "defense": np.array([c.defense for c in characters], dtype=np.float64),
+        "evasion": np.array([c.evasion for c in characters], dtype=np.float64),
+        "critical": np.array([c.critical for c in characters], dtype=np.float64),
+    }
+
+# 같은 캐릭터를 n 번 복제한 배열
+def repeat_stats(character, n):
+    return {key: np.repeat(value, n) for key, value in character_stats([character]).items()}
+
+# deal_damage 의 치명 배율: 1.5, 치명 100 초과분은 그대로 더한다
+def crit_multiplier(critical):
+    return np.where(critical > 100, 1.5 + critical / 100 - 1, 1.5)
+
+# 모든 쌍에서 같은 값이면 배열 대신 스칼라로 둔다 (한 몬스터를 n 번 붙이는 표에서는 생명 말고 다 그렇다)
+def collapse(values):
+    return values[0] if values.size and (values == values[0]).all() else values
+
+# 회피 확률, 치명 배율, 방어 나눗수처럼 전투 내내 바뀌지 않는 값은 미리 계산한다
+def prepare(stats):
+    attack, critical, evasion, defense = (collapse(stats[key]) for key in ("attack", "critical", "evasion", "defense"))
+    return {
+        "hp": stats["hp"].astype(np.float64),
+        "attack": attack,
+        "crit_chance": critical / 100,
+        "crit_mul": crit_multiplier(critical),
+        "evasion_chance": np.where(evasion > 0, np.minimum(evasion / 100, 70 / 100), 0.0),
+        "defense_div": 1 + defense / 100,
+    }
+
+# 공격자가 방어자를 때릴 때의 (회피 문턱, 치명 문턱, 보통 피해, 치명 피해). 쌍마다 전투 내내 같다.
+# 난수 하나 u 로 u < 회피 확률이면 회피, 그 위로 (1 - 회피) * 치명 확률 만큼이 치명이다.
+# round() 와 같은 짝수 반올림
+def strike_table(attacker, defender):
+    evasion_chance = defender["evasion_chance"]
+    crit_chance = np.clip(attacker["crit_chance"], 0.0, 1.0)
+    normal = np.maximum(1, np.rint(attacker["attack"] / defender["defense_div"]))
+    critical = np.maximum(1, np.rint(attacker["attack"] * attacker["crit_mul"] / defender["defense_div"]))
+    return [evasion_chance, evasion_chance + (1 - evasion_chance) * crit_chance, normal, critical]
+
+# 한 번씩 때렸을 때 실제로 깎이는 생명 (table 은 strike_table 의 네 값)
+def strike(roll, table):
+    evade_below, crit_below, normal, critical = table
+    return np.where(roll < crit_below, critical, normal) * (roll >= evade_below)
+
+# 스칼라는 그대로, 배열은 keep 인 쌍만 남긴다
+def keep_rows(table, keep):
+    return [value if np.ndim(value) == 0 else value[keep] for value in table]
+
+# 살아 있는 쌍만 모은 열로 턴을 돌리고, 전투가 끝난 쌍이 생길 때만 다시 모은다
+def resolve(player, monster, rng=None, max_turns=10000):
+    if rng is None or isinstance(rng, int):
+        rng = np.random.default_rng(rng)
+    player, monster = prepare(player), prepare(monster)
+    p_hp_out = player["hp"].copy()
+    m_hp_out = monster["hp"].copy()
+    n = p_hp_out.shape[0]
+    turns = np.zeros(n, dtype=np.int32)
+    active = np.flatnonzero((p_hp_out > 0) & (m_hp_out > 0))
+    to_monster = keep_rows(strike_table(player, monster), active)
+    to_player = keep_rows(strike_table(monster, player), active)
+    p_hp, m_hp = p_hp_out[active], m_hp_out[active]
+    for turn in range(1, max_turns + 1):
+        if active.size == 0:
+            break
+        rolls = rng.random((2, active.size))
+        m_hp -= strike(rolls[0], to_monster)
+        m_alive = m_hp > 0
+        p_hp -= strike(rolls[1], to_player) * m_alive
+        alive = m_alive & (p_hp > 0)
+        if alive.all():
+            continue
+        done = ~alive
+        turns[active[done]] = turn
+        p_hp_out[active[done]] = np.maximum(p_hp[done], 0)
+        m_hp_out[active[done]] = np.maximum(m_hp[done], 0)
+        active = active[alive]
+        p_hp, m_hp = p_hp[alive], m_hp[alive]
+        to_monster, to_player = keep_rows(to_monster, alive), keep_rows(to_player, alive)
+    # max_turns 안에 끝나지 않은 쌍
+    turns[active] = max_turns
+    p_hp_out[active] = p_hp
+    m_hp_out[active] = m_hp
+    return {
+        "player_won": (m_hp_out <= 0) & (p_hp_out > 0),
+        "turns": turns,
+        "player_hp": p_hp_out,
+        "monster_hp": m_hp_out,
+    }
+
+# 비교용: 같은 교환을 실제 Game.battle 로 한 판씩 돌린다.
+# 배열 엔진과 같은 조건이 되도록 몬스터의 힘은 빼고, 플레이어는 늘 휘두르기를 고르고, 전투 보상은 건너뛴다.
+class AttackOnly(i_was_bored.Decider):
+    def decide(self, game, kind, options, subject=None):
+        return 0
+
+class FightOnlyGame(i_was_bored.Game):
+    def battle_reward(self, is_boss):
+        return
+        yield
+
+def object_resolve(player_template, monster_template, n, seed=None):
+    game = FightOnlyGame(headless=True, decider=AttackOnly(), seed=seed)
+    ended = []
+    game.events.subscribe(i_was_bored.BattleEnded, ended.append)
+    wins, turns, hp = [], [], []
+    for _ in range(n):
+        for key in ("max_health", "current_health", "attack", "defense", "evasion", "critical"):
+            setattr(game.player, key, getattr(player_template, key))
+        monster = monster_template.clone()
+        monster.skills = []
+        monster.narrator, monster.rng, monster.events = game.narrator, game.combat_rng, game.events
+        won = game.play(game.battle(monster))
+        wins.append(won)
+        turns.append(ended[-1].turns)
+        hp.append(game.player.current_health)
+    return {
+        "player_won": np.array(wins),
+        "turns": np.array(turns),
+        "player_hp": np.array(hp, dtype=np.float64),
+    }
+
+# 가장 빠른 한 번의 (결과, 걸린 시간) — 잡음이 큰 기계에서 한 번만 재면 배속이 크게 흔들린다
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일괄 전투 엔진과 객체 전투 비교")
+    parser.add_argument("--stage", type=int, default=1)
+    parser.add_argument("-n", "--fights", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="각 엔진을 몇 번 재서 가장 빠른 시간을 쓸지")
+    args = parser.parse_args()
+
+    game = i_was_bored.Game(headless=True, seed=args.seed)
+    player = game.player
+    resolve(repeat_stats(player, 16), repeat_stats(player, 16), args.seed)
+    print(" 몬스터                  승률(배열) 승률(객체)  턴(배열) 턴(객체)   배속")
+    for template in [m for m in game.all_monsters if m.stage == args.stage]:
+        batch, batch_time = best_of(args.repeat, lambda: resolve(repeat_stats(player, args.fights),
+                                                                 repeat_stats(template, args.fights), args.seed))
+        ref, ref_time = best_of(args.repeat, object_resolve, player, template, args.fights, args.seed)
+        print(f" {template.name:<20} {batch['player_won'].mean():>10.3f} {ref['player_won'].mean():>10.3f}"
+              f" {batch['turns'].mean():>9.2f} {ref['turns'].mean():>8.2f} {ref_time / batch_time:>7.0f}x")
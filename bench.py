@@ -0,0 +1,165 @@
+# 전투/진행 핫패스 벤치마크
+# 마이크로: take_damage, deal_damage, add_status_effect, _apply_stat_modifiers,
+#           상태이상이 많이 걸린 after_turn_effects (다시 채우고 만료될 때까지)
+# 매크로: Game() 생성, get_random_monster, skill_offers, headless 10장 한 판
+# 결과는 JSON 으로 남기고, --compare 로 저장해 둔 기준과 비교한다.
+#
+#   python bench.py -o baseline.json
+#   python bench.py --compare baseline.json
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import i_was_bored
+
+MANY_EFFECTS = 50
+BENCHMARKS = {}
+
+def benchmark(name, loops):
+    def register(setup):
+        BENCHMARKS[name] = (setup, loops)
+        return setup
+    return register
+
+# 죽지 않는 플레이어와 몬스터 (서술은 버린다)
+def fighters(seed=0):
+    game = i_was_bored.Game(headless=True, seed=seed)
+    monster = game.get_random_monster(5, is_boss=False)
+    for character in (game.player, monster):
+        character.max_health = character.current_health = 10 ** 12
+    return game, game.player, monster
+
+# durations 를 돌려 가며 지속 시간으로 쓴다 (기본은 끝나지 않는 효과)
+def stack_effects(character, count, durations=(10 ** 9,)):
+    for i in range(count):
+        character.add_status_effect(i_was_bored.StatusEffect(f"효과{i}", durations[i % len(durations)],
+                                                             attack_modifier=1, damage_taken_modifier=0.01))
+
+@benchmark("take_damage", 20000)
+def bench_take_damage():
+    game, player, monster = fighters()
+    return lambda: monster.take_damage(37)
+
+@benchmark("deal_damage", 20000)
+def bench_deal_damage():
+    game, player, monster = fighters()
+    return lambda: player.deal_damage(monster, player.attack)
+
+@benchmark("add_status_effect", 20000)
+def bench_add_status_effect():
+    game, player, monster = fighters()
+    stack_effects(player, 5)
+    effect = i_was_bored.StatusEffect("전투의 함성", 5, attack_modifier=10)
+    return lambda: player.add_status_effect(effect)
+
+@benchmark("_apply_stat_modifiers", 20000)
+def bench_apply_stat_modifiers():
+    game, player, monster = fighters()
+    stack_effects(player, 5)
+    return player._apply_stat_modifiers
+
+# 스킬이 거는 것처럼 1~5턴짜리 효과를 다시 채우고, 모두 끝날 때까지 턴을 넘긴다 (만료 경로 포함)
+@benchmark("after_turn_effects_many", 400)
+def bench_after_turn_effects():
+    game, player, monster = fighters()
+    def turns():
+        stack_effects(player, MANY_EFFECTS, durations=(1, 2, 3, 4, 5))
+        while player.status_effects:
+            player.after_turn_effects()
+    return turns
+
+@benchmark("game_init", 200)
+def bench_game_init():
+    return lambda: i_was_bored.Game(headless=True, seed=0)
+
+@benchmark("get_random_monster", 20000)
+def bench_get_random_monster():
+    game = i_was_bored.Game(headless=True, seed=0)
+    return lambda: game.get_random_monster(5, is_boss=False)
+
+@benchmark("skill_offers", 20000)
+def bench_skill_offers():
+    game = i_was_bored.Game(headless=True, seed=0)
+    for name in ("찌르기", "꿰뚫기", "분쇄"):
+        game.play(game.add_or_level_up_skill(game.all_skills_map[name]))
+    return lambda: game.skill_offers(is_boss=False)
+
+@benchmark("full_run_greedy", 20)
+def bench_full_run():
+    seeds = iter(range(10 ** 9))
+    return lambda: i_was_bored.Game(headless=True, decider=i_was_bored.GreedyDecider(), seed=next(seeds)).start()
+
+# 같은 준비를 repeat 번 다시 하고 가장 빠른 회당 시간을 쓴다
+def measure(setup, loops, repeat):
+    timings = []
+    for _ in range(repeat):
+        func = setup()
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops)
+    timings.sort()
+    return {"loops": loops, "repeat": repeat, "best_ns": timings[0] * 1e9, "median_ns": timings[len(timings) // 2] * 1e9}
+
+def run(names=None, repeat=5, scale=1.0):
+    results = {}
+    for name, (setup, loops) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        results[name] = measure(setup, max(1, int(loops * scale)), repeat)
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def format_ns(ns):
+    for unit, size in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= size:
+            return f"{ns / size:.2f}{unit}"
+    return f"{ns:.0f}ns"
+
+# 기준 대비 threshold 이상 느려진 항목 이름을 돌려준다
+def compare(current, baseline, threshold):
+    regressions = []
+    print(f"{'항목':<26}{'기준':>12}{'현재':>12}{'비율':>9}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"{name:<26}{'-':>12}{format_ns(result['best_ns']):>12}")
+            continue
+        ratio = result["best_ns"] / base["best_ns"]
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  느려짐"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            mark = "  빨라짐"
+        print(f"{name:<26}{format_ns(base['best_ns']):>12}{format_ns(result['best_ns']):>12}{ratio:>8.2f}x{mark}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="i_was_bored 벤치마크")
+    parser.add_argument("names", nargs="*", help="돌릴 항목 (기본: 전부)")
+    parser.add_argument("-o", "--output", help="결과 JSON 을 저장할 경로")
+    parser.add_argument("--compare", help="비교할 기준 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="느려짐으로 볼 비율 (기본 0.10)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="반복 횟수 배율")
+    args = parser.parse_args()
+
+    current = run(args.names, args.repeat, args.scale)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+    else:
+        for name, result in current["results"].items():
+            print(f"{name:<26}{format_ns(result['best_ns']):>12}")
@@ -0,0 +1,26 @@
+# 콘텐츠 파일 도구
+#   python content.py export content/   기본 콘텐츠를 JSON 파일로 내보낸다
+#   python content.py check content/    폴더의 콘텐츠를 검사하고 캐시를 만든다
+
+import argparse
+import sys
+
+import i_was_bored
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="i_was_bored 콘텐츠 파일 도구")
+    parser.add_argument("command", choices=("export", "check"))
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        content = i_was_bored.Catalog.shared().export_content()
+        i_was_bored.save_content(content, args.path)
+        print(", ".join(f"{table} {len(rows)}개" for table, rows in content.items()) + f" -> {args.path}")
+    else:
+        try:
+            catalog = i_was_bored.load_catalog(args.path)
+        except i_was_bored.ContentError as e:
+            print(e)
+            sys.exit(1)
+        print(f"힘 {len(catalog.all_skills)}개, 장비 {len(catalog.all_equipment)}개, 몬스터 {len(catalog.all_monsters)}개")
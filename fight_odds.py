@@ -0,0 +1,481 @@
+# 정확한 전투 결과 계산기
+# Game.battle 의 주고받기를 (플레이어 생명, 몬스터 생명) 상태의 마르코프 연쇄로 보고
+# 승률, 기대 턴 수, 남은 생명 분포를 표본 없이 정확히 계산한다.
+# 플레이어는 기본 공격만 하고, 몬스터는 monster_turn 처럼 30% 확률로 힘을 고른다.
+# take_damage 의 회피 상한(70%)과 방어 나눗수, deal_damage 의 치명 배율을 그대로 따른다.
+# 힘은 EFFECT_SPECS 의 hit/damage/heal 단계(let/if 포함)를 풀 수 있다. 회복은 생명만 바꾸므로 같은 상태에 담기지만
+# 생명이 다시 늘어나는 전이가 생기므로, 회복이 있는 전투는 한 번의 순회 대신 강하게 연결된 성분별 반복법으로 풀고
+# 거의 일어나지 않는 상태(가장 그럴듯한 경로 확률 1e-16 미만)는 펼치지 않는다. 버린 확률은 결과의 "dropped" 이다.
+# 상태이상은 남은 턴과 능력치 변화까지 상태에 있어야 하므로, 상태이상을 거는 힘이나 이미 상태이상이
+# 걸린 전투는 틀린 값을 내지 않고 UnsupportedFight 를 낸다.
+#
+#   python fight_odds.py --stage 3
+
+import argparse
+import heapq
+import time
+import types
+from collections import defaultdict
+
+import i_was_bored
+
+MONSTER_SKILL_CHANCE = 0.3
+# 생명 두 개만으로 나타낼 수 있는 단계
+SUPPORTED_STEPS = frozenset(("say", "wait", "hit", "damage", "heal", "let", "if"))
+CACHE_LIMIT = 4096
+STAT_FIELDS = ("name", "max_health", "current_health", "attack", "defense", "evasion", "critical",
+               "_damage_taken_modifier", "_damage_dealt_modifier")
+
+# 계산에 쓰는 능력치만 떼어 낸 사본 (힘 수식의 caster/target 자리에 들어간다)
+def snapshot(character, current_health=None):
+    stats = types.SimpleNamespace(**{field: getattr(character, field) for field in STAT_FIELDS})
+    if current_health is not None:
+        stats.current_health = current_health
+    return stats
+
+# take_damage: 회피하면 0, 아니면 방어로 나누고 받는 피해 배율을 곱한다
+def landed(damage, receiver):
+    evasion_chance = min(receiver.evasion / 100, 70 / 100) if receiver.evasion > 0 else 0.0
+    taken_mul = max(0.0, min(1.0 + receiver._damage_taken_modifier, 10.0))
+    amount = round(max(1, round(damage / (1 + receiver.defense / 100))) * taken_mul)
+    return [(0, evasion_chance), (amount, 1 - evasion_chance)]
+
+# deal_damage: 치명 판정 뒤 take_damage
+def struck(base_damage, dealer, receiver):
+    crit_chance = min(max(dealer.critical / 100, 0.0), 1.0)
+    crit_mul = 1.5
+    if dealer.critical > 100:
+        crit_mul += dealer.critical / 100 - 1
+    dealt_mul = max(0.0, min(1.0 + dealer._damage_dealt_modifier, 10.0))
+    outcomes = []
+    for mul, chance in ((1.0, 1 - crit_chance), (crit_mul, crit_chance)):
+        outcomes += [(amount, chance * p) for amount, p in landed(base_damage * mul * dealt_mul, receiver)]
+    return outcomes
+
+def merge_outcomes(outcomes):
+    merged = defaultdict(float)
+    for key, p in outcomes:
+        if p > 0:
+            merged[key] += p
+    return list(merged.items())
+
+# 이 모델로 풀 수 없는 전투
+class UnsupportedFight(ValueError):
+    pass
+
+# 변화 목록 끝에 (플레이어 쪽인가, 깎이는 양)을 붙인다. 회복은 음수이고, 같은 쪽의 같은 부호는 합친다
+def push_change(changes, to_player, amount):
+    if amount == 0:
+        return changes
+    if changes and changes[-1][0] == to_player and (changes[-1][1] > 0) == (amount > 0):
+        return changes[:-1] + ((to_player, changes[-1][1] + amount),)
+    return changes + ((to_player, amount),)
+
+# (플레이어가 받는 피해, 몬스터가 받는 피해) 를 차례 있는 변화 목록으로
+def as_changes(outcome):
+    return push_change(push_change((), True, outcome[0]), False, outcome[1])
+
+# 힘 한 번이 (플레이어가 받는 피해, 몬스터가 받는 피해)로 나뉘는 분포
+# ordered 이면 회복이 최대 생명에서 잘리는 순서를 지키도록 변화 목록(push_change)으로 나눈다
+# steps 는 skill.effect.outcomes 로 수치를 계산한 단계들이다
+def skill_outcomes(steps, monster, player, ordered=False):
+    roles = {"caster": monster, "target": player}
+    outcomes = [((), 1.0)] if ordered else [((0, 0), 1.0)]
+    for step in steps:
+        if step[0] == "hit":
+            dist = struck(step[3], roles[step[1]], roles[step[2]])
+        elif step[0] == "damage":
+            dist = landed(step[2], roles[step[1]])
+        elif step[0] == "heal" and ordered:
+            dist = [(-step[2], 1.0)]
+        elif step[0] == "heal":
+            raise UnsupportedFight("회복 단계는 ordered 로만 나눌 수 있다")
+        else:
+            continue
+        to_player = roles[step[-2]] is player
+        if ordered:
+            outcomes = merge_outcomes((push_change(changes, to_player, amount), p * q)
+                                      for changes, p in outcomes for amount, q in dist)
+        else:
+            outcomes = merge_outcomes(((dp + amount, dm) if to_player else (dp, dm + amount), p * q)
+                                      for (dp, dm), p in outcomes for amount, q in dist)
+    return outcomes
+
+# 단계 목록(if 안까지)에 나오는 단계 종류
+def step_kinds(steps):
+    for step in steps:
+        yield step[0]
+        if step[0] == "if":
+            yield from step_kinds(step[2])
+
+# 단계 목록(if 안까지)이 계산하는 수식들
+def step_expressions(steps):
+    for step in steps:
+        kind = step[0]
+        if kind == "say" and len(step) > 2:
+            yield from step[2].values()
+        elif kind == "hit":
+            yield step[3]
+        elif kind in ("damage", "heal", "let"):
+            yield step[2]
+        elif kind == "status":
+            yield step[3]
+            yield from step[4].values()
+        elif kind == "if":
+            yield step[1]
+            yield from step_expressions(step[2])
+
+# 수식이 읽는 이름들 ("level", "target.current_health" 등)
+def expression_names(expr):
+    if isinstance(expr, str):
+        yield expr
+    elif isinstance(expr, (list, tuple)):
+        for arg in expr[1:]:
+            yield from expression_names(arg)
+
+# 단계들이 생명을 읽는 쪽 ("caster", "target")
+def health_readers(steps):
+    return {name.partition(".")[0] for expr in step_expressions(steps) for name in expression_names(expr)
+            if name.endswith(".current_health")}
+
+# 이 모델로 풀 수 없는 까닭 (풀 수 있으면 None). 마지막 인자가 몬스터다
+def unsupported_reason(*characters):
+    for character in characters:
+        if getattr(character, "status_effects", None):
+            return f"{character.name}: 상태이상이 걸린 채로 시작하는 전투는 풀 수 없다"
+    monster = characters[-1]
+    for skill in monster.skills:
+        unsupported = set(step_kinds(skill.effect.steps)) - SUPPORTED_STEPS
+        if unsupported:
+            return f"{monster.name}: 힘 '{skill.name}' ({skill.effect.name}) 의 {'/'.join(sorted(unsupported))} 단계는 풀 수 없다"
+    return None
+
+class FightModel:
+    def __init__(self, player, monster):
+        reason = unsupported_reason(player, monster)
+        if reason:
+            raise UnsupportedFight(reason)
+        self.player = snapshot(player)
+        self.monster = snapshot(monster)
+        self.player_attack = merge_outcomes(struck(self.player.attack, self.player, self.monster))
+        self.monster_attack = [((amount, 0), p) for amount, p in
+                               merge_outcomes(struck(self.monster.attack, self.monster, self.player))]
+        self.skills = list(monster.skills)
+        # 회복이 있으면 행동을 변화 목록(push_change)으로 들고, 상태마다 차례로 적용한다
+        self.heals = any("heal" in step_kinds(skill.effect.steps) for skill in self.skills)
+        if self.heals:
+            self.monster_attack = [(as_changes(outcome), p) for outcome, p in self.monster_attack]
+        # 생명에 따라 달라지는 힘(처형 등)은 그 힘이 읽는 쪽의 생명마다 한 번만 단계 수치를 계산하고,
+        # 수치가 같으면 (예: 처형 문턱의 같은 쪽) 전에 만든 분포를 그대로 쓴다
+        readers = set().union(*(health_readers(skill.effect.steps) for skill in self.skills))
+        self.reads_player = "target" in readers
+        self.reads_monster = "caster" in readers
+        self._player_at = snapshot(self.player)
+        self._monster_at = snapshot(self.monster)
+        self._actions = {}
+        self._by_health = {}
+        self.fixed_actions = self._monster_actions(self.player.current_health, self.monster.current_health)
+
+    def _monster_actions(self, player_hp, monster_hp):
+        if not self.skills:
+            return self.monster_attack
+        self._player_at.current_health = player_hp
+        self._monster_at.current_health = monster_hp
+        key = tuple(tuple(skill.effect.outcomes(self._monster_at, self._player_at, skill)) for skill in self.skills)
+        actions = self._actions.get(key)
+        if actions is None:
+            actions = [(outcome, p * (1 - MONSTER_SKILL_CHANCE)) for outcome, p in self.monster_attack]
+            share = MONSTER_SKILL_CHANCE / len(self.skills)
+            for steps in key:
+                actions += [(outcome, p * share)
+                            for outcome, p in skill_outcomes(steps, self.monster, self.player, self.heals)]
+            actions = self._actions[key] = merge_outcomes(actions)
+        return actions
+
+    def monster_actions(self, player_hp, monster_hp):
+        if not (self.reads_player or self.reads_monster):
+            return self.fixed_actions
+        key = (player_hp if self.reads_player else None, monster_hp if self.reads_monster else None)
+        actions = self._by_health.get(key)
+        if actions is None:
+            actions = self._by_health[key] = self._monster_actions(player_hp, monster_hp)
+        return actions
+
+    # 한 턴(플레이어 공격, 살아 있으면 몬스터 행동) 뒤의 상태와 확률
+    def transitions(self, player_hp, monster_hp):
+        for dealt, p in self.player_attack:
+            left = monster_hp - dealt
+            if left <= 0:
+                yield (player_hp, 0), p
+                continue
+            if self.heals:
+                for changes, q in self.monster_actions(player_hp, left):
+                    yield self.apply(changes, player_hp, left), p * q
+                continue
+            for (to_player, to_monster), q in self.monster_actions(player_hp, left):
+                yield (max(player_hp - to_player, 0), max(left - to_monster, 0)), p * q
+
+    # 변화 목록을 차례로 적용한다: 피해는 0 에서, 회복은 최대 생명에서 멈춘다 (take_damage, heal)
+    # 회복량이 소수이면 (최대 생명 * 0.2 등) 더하고 빼는 순서마다 부동소수 오차가 달라 같은 생명이
+    # 서로 다른 상태로 갈라지므로, 소수 9자리에서 반올림해 한 상태로 모은다
+    def apply(self, changes, player_hp, monster_hp):
+        for to_player, amount in changes:
+            if to_player:
+                player_hp = max(player_hp - amount, 0) if amount > 0 else min(player_hp - amount, self.player.max_health)
+            else:
+                monster_hp = max(monster_hp - amount, 0) if amount > 0 else min(monster_hp - amount, self.monster.max_health)
+        return round(player_hp, 9), round(monster_hp, 9)
+
+def summary(win, loss, turns, hp, states, dropped=0.0):
+    return {
+        "win": win,
+        "loss": loss,
+        "turns": turns,
+        "hp": dict(sorted(hp.items())),
+        "expected_hp": sum(h * p for h, p in hp.items()),
+        "states": states,
+        "dropped": dropped,
+    }
+
+# 상태를 두 생명의 합이 큰 것부터 처리한다. 자기 자신으로 돌아오는 턴(둘 다 회피 등)만 빼면
+# 모든 전이는 합을 줄이므로, 들어온 확률을 앞으로 밀어내는 한 번의 순회로 끝난다.
+# 회복이 있으면 합이 다시 커지는 전이가 생기므로 solve_with_heals 로 푼다.
+def solve(player, monster, max_states=2_000_000):
+    model = FightModel(player, monster)
+    start = (model.player.current_health, model.monster.current_health)
+    if model.heals:
+        return solve_with_heals(model, start, max_states)
+    mass = {start: 1.0}
+    queue = [(-(start[0] + start[1]), start)]
+    win = loss = turns = 0.0
+    hp = defaultdict(float)
+    states = 0
+    while queue:
+        _, state = heapq.heappop(queue)
+        p = mass.pop(state)
+        states += 1
+        if states > max_states:
+            raise RuntimeError(f"상태가 너무 많다 ({max_states})")
+        outgoing = []
+        stay = 0.0
+        for nxt, q in model.transitions(*state):
+            if nxt == state:
+                stay += q
+            else:
+                outgoing.append((nxt, q))
+        if stay >= 1.0:
+            raise RuntimeError(f"끝나지 않는 전투 (상태 {state})")
+        # 머무는 턴까지 합친 이 상태의 기대 방문 횟수
+        visits = p / (1 - stay)
+        turns += visits
+        for (player_hp, monster_hp), q in outgoing:
+            flow = visits * q
+            if player_hp <= 0:
+                loss += flow
+                hp[0] += flow
+            elif monster_hp <= 0:
+                win += flow
+                hp[player_hp] += flow
+            else:
+                nxt = (player_hp, monster_hp)
+                if nxt not in mass:
+                    mass[nxt] = 0.0
+                    heapq.heappush(queue, (-(player_hp + monster_hp), nxt))
+                mass[nxt] += flow
+    return summary(win, loss, turns, hp, states)
+
+# 강하게 연결된 성분 (타잔). 앞 성분에서 뒤 성분으로만 흐르도록 위상 순서로 돌려준다
+# successors[i] 는 (다음 상태 번호, 확률) 목록이다
+def components(successors):
+    order = [-1] * len(successors)
+    low = [0] * len(successors)
+    on_stack = [False] * len(successors)
+    stack = []
+    result = []
+    counter = 0
+    for root in range(len(successors)):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(successors[root]))]
+        while work:
+            v, edges = work[-1]
+            for w, _ in edges:
+                if order[w] < 0:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(successors[w])))
+                    break
+                if on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == order[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    result.append(component)
+    result.reverse()
+    return result
+
+# 회복이 있으면 생명 합이 다시 커지는 전이가 생겨 한 번의 순회로는 끝나지 않는다.
+# 소수 회복량(최대 생명 * 0.15 등)은 생명을 잘게 나눠 닿을 수 있는 상태가 두 생명의 모든 조합에 가까워지지만
+# 대부분은 거의 일어나지 않으므로, 가장 그럴듯한 경로의 확률이 cutoff 이상인 상태만 (다익스트라 순서로) 펼친다.
+# 펼친 상태들의 기대 방문 횟수 v(s) = [s 가 시작] + Σ v(앞 상태) q 는 강하게 연결된 성분을 위상 순서로 풀고,
+# 회복으로 고리가 생긴 성분만 가우스-자이델로 방문 횟수가 tolerance 보다 덜 바뀔 때까지 되풀이한다.
+# 펼치지 않은 상태로 흘러간 확률은 "dropped" 로 돌려준다 (승률 + 패율 + dropped = 1).
+def solve_with_heals(model, start, max_states=2_000_000, cutoff=1e-16, tolerance=1e-13, max_sweeps=100_000):
+    best = {start: 1.0}
+    queue = [(-1.0, start)]
+    index = {}
+    states = []
+    moves = []
+    while queue:
+        chance, state = heapq.heappop(queue)
+        if state in index:
+            continue
+        index[state] = len(states)
+        if len(states) >= max_states:
+            raise RuntimeError(f"상태가 너무 많다 ({max_states})")
+        states.append(state)
+        outgoing = list(model.transitions(*state))
+        moves.append(outgoing)
+        for nxt, q in outgoing:
+            reach = -chance * q
+            if nxt[0] > 0 and nxt[1] > 0 and reach >= cutoff and reach > best.get(nxt, 0.0):
+                best[nxt] = reach
+                heapq.heappush(queue, (-reach, nxt))
+    successors = [[] for _ in states]
+    stay = [0.0] * len(states)
+    exits = []
+    for i, (state, outgoing) in enumerate(zip(states, moves)):
+        for nxt, q in outgoing:
+            j = index.get(nxt)
+            if nxt == state:
+                stay[i] += q
+            elif j is not None:
+                successors[i].append((j, q))
+            else:
+                exits.append((i, nxt, q))
+        if stay[i] >= 1.0:
+            raise RuntimeError(f"끝나지 않는 전투 (상태 {state})")
+    inflow = [0.0] * len(states)
+    inflow[0] = 1.0
+    visits = [0.0] * len(states)
+    for component in components(successors):
+        if len(component) == 1:
+            i = component[0]
+            visits[i] = inflow[i] / (1 - stay[i])
+            for j, q in successors[i]:
+                inflow[j] += visits[i] * q
+            continue
+        members = set(component)
+        inner = {j: [] for j in component}
+        for i in component:
+            for j, q in successors[i]:
+                if j in members:
+                    inner[j].append((i, q))
+        component.sort(key=lambda i: -(states[i][0] + states[i][1]))
+        for _ in range(max_sweeps):
+            change = 0.0
+            for j in component:
+                value = (inflow[j] + sum(visits[i] * q for i, q in inner[j])) / (1 - stay[j])
+                change = max(change, abs(value - visits[j]))
+                visits[j] = value
+            if change <= tolerance:
+                break
+        else:
+            raise RuntimeError(f"{max_sweeps}번 순회해도 수렴하지 않는다")
+        for i in component:
+            for j, q in successors[i]:
+                if j not in members:
+                    inflow[j] += visits[i] * q
+    win = loss = dropped = 0.0
+    hp = defaultdict(float)
+    for i, (player_hp, monster_hp), q in exits:
+        flow = visits[i] * q
+        if player_hp <= 0:
+            loss += flow
+            hp[0] += flow
+        elif monster_hp <= 0:
+            win += flow
+            hp[player_hp] += flow
+        else:
+            dropped += flow
+    return summary(win, loss, sum(visits), hp, len(states), dropped)
+
+# 같은 능력치, 같은 힘 조합이면 다시 풀지 않는다 (밸런스 표처럼 같은 쌍을 반복해서 물을 때)
+_results = {}
+
+def odds(player, monster):
+    key = (tuple(getattr(player, field) for field in STAT_FIELDS[1:]),
+           tuple(getattr(monster, field) for field in STAT_FIELDS[1:]),
+           tuple((skill.effect.name, skill.level, skill.power) for skill in monster.skills))
+    result = _results.get(key)
+    if result is None:
+        if len(_results) >= CACHE_LIMIT:
+            _results.clear()
+        result = _results[key] = solve(player, monster)
+    return result
+
+# 비교용: 같은 교환을 Game.monster_turn 으로 한 판씩 돌린다 (상태이상도 실제로 걸린다)
+def sampled(player_template, monster_template, n, seed=0):
+    game = i_was_bored.Game(headless=True, seed=seed)
+    wins = turns = 0
+    for _ in range(n):
+        player = i_was_bored.Player(player_template.name)
+        for key in i_was_bored.PLAYER_STATE_FIELDS:
+            setattr(player, key, getattr(player_template, key))
+        player.narrator, player.rng = game.narrator, game.combat_rng
+        game.player = player
+        monster = monster_template.clone()
+        monster.narrator, monster.rng = game.narrator, game.combat_rng
+        while player.is_alive() and monster.is_alive():
+            turns += 1
+            if player.apply_turn_effects():
+                player.deal_damage(monster, player.attack)
+            player.after_turn_effects()
+            if not monster.is_alive():
+                break
+            if monster.apply_turn_effects():
+                game.monster_turn(monster)
+            if not player.is_alive():
+                break
+            monster.after_turn_effects()
+        wins += player.is_alive()
+    return wins / n, turns / n
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기본 공격 교환의 정확한 승률 계산")
+    parser.add_argument("--stage", type=int, default=1)
+    parser.add_argument("--check", type=int, default=0, help="표본 전투 수 (0 이면 비교하지 않음)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = i_was_bored.Game(headless=True, seed=args.seed)
+    print(" 몬스터                     승률    기대턴  남은생명    상태수     시간" + ("  승률(표본) 턴(표본)" if args.check else ""))
+    for template in [m for m in game.all_monsters if m.stage == args.stage]:
+        start = time.perf_counter()
+        try:
+            result = solve(game.player, template)
+        except UnsupportedFight as error:
+            print(f" {template.name:<20} 계산 불가: {error}")
+            continue
+        elapsed = time.perf_counter() - start
+        line = (f" {template.name:<20} {result['win']:>10.4f} {result['turns']:>9.2f} {result['expected_hp']:>9.1f}"
+                f" {result['states']:>9} {elapsed * 1e6:>7.0f}us")
+        if args.check:
+            win, turns = sampled(game.player, template, args.check, args.seed)
+            line += f" {win:>11.4f} {turns:>8.2f}"
+        print(line)
@@ -37,11 +37,234 @@ help_text = r"""
                             Enter 를 눌러 게임 시작...
 """
 
+import copy
+import functools
+import hashlib
+import itertools
+import json
+import operator
+import os
 import random
+import sys
 import time
+import types
+import zlib
+
+# --- 연출 클래스 ---
+# 서술과 연출 대기를 한 곳에서 처리한다.
+# headless 에서는 대기를 건너뛰고, sink 가 None 이면 서술을 버린다.
+class Narrator:
+    def __init__(self, sink=print, pacing=True):
+        self.sink = sink
+        self.pacing = pacing
+        # 서술을 버리는 서술자면 핫패스는 문구를 만들지 않는다 (대기는 그대로 부른다)
+        self.silent = sink is None
+
+    def say(self, text=""):
+        if self.sink is not None:
+            self.sink(text)
+
+    def wait(self, seconds):
+        if self.pacing:
+            time.sleep(seconds)
+
+    # 선택을 묻기 직전에 불린다 (쌓아 두는 서술자는 여기서 내보낸다)
+    def present(self):
+        pass
+
+    # 전투의 한 턴이 끝날 때 불린다
+    def end_turn(self):
+        pass
+
+# 화면용 서술자: 서술을 한 화면(frame)씩 모았다가 한 번에 쓴다.
+# 화면은 전투의 한 턴이 끝날 때와 선택을 묻기 직전에만 내보낸다.
+# 연출 대기는 speed 배로 줄이거나 늘려 쌓아 두었다가, 턴이 끝나 화면을 내보낸 뒤 그 합만큼 한 번 쉰다.
+# (선택을 물을 때는 쉬지 않는다: 바로 입력을 받는다)
+# 쉬는 동안 Enter 를 누르면 다음 선택까지 남은 서술을 기다리지 않고 보여준다.
+class FrameNarrator(Narrator):
+    def __init__(self, stream=None, speed=1.0, skippable=True):
+        super().__init__(None, pacing=speed > 0)
+        self.silent = False
+        self.stream = stream or sys.stdout
+        self.speed = speed
+        self.skippable = skippable
+        self.frame = []
+        self.owed = 0.0
+        self.skipping = False
+
+    def say(self, text=""):
+        self.frame.append(text)
+
+    def wait(self, seconds):
+        if self.pacing and not self.skipping:
+            self.owed += seconds * self.speed
+
+    def end_turn(self):
+        self.write_frame()
+        if self.owed > 0 and self.pause(self.owed):
+            self.skipping = True
+        self.owed = 0.0
+
+    def present(self):
+        self.write_frame()
+        self.owed = 0.0
+        self.skipping = False
+
+    def write_frame(self):
+        if self.frame:
+            self.frame.append("")
+            self.stream.write("\n".join(self.frame))
+            self.stream.flush()
+            self.frame.clear()
+
+    # seconds 동안 쉬고, 그 사이 키를 눌렀으면 True
+    def pause(self, seconds):
+        if not (self.skippable and sys.stdin and sys.stdin.isatty()):
+            time.sleep(seconds)
+            return False
+        if os.name == "nt":
+            import msvcrt
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                if msvcrt.kbhit():
+                    while msvcrt.kbhit():
+                        msvcrt.getwch()
+                    return True
+                time.sleep(0.02)
+            return False
+        import select
+        ready, _, _ = select.select([sys.stdin], [], [], seconds)
+        if ready:
+            sys.stdin.readline()
+        return bool(ready)
+
+# --- 전투 사건 ---
+# 전투와 진행에서 일어난 일을 서술 문구 대신 구조화된 사건으로 알린다. (분석, 기록, UI 용)
+# 구독자가 없는 종류의 사건은 객체를 만들지도 않는다: 보내는 쪽은
+#   if DamageTaken in self.events.listening: self.events.emit(DamageTaken(...))
+# 처럼 먼저 확인한다. Event 로 구독하면 모든 종류를 받는다.
+class Event:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)})"
+
+# deal_damage: 치명 판정 뒤 방어/회피 전의 피해
+class Attacked(Event):
+    __slots__ = ("attacker", "target", "damage", "critical", "is_skill")
+
+class DamageTaken(Event):
+    __slots__ = ("target", "amount", "health_left", "is_turn")
+
+class Evaded(Event):
+    __slots__ = ("target", "damage")
+
+# 무적으로 막았다
+class Blocked(Event):
+    __slots__ = ("target", "damage")
+
+class Defeated(Event):
+    __slots__ = ("character",)
+
+class Healed(Event):
+    __slots__ = ("target", "amount", "health_left")
+
+class EffectApplied(Event):
+    __slots__ = ("target", "effect", "replaced")
+
+class EffectExpired(Event):
+    __slots__ = ("target", "effect")
+
+class SkillCast(Event):
+    __slots__ = ("caster", "target", "skill")
+
+class SkillExhausted(Event):
+    __slots__ = ("owner", "skill")
+
+# source: "battle" (몬스터 처치) 또는 "sale" (장비를 바꾸며 되판 값)
+class GoldGained(Event):
+    __slots__ = ("character", "amount", "total", "source")
+
+class ItemBought(Event):
+    __slots__ = ("buyer", "item", "price")
+
+# Game.battle 이 끝났다 (turns 는 주고받은 턴 수)
+class BattleEnded(Event):
+    __slots__ = ("player", "monster", "stage", "won", "turns")
+
+EVENT_TYPES = (Attacked, DamageTaken, Evaded, Blocked, Defeated, Healed, EffectApplied, EffectExpired,
+               SkillCast, SkillExhausted, GoldGained, ItemBought, BattleEnded)
+
+class EventBus:
+    def __init__(self):
+        self.handlers = {}
+        # 구독자가 하나라도 있는 사건 종류
+        self.listening = frozenset()
+
+    def subscribe(self, event_type, handler):
+        for kind in EVENT_TYPES:
+            if issubclass(kind, event_type):
+                self.handlers.setdefault(kind, []).append(handler)
+        self.listening = frozenset(self.handlers)
+        return handler
+
+    def unsubscribe(self, event_type, handler):
+        for kind in EVENT_TYPES:
+            if issubclass(kind, event_type) and handler in self.handlers.get(kind, ()):
+                self.handlers[kind].remove(handler)
+                if not self.handlers[kind]:
+                    del self.handlers[kind]
+        self.listening = frozenset(self.handlers)
+
+    def emit(self, event):
+        for handler in self.handlers.get(type(event), ()):
+            handler(event)
+
+# 판에 붙지 않은 캐릭터가 쓰는 버스: 아무도 듣지 않고 구독도 받지 않는다 (판 사이에 구독이 새지 않게)
+class NullEventBus(EventBus):
+    def subscribe(self, event_type, handler):
+        raise TypeError("판에 붙지 않은 캐릭터의 사건은 구독할 수 없다 (game.events 를 쓴다)")
+
+NO_EVENTS = NullEventBus()
 
 # --- 상태이상 클래스 ---
+# 적용된 상태이상은 값을 슬롯에 바로 들고(만들기와 읽기가 가장 싸다),
+# 같은 값끼리 공유하는 변하지 않는 정의(EffectDefinition)는 전치표 키나 저장처럼 필요할 때만 만든다.
+class EffectDefinition:
+    __slots__ = ("name", "damage_per_turn",
+                 "attack_modifier", "defense_modifier", "evasion_modifier", "critical_modifier",
+                 "damage_taken_modifier", "damage_dealt_modifier",
+                 "ignore_defense", "ignore_evasion", "skip_turn", "invincible")
+    # (값들, 값의 타입들) -> 정의. 1, 1.0, True 는 == 로 같아도 다른 정의로 둔다.
+    # 정의는 검색의 전치표 키로도 쓰이므로 비우지 않는다 (서로 다른 값의 수는 콘텐츠가 정한다)
+    _interned = {}
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError("EffectDefinition 은 바꿀 수 없다")
+
+    # pickle 로 옮겨도 같은 정의를 공유한다
+    def __reduce__(self):
+        return (EffectDefinition.get, tuple(getattr(self, field) for field in self.__slots__))
+
+    @classmethod
+    def get(cls, *values):
+        key = values + tuple(map(type, values))
+        definition = cls._interned.get(key)
+        if definition is None:
+            definition = cls._interned[key] = cls(*values)
+        return definition
+
 class StatusEffect:
+    __slots__ = EffectDefinition.__slots__ + ("duration", "_definition")
+
     def __init__(self, name, duration, 
                  damage_per_turn=0, 
                  attack_modifier=0, defense_modifier=0, evasion_modifier=0, critical_modifier=0,
@@ -61,6 +284,37 @@ class StatusEffect:
         self.ignore_evasion = ignore_evasion
         self.skip_turn = skip_turn
         self.invincible = invincible
+        self._definition = None
+
+    # 같은 값의 상태이상끼리 같은 객체 (처음 읽을 때 한 번 찾는다)
+    @property
+    def definition(self):
+        definition = self._definition
+        if definition is None:
+            definition = self._definition = EffectDefinition.get(
+                self.name, self.damage_per_turn,
+                self.attack_modifier, self.defense_modifier, self.evasion_modifier, self.critical_modifier,
+                self.damage_taken_modifier, self.damage_dealt_modifier,
+                self.ignore_defense, self.ignore_evasion, self.skip_turn, self.invincible)
+        return definition
+
+    def copy(self):
+        effect = StatusEffect.__new__(StatusEffect)
+        effect.name = self.name
+        effect.duration = self.duration
+        effect.damage_per_turn = self.damage_per_turn
+        effect.attack_modifier = self.attack_modifier
+        effect.defense_modifier = self.defense_modifier
+        effect.evasion_modifier = self.evasion_modifier
+        effect.critical_modifier = self.critical_modifier
+        effect.damage_taken_modifier = self.damage_taken_modifier
+        effect.damage_dealt_modifier = self.damage_dealt_modifier
+        effect.ignore_defense = self.ignore_defense
+        effect.ignore_evasion = self.ignore_evasion
+        effect.skip_turn = self.skip_turn
+        effect.invincible = self.invincible
+        effect._definition = self._definition
+        return effect
 
     def apply_effect(self, target):
         if self.damage_per_turn > 0:
@@ -68,6 +322,9 @@ class StatusEffect:
 
 # --- 스킬 클래스 ---
 class Skill:
+    __slots__ = ("name", "level", "max_level", "rarity", "use_count", "initial_use_count",
+                 "effect", "is_monster_only", "power", "desc")
+
     def __init__(self, name, level, max_level, rarity, use_count, effect, is_monster_only=False,power=1.0, desc=None):
         self.name = name
         self.level = level
@@ -82,13 +339,23 @@ class Skill:
 
     def execute(self, caster, target):
         self.use_count -= 1
+        if SkillCast in caster.events.listening:
+            caster.events.emit(SkillCast(caster, target, self))
         self.effect(caster, target, self)
 
     def reset_use_count(self):
         self.use_count = self.initial_use_count
 
+    def clone(self):
+        skill = Skill(self.name, self.level, self.max_level, self.rarity, self.initial_use_count,
+                      self.effect, self.is_monster_only, self.power, self.desc)
+        skill.use_count = self.use_count
+        return skill
+
 # --- 장비 클래스 ---
 class Equipment:
+    __slots__ = ("name", "part", "stage", "health", "attack", "defense", "price", "critical", "evasion", "special")
+
     def __init__(self, name, part, stage, health=0, attack=0, defense=0, price=0, critical=0, evasion=0, special = ""):
         self.name = name
         self.part = part
@@ -103,6 +370,12 @@ class Equipment:
 
 # --- 캐릭터 기본 클래스 ---
 class Character:
+    narrator = Narrator()
+    rng = random
+    events = NO_EVENTS
+    # profiling.Profiler 를 붙이면 핫패스 호출을 센다 (없으면 비교 한 번뿐)
+    profiler = None
+
     def __init__(self, name, max_health, attack, defense, evasion, critical):
         self.name = name
         self.max_health = max_health
@@ -118,9 +391,50 @@ class Character:
         self._base_defense = defense
         self._base_evasion = evasion
         self._base_critical = critical
+        self._rebuild_effect_cache()
+
+    # 상태이상 집계 캐시: 이름 색인, 플래그 개수, 피해 배율 합
+    # 추가/만료 때만 갱신되므로 피격마다 status_effects 를 훑지 않는다
+    def _rebuild_effect_cache(self):
+        self._effects_by_name = {}
+        self._invincible_count = 0
+        self._ignore_evasion_count = 0
+        self._skip_turn_count = 0
+        self._ignore_defense_count = 0
+        self._damage_taken_modifier = 0
+        self._damage_dealt_modifier = 0
+        for effect in self.status_effects:
+            self._effects_by_name[effect.name] = effect
+            self._count_effect(effect, 1)
+            self._damage_taken_modifier += effect.damage_taken_modifier
+            self._damage_dealt_modifier += effect.damage_dealt_modifier
+
+    def _count_effect(self, effect, step):
+        if effect.invincible:
+            self._invincible_count += step
+        if effect.ignore_evasion:
+            self._ignore_evasion_count += step
+        if effect.skip_turn:
+            self._skip_turn_count += step
+        if effect.ignore_defense:
+            self._ignore_defense_count += step
+
+    # 탐색용 전투 상태 사본: 상태이상 지속 시간과 힘 사용 횟수까지 따로 가진다
+    def combat_clone(self):
+        character = copy.copy(self)
+        character.skills = [skill.clone() for skill in self.skills]
+        character.status_effects = [effect.copy() for effect in self.status_effects]
+        character._rebuild_effect_cache()
+        return character
+
+    # 한 전투 안에서 같은 국면을 알아보는 키 (기본 능력치는 전투 중에 바뀌지 않는다)
+    def combat_key(self):
+        return (self.current_health,
+                tuple((effect.definition, effect.duration) for effect in self.status_effects),
+                tuple((skill.name, skill.use_count) for skill in self.skills))
 
     def has_status(self, status_name):
-        return any(e.name == status_name for e in self.status_effects)
+        return status_name in self._effects_by_name
 
     def is_alive(self):
         return self.current_health > 0
@@ -132,24 +446,31 @@ class Character:
         return not self.is_alive()
 
     def take_damage(self, damage, is_turn = False):
-        is_invincible = any(e.invincible for e in self.status_effects)
-        if is_invincible and not is_turn:
-            print(f"{self.name}의 육신은 상처를 거부했다.")
+        if self.profiler is not None:
+            self.profiler.count("take_damage")
+        if self._invincible_count and not is_turn:
+            if Blocked in self.events.listening:
+                self.events.emit(Blocked(self, damage))
+            if not self.narrator.silent:
+                self.narrator.say(f"{self.name}의 육신은 상처를 거부했다.")
             return
         
         evasion_chance = self.evasion / 100
         evasion_chance = min(evasion_chance, 70 / 100)
-        if (random.random() < evasion_chance and self.evasion > 0
-            and not any(e.ignore_evasion for e in self.status_effects)
+        if (self.rng.random() < evasion_chance and self.evasion > 0
+            and not self._ignore_evasion_count
             and not is_turn
-            and not any(e.skip_turn for e in self.status_effects)
+            and not self._skip_turn_count
             ):
-            print(f"{self.name}이(가) 공격을 회피했다!")
-            time.sleep(0.5)
+            if Evaded in self.events.listening:
+                self.events.emit(Evaded(self, damage))
+            if not self.narrator.silent:
+                self.narrator.say(f"{self.name}이(가) 공격을 회피했다!")
+            self.narrator.wait(0.5)
             return
         
-        ignore_defense_active = any(e.ignore_defense for e in self.status_effects)
-        damage_taken_multiplier = 1.0 + sum(e.damage_taken_modifier for e in self.status_effects)
+        ignore_defense_active = self._ignore_defense_count > 0
+        damage_taken_multiplier = 1.0 + self._damage_taken_modifier
         damage_taken_multiplier = max(0.0, min(damage_taken_multiplier, 10.0))
         calculated_defense = 0 if ignore_defense_active else self.defense
         # 데미지 계산
@@ -158,50 +479,81 @@ class Character:
         self.current_health -= actual_damage
         if self.current_health < 0:
             self.current_health = 0
-        print(f"{self.name}의 살점이 {actual_damage}만큼 찢겨나갔다. (남은 생명: {int(self.current_health)}/{int(self.max_health)})")
-        time.sleep(0.5)
+        if DamageTaken in self.events.listening:
+            self.events.emit(DamageTaken(self, actual_damage, self.current_health, is_turn))
+        if not self.narrator.silent:
+            self.narrator.say(f"{self.name}의 살점이 {actual_damage}만큼 찢겨나갔다. (남은 생명: {int(self.current_health)}/{int(self.max_health)})")
+        self.narrator.wait(0.5)
         if not self.is_alive():
-            print(f"{self.name}의 마지막 숨이 멎었다.")
-            time.sleep(1)
+            if Defeated in self.events.listening:
+                self.events.emit(Defeated(self))
+            if not self.narrator.silent:
+                self.narrator.say(f"{self.name}의 마지막 숨이 멎었다.")
+            self.narrator.wait(1)
     def heal(self, amount):
         self.current_health = min(self.max_health, self.current_health + amount)
-        print(f"{self.name}이(가) {amount}만큼 생명을 되찾았다. (현재 생명: {int(self.current_health)}/{int(self.max_health)})")
-        time.sleep(0.5)
+        if Healed in self.events.listening:
+            self.events.emit(Healed(self, amount, self.current_health))
+        if not self.narrator.silent:
+            self.narrator.say(f"{self.name}이(가) {amount}만큼 생명을 되찾았다. (현재 생명: {int(self.current_health)}/{int(self.max_health)})")
+        self.narrator.wait(0.5)
 
     def deal_damage(self, target, base_damage, is_skill=False):
+        if self.profiler is not None:
+            self.profiler.count("deal_damage")
         crit_mul = 1.0
-        if random.random() < self.critical / 100:
+        if self.rng.random() < self.critical / 100:
 
             crit_mul = 1.5
             if self.critical > 100:
                 crit_mul += self.critical / 100 - 1
 
-        dealt_mul = 1.0 + sum(e.damage_dealt_modifier for e in self.status_effects)
+        dealt_mul = 1.0 + self._damage_dealt_modifier
         dealt_mul = max(0.0, min(dealt_mul, 10.0))
 
         final_damage = base_damage * crit_mul * dealt_mul
+        if Attacked in self.events.listening:
+            self.events.emit(Attacked(self, target, final_damage, crit_mul > 1.0, is_skill))
         target.take_damage(final_damage)
 
 
     # 스탯 부여
     def add_status_effect(self, effect):
-        self.status_effects = [e for e in self.status_effects if e.name != effect.name]
+        replaced = self._effects_by_name.get(effect.name)
+        if replaced is not None:
+            self.status_effects.remove(replaced)
+            self._count_effect(replaced, -1)
         self.status_effects.append(effect)
-        time.sleep(0.5)
+        self._effects_by_name[effect.name] = effect
+        self._count_effect(effect, 1)
+        if EffectApplied in self.events.listening:
+            self.events.emit(EffectApplied(self, effect, replaced))
+        if self.profiler is not None:
+            self.profiler.count("add_status_effect")
+            self.profiler.peak("status_effects", len(self.status_effects))
+        self.narrator.wait(0.5)
         self._apply_stat_modifiers()
 
-    # 스탯 강화 적용
+    # 스탯 강화 적용 (피해 배율 합도 같은 순서로 다시 더한다)
     def _apply_stat_modifiers(self):
+        if self.profiler is not None:
+            self.profiler.count("_apply_stat_modifiers")
         self.attack = self._base_attack
         self.defense = self._base_defense
         self.evasion = self._base_evasion
         self.critical = self._base_critical
+        damage_taken = 0
+        damage_dealt = 0
 
         for effect in self.status_effects:
             self.attack += effect.attack_modifier
             self.defense += effect.defense_modifier
             self.evasion += effect.evasion_modifier
             self.critical += effect.critical_modifier
+            damage_taken += effect.damage_taken_modifier
+            damage_dealt += effect.damage_dealt_modifier
+        self._damage_taken_modifier = damage_taken
+        self._damage_dealt_modifier = damage_dealt
 
 
     # 턴 효과 적용
@@ -210,51 +562,62 @@ class Character:
             effect.duration -= 1
             if effect.duration < 1:
                 self.status_effects.remove(effect)
-                print(f"{self.name}의 {effect.name} 낙인이 사라졌다.")
-                time.sleep(0.5)
+                del self._effects_by_name[effect.name]
+                self._count_effect(effect, -1)
+                if EffectExpired in self.events.listening:
+                    self.events.emit(EffectExpired(self, effect))
+                if not self.narrator.silent:
+                    self.narrator.say(f"{self.name}의 {effect.name} 낙인이 사라졌다.")
+                self.narrator.wait(0.5)
                 self._apply_stat_modifiers()
             else:
                 pass
     def apply_turn_effects(self):
         is_actionable = True
         for effect in self.status_effects[:]:
-            time.sleep(0.5)
+            self.narrator.wait(0.5)
             if effect.skip_turn:
                 is_actionable = False
-                print(f"{self.name}은(는) {effect.name}의 낙인으로 움직이지 못했다. ({int(effect.duration)} 남음.)")
-                time.sleep(0.5)
+                if not self.narrator.silent:
+                    self.narrator.say(f"{self.name}은(는) {effect.name}의 낙인으로 움직이지 못했다. ({int(effect.duration)} 남음.)")
+                self.narrator.wait(0.5)
             if effect.damage_per_turn > 0:
-                print(f"{effect.name}이(가) {self.name}의 낙인으로 생명을 갉아먹힌다. ({int(effect.duration)} 남음.)")
-                time.sleep(0.5)
+                if not self.narrator.silent:
+                    self.narrator.say(f"{effect.name}이(가) {self.name}의 낙인으로 생명을 갉아먹힌다. ({int(effect.duration)} 남음.)")
+                self.narrator.wait(0.5)
                 self.take_damage(effect.damage_per_turn)
-            else:
-                print(f"{self.name}은(는) {effect.name}의 낙인을 보유한다. ({int(effect.duration)} 남음.)")
+            elif not self.narrator.silent:
+                self.narrator.say(f"{self.name}은(는) {effect.name}의 낙인을 보유한다. ({int(effect.duration)} 남음.)")
         return is_actionable
     def show_stats(self):
-        print(f"\n[ {self.name} ]"); time.sleep(0.1)
-        print(f"생명: {int(self.current_health)}/{int(self.max_health)}"); time.sleep(0.1)
-        print(f"공격: {int(self.attack)} 방어: {int(self.defense)}"); time.sleep(0.1)
-        print(f"민첩: {int(self.evasion)} 치명: {int(self.critical)}"); time.sleep(0.1)
+        # 서술을 버리는 판은 문구 없이 같은 만큼만 기다린다
+        if self.narrator.silent:
+            self.narrator.wait(0.9)
+            return
+        self.narrator.say(f"\n[ {self.name} ]"); self.narrator.wait(0.1)
+        self.narrator.say(f"생명: {int(self.current_health)}/{int(self.max_health)}"); self.narrator.wait(0.1)
+        self.narrator.say(f"공격: {int(self.attack)} 방어: {int(self.defense)}"); self.narrator.wait(0.1)
+        self.narrator.say(f"민첩: {int(self.evasion)} 치명: {int(self.critical)}"); self.narrator.wait(0.1)
         effect_to_display = ""
         for effect in self.status_effects[:]:
             effect_to_display += f"({effect.name}:{effect.duration}) "
         if effect_to_display:
-            #print(f"상태이상: {effect_to_display}")
+            #self.narrator.say(f"상태이상: {effect_to_display}")
             pass
-        time.sleep(0.5)
+        self.narrator.wait(0.5)
     def show_inv(self):
         if isinstance(self, Player):
-            print("[ 장비 ]")
+            self.narrator.say("[ 장비 ]")
             for part, item in self.equipment.items():
-                print(f"{part}: {item.name if item else '없음'}")
-                time.sleep(0.1)
-            print("[ 힘 ]")
+                self.narrator.say(f"{part}: {item.name if item else '없음'}")
+                self.narrator.wait(0.1)
+            self.narrator.say("[ 힘 ]")
             if self.skills:
                 for skill in self.skills:
-                    print(f"{skill.name} (Lv.{skill.level}, 남은 횟수: {skill.use_count})")
-                    time.sleep(0.1)
+                    self.narrator.say(f"{skill.name} (Lv.{skill.level}, 남은 횟수: {skill.use_count})")
+                    self.narrator.wait(0.1)
             else:
-                print("습득한 힘 없음")
+                self.narrator.say("습득한 힘 없음")
 # --- 플레이어 클래스 ---
 class Player(Character):
     def __init__(self, name):
@@ -276,7 +639,7 @@ class Player(Character):
         self.defense += item.defense
         self.critical += item.critical
         self.evasion += item.evasion
-        print(f"{item.name}을(를) 착용했다.")
+        self.narrator.say(f"{item.name}을(를) 착용했다.")
         self.show_stats()
         self.show_inv()
 
@@ -292,7 +655,9 @@ class Player(Character):
                 self.current_health = self.max_health
             self.equipment[part] = None
             self.gold += int(item.price * 0.7)
-            print(f"{item.name}을(를) {int(item.price * 0.7)}G 에 팔았다.")
+            if GoldGained in self.events.listening:
+                self.events.emit(GoldGained(self, int(item.price * 0.7), self.gold, "sale"))
+            self.narrator.say(f"{item.name}을(를) {int(item.price * 0.7)}G 에 팔았다.")
 
 # --- 몬스터 클래스 ---
 class Monster(Character):
@@ -303,324 +668,632 @@ class Monster(Character):
         self.gold = gold
         self.skills = skills if skills else []
 
-# --- 게임 클래스 ---
-class Game:
-    def __init__(self):
-        self.player = Player("방랑자(당신)")
-        self.stage = 1
-        self.battle_count = 0
+    # 템플릿에서 새 몬스터를 찍어낸다. 힘은 인스턴스마다 따로 가진다.
+    def clone(self):
+        monster = copy.copy(self)
+        monster.skills = [skill.clone() for skill in self.skills]
+        monster.status_effects = []
+        monster._rebuild_effect_cache()
+        return monster
+
+# --- 결정 클래스 ---
+# Game 의 진행 메서드는 선택이 필요할 때 Decision 을 yield 하고 답(인덱스)을 돌려받는다.
+# Game.play 는 그것을 decider.decide(game, kind, options, subject) 로 물어 동기로 돌리고,
+# async_game 은 같은 흐름을 이벤트 루프 위에서 돌린다.
+# kind: "action" [None(휘두르기)] + 힘, subject = 몬스터
+#       "upgrade" (이름, 스탯, 수치, 단위) 목록
+#       "skill" 제안된 힘 + [None(거부)]
+#       "forget" 가진 힘 + [None(거부)], subject = 새로 얻을 힘
+#       "shop" 진열된 장비 + [SHOP_REFRESH, SHOP_LEAVE]
+# 반환값은 options 의 인덱스이다.
+class Decision:
+    __slots__ = ("kind", "options", "subject")
+
+    def __init__(self, kind, options, subject=None):
+        self.kind = kind
+        self.options = options
+        self.subject = subject
+
+SHOP_REFRESH = "refresh"
+SHOP_LEAVE = "leave"
+
+class Decider:
+    def decide(self, game, kind, options, subject=None):
+        return getattr(self, "choose_" + kind)(game, options, subject)
+
+class HumanDecider(Decider):
+    prompts = {
+        "action": "행동을 선택하자: ",
+        "upgrade": "선택의 시간이다. (1-{n}): ",
+        "skill": "어떤 힘을 받아들이겠는가?: ",
+        "forget": "어떤 힘을 버리고 새로운 힘을 받아들이겠는가? ",
+        "shop": "선택의 시간이다. :",
+    }
+
+    def decide(self, game, kind, options, subject=None):
+        prompt = self.prompts[kind].format(n=len(options))
+        while True:
+            game.narrator.present()
+            try:
+                choice = int(input(prompt))
+                if 1 <= choice <= len(options):
+                    return choice - 1
+                else:
+                    game.narrator.say("어둠 속에서 길을 잃었는가? 다시 선택하라.")
+            except ValueError:
+                game.narrator.say("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
+
+# 침묵 중에는 힘을 쓰지 않는다
+def usable_actions(player, options):
+    if player.has_status("침묵"):
+        return [0]
+    return [i for i, skill in enumerate(options) if skill is None or skill.use_count > 0]
+
+# 장비의 대략적인 가치 (greedy 용)
+def equipment_score(item):
+    if item is None:
+        return 0
+    return item.attack * 3 + item.defense * 1.5 + item.health * 0.5 + item.critical + item.evasion
+
+class RandomDecider(Decider):
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose_action(self, game, options, monster):
+        return self.rng.choice(usable_actions(game.player, options))
+
+    def choose_upgrade(self, game, options, subject):
+        return self.rng.randrange(len(options))
+
+    def choose_skill(self, game, options, subject):
+        return self.rng.randrange(len(options))
+
+    def choose_forget(self, game, options, new_skill):
+        return self.rng.randrange(len(options))
+
+    def choose_shop(self, game, options, subject):
+        player = game.player
+        picks = [i for i, item in enumerate(options[:-2])
+                 if item.price <= player.gold and not (item.health < 0 and player.max_health < abs(item.health))]
+        return self.rng.choice(picks + [len(options) - 1])
+
+class GreedyDecider(Decider):
+    stat_weights = {"max_health": 0.5, "attack": 3.0, "defense": 1.5, "critical": 1.0}
+
+    # 보스전이거나 생명이 절반 아래면 가장 강한 힘을, 아니면 휘두른다
+    def choose_action(self, game, options, monster):
+        player = game.player
+        usable = [i for i in usable_actions(player, options) if options[i] is not None]
+        if not usable:
+            return 0
+        if monster.is_boss or player.current_health < player.max_health * 0.5:
+            return max(usable, key=lambda i: (options[i].rarity, options[i].level, options[i].power))
+        return 0
+
+    def choose_upgrade(self, game, options, subject):
+        return max(range(len(options)), key=lambda i: options[i][2] * self.stat_weights[options[i][1]])
+
+    def choose_skill(self, game, options, subject):
+        owned = {s.name for s in game.player.skills}
+        return max(range(len(options) - 1), key=lambda i: (options[i].name in owned, options[i].rarity))
+
+    def choose_forget(self, game, options, new_skill):
+        weakest = min(range(len(options) - 1), key=lambda i: (options[i].rarity, options[i].level))
+        if options[weakest].rarity >= new_skill.rarity:
+            return len(options) - 1
+        return weakest
+
+    def choose_shop(self, game, options, subject):
+        player = game.player
+        best, best_gain = len(options) - 1, 0
+        for i, item in enumerate(options[:-2]):
+            if item.price > player.gold or (item.health < 0 and player.max_health < abs(item.health)):
+                continue
+            gain = equipment_score(item) - equipment_score(player.equipment[item.part])
+            if gain > best_gain:
+                best, best_gain = i, gain
+        return best
+
+# --- 저장 형식 ---
+SAVE_MAGIC = b"IWB"
+SAVE_VERSION = 1
+RNG_STREAMS = ("combat_rng", "encounter_rng", "loot_rng", "shop_rng")
+PLAYER_STATE_FIELDS = ("max_health", "current_health", "attack", "defense", "evasion", "critical",
+                       "_base_attack", "_base_defense", "_base_evasion", "_base_critical", "gold")
+
+# random.Random 상태를 JSON 에 담을 수 있는 형태로
+def rng_state(rng):
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+def rng_from_state(state):
+    version, internal, gauss_next = state
+    return (version, tuple(internal), gauss_next)
+
+# --- 힘 효과 ---
+# 힘의 효과는 단계(step)의 목록으로 적고 run_effect 가 차례로 실행한다.
+# 수식은 숫자, 이름("level", "power", let 으로 만든 값), "caster.attack" 같은 능력치,
+# 또는 ["연산", 인자...] 목록이다. 연산은 왼쪽부터 차례로 계산해서 예전 코드와 결과가 같다.
+#   ("say", 문구, {이름: 수식})          {skill} {caster} {target} 와 이름을 채워 서술
+#   ("wait", 초)
+#   ("hit", 공격자, 대상, 수식)          deal_damage(is_skill=True): 치명, 주는/받는 피해 적용
+#   ("damage", 대상, 수식)               take_damage: 치명 없이 바로
+#   ("heal", 대상, 수식)
+#   ("status", 대상, 이름, 지속, {필드: 수식})
+#   ("let", 이름, 수식)
+#   ("if", 조건 수식, (단계...))
+EXPRESSION_OPS = {
+    "+": lambda *args: functools.reduce(operator.add, args),
+    "*": lambda *args: functools.reduce(operator.mul, args),
+    "/": operator.truediv,
+    "neg": operator.neg,
+    "int": int,
+    "<": operator.lt,
+}
+
+def evaluate(expr, env):
+    if isinstance(expr, str):
+        who, dot, stat = expr.partition(".")
+        return getattr(env[who], stat) if dot else env[expr]
+    if isinstance(expr, (list, tuple)):
+        return EXPRESSION_OPS[expr[0]](*[evaluate(arg, env) for arg in expr[1:]])
+    return expr
+
+def run_effect(steps, env):
+    for step in steps:
+        kind = step[0]
+        if kind == "say":
+            if env["caster"].narrator.silent:
+                continue
+            values = {key: evaluate(expr, env) for key, expr in step[2].items()} if len(step) > 2 else {}
+            env["caster"].narrator.say(step[1].format(skill=env["skill"].name, caster=env["caster"].name,
+                                                      target=env["target"].name, **values))
+        elif kind == "wait":
+            env["caster"].narrator.wait(step[1])
+        elif kind == "hit":
+            env[step[1]].deal_damage(env[step[2]], evaluate(step[3], env), is_skill=True)
+        elif kind == "damage":
+            env[step[1]].take_damage(evaluate(step[2], env))
+        elif kind == "heal":
+            env[step[1]].heal(evaluate(step[2], env))
+        elif kind == "status":
+            env[step[1]].add_status_effect(StatusEffect(step[2], evaluate(step[3], env),
+                                                        **{key: evaluate(expr, env) for key, expr in step[4].items()}))
+        elif kind == "let":
+            env[step[1]] = evaluate(step[2], env)
+        elif kind == "if":
+            if evaluate(step[1], env):
+                run_effect(step[2], env)
+        else:
+            raise ValueError(f"알 수 없는 효과 단계 {kind!r}")
+
+# 실행하지 않고 지금 상태에서 각 단계가 낼 수치만 계산한다 (기대값 계산, 정책 평가용).
+# 앞 단계가 바꾼 능력치는 반영되지 않는다.
+def effect_outcomes(steps, env):
+    outcomes = []
+    for step in steps:
+        kind = step[0]
+        if kind in ("hit", "damage", "heal"):
+            outcomes.append((kind,) + tuple(step[1:-1]) + (evaluate(step[-1], env),))
+        elif kind == "status":
+            outcomes.append((kind, step[1], step[2], evaluate(step[3], env),
+                             {key: evaluate(expr, env) for key, expr in step[4].items()}))
+        elif kind == "let":
+            env[step[1]] = evaluate(step[2], env)
+        elif kind == "if" and evaluate(step[1], env):
+            outcomes.extend(effect_outcomes(step[2], env))
+    return outcomes
+
+def effect_env(caster, target, skill):
+    return {"caster": caster, "target": target, "skill": skill, "level": skill.level, "power": skill.power}
+
+# Skill.effect 로 쓰는 호출 가능한 효과. 이름은 콘텐츠 파일의 "effect" 값이다.
+class SkillEffect:
+    __slots__ = ("name", "steps")
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = steps
+
+    def __call__(self, caster, target, skill):
+        run_effect(self.steps, effect_env(caster, target, skill))
+
+    def outcomes(self, caster, target, skill):
+        return effect_outcomes(self.steps, effect_env(caster, target, skill))
+
+# 자주 쓰는 수식
+def _scaled(stat, level_div):
+    return ["*", stat, ["+", 1, ["/", "level", level_div]], "power"]
+
+EFFECT_SPECS = {
+    # 기본 데미지 스킬
+    "damage": (
+        ("say", "'{skill}' 발동... {target}의 살점을 도려낸다."),
+        ("hit", "caster", "target", _scaled("caster.attack", 3)),
+    ),
+    # 낮은 레벨 성장력 (power를 높혀주세요)
+    "pulverize": (
+        ("say", "'{skill}' 발동... {target}의 뼈를 으깬다."),
+        ("hit", "target", "target", _scaled("caster.attack", 5)),
+    ),
+    # 높은 스킬 성장력 attack * level * power
+    "reaping": (
+        ("say", "'{skill}' 발동... {target}의 영혼을 부순다."),
+        ("hit", "target", "target", ["*", "caster.attack", "level", "power"]),
+    ),
+    # 고정 데미지 level * power
+    "fixed_damage": (
+        ("say", "'{skill}' 발동... {target}을(를) 강하게 내려친다."),
+        ("hit", "caster", "target", ["*", ["+", 1, ["/", "level", 3]], "power"]),
+    ),
+    # 낮은체력 대상 2배 데미지
+    "execute": (
+        ("say", "'{skill}' 발동... {target}의 마지막 숨통을 끊는다."),
+        ("let", "damage", _scaled("caster.attack", 5)),
+        ("if", ["<", "target.current_health", ["*", "target.max_health", 0.5]], (
+            ("wait", 0.5),
+            ("say", "{target}의 낮은 생명은 더욱 큰 피해를 받는다."),
+            ("let", "damage", ["*", "damage", 2]),
+        )),
+        ("hit", "caster", "target", "damage"),
+    ),
+    # 고급 스킬 (power를 높혀주세요)
+    "advance_damage": (
+        ("say", "'{skill}' 발동... {target}을(를) 향해 일격을 날린다."),
+        ("hit", "caster", "target", _scaled("caster.attack", 2)),
+    ),
+    "critical": (
+        ("say", "'{skill}' 발동... {target}의 급소를 노린다"),
+        ("wait", 0.5),
+        ("status", "caster", "급소 포착", 0, {"critical_modifier": 50}),
+        ("hit", "caster", "target", _scaled("caster.attack", 3)),
+    ),
+    # 두번 공격
+    "flurry": (
+        ("say", "'{skill}' 발동... 핏빛 칼날이 춤춘다."),
+        ("hit", "caster", "target", ["*", "caster.attack", ["+", "power", ["/", "level", 5]]]),
+        ("hit", "caster", "target", ["*", "caster.attack", ["+", "power", ["/", "level", 5]]]),
+    ),
+    # 생명력 흡수
+    "life_steal": (
+        ("say", "'{skill}' 발동... {caster}이(가) 생명을 흡수한다."),
+        ("heal", "caster", ["*", "caster.max_health", 0.2, "level"]),
+        ("damage", "target", ["*", "caster.attack", "power"]),
+    ),
+    # 방어력 증가 level * power
+    "iron_will": (
+        ("say", "'{skill}' 발동... {caster}이(가) 고통을 감내한다. (방어 + {value})", {"value": ["*", "level", "power"]}),
+        ("status", "caster", "철의 의지", 5, {"defense_modifier": ["*", "level", "power"]}),
+    ),
+    # 공격력 증가 level * power
+    "war_cry": (
+        ("say", "'{skill}' 발동... {caster}의 함성이 울린다.(공격 + {value})", {"value": ["int", ["*", "level", "power"]]}),
+        ("status", "caster", "전투의 함성", 5, {"attack_modifier": ["*", "level", "power"]}),
+    ),
+    # 기절 skill.power 턴동안
+    "stun": (
+        ("say", "'{skill}' 발동... {target}을(를) 무력화시킨다. (행동 불가)"),
+        ("status", "target", "기절", ["int", "power"], {"skip_turn": True}),
+    ),
+    # 무적 power 턴동안
+    "shadow": (
+        ("say", "'{skill}' 발동... {caster}이(가) 그림자가 된다. (무적)"),
+        ("status", "caster", "그림자 형상", "power", {"invincible": True}),
+    ),
+    # 방패로 강타 데미지 + 기절
+    "shiled_attack": (
+        ("say", "'{skill}' 발동... {caster}이(가) 방패로 강타한다. (방어수치 공격)"),
+        ("damage", "target", _scaled("caster.defense", 3)),
+    ),
+    # 공격력 50% 증가 3턴 (상수)
+    "frenzy": (
+        ("say", "'{skill}' 발동... {caster}이(가) 광란에 휩싸인다. (공격 +50%)"),
+        ("status", "caster", "광란", 3, {"attack_modifier": ["*", "caster.attack", 0.5]}),
+    ),
+    # 공격력 증가 power 턴 동안 1.5 + level / 2
+    "hate": (
+        ("say", "'{skill}' 발동... {caster}이(가) 증오를 집중한다. (공격 + {value}%)",
+         {"value": ["int", ["*", ["+", 1, ["/", "level", 2]], 100]]}),
+        ("status", "caster", "증오 집중", "power", {"damage_dealt_modifier": ["+", 1, ["/", "level", 2]]}),
+    ),
+    # 매 턴 데미지 attack * 0.5 * level * power
+    "turn_damage": (
+        ("say", "'{skill}' 발동... {target}의 피를 말린다. (지속 피해)"),
+        ("status", "target", "과다출혈", ["+", 3, "level"], {"damage_per_turn": ["*", "caster.attack", "power"]}),
+    ),
+    # 적 데미지 50% 약화
+    "cripple": (
+        ("say", "'{skill}' 발동... {target}의 힘줄을 끊는다. (공격 -50%)"),
+        ("status", "target", "불구", ["+", 1, "level"], {"attack_modifier": ["*", ["neg", "target.attack"], 0.5]}),
+    ),
+    # 약자 멸시 주는피해 받는피해 100% 증가 999턴 (상수)
+    "scorn_the_weak": (
+        ("say", "'{skill}' 발동... (주는피해,받는피해 2배)"),
+        ("status", "target", "약자멸시", 3, {"damage_taken_modifier": 1.0, "damage_dealt_modifier": 1.0}),
+    ),
+    # 효과 없음
+    "taunt": (
+        ("say", "'{skill}' 발동... {target}을(를) 조롱한다...... (아무 효과 없음)"),
+    ),
+    # 적 데미지 20% 3턴 약화 (상수)
+    "weaken": (
+        ("say", "'{skill}' 발동... {target}을(를) 약화시킨다. (공격 -30%)"),
+        ("status", "target", "약화", 3, {"attack_modifier": ["*", ["neg", "target.attack"], 0.3]}),
+    ),
+    # 적 받는 피해 20% 증가 3턴 (상수)
+    "shatter_bone": (
+        ("say", "'{skill}' 발동... {target}의 뼈를 뒤틀어 놓는다. (받는피해 +30%)"),
+        ("status", "target", "골절", 5, {"damage_taken_modifier": 0.3}),
+    ),
+    # 적 받는피해 증가
+    "hex": (
+        ("say", "'{skill}' 발동... {target}에게 끔찍한 저주를 내린다. (받는 피해 +60%)"),
+        ("status", "target", "저주", ["+", 3, "level"], {"damage_taken_modifier": 0.6}),
+    ),
+    # 회피율증가 10 * level 3턴
+    "fade": (
+        ("say", "'{skill}' 발동... {caster}의 모습이 흐려진다. (민첩 + {value})", {"value": ["int", ["*", 10, "level"]]}),
+        ("status", "caster", "흐릿한 형상", 3, {"evasion_modifier": ["*", 10, "level"]}),
+    ),
+    # 방어무시 2 + level 턴
+    "break_armor": (
+        ("say", "'{skill}' 발동... {target}의 갑옷을 파괴한다. (방어 무시)"),
+        ("status", "target", "노출", ["+", 3, "level"], {"ignore_defense": True, "defense_modifier": -100}),
+    ),
+    # 적 부패 지속피해 (부패 최대체력 0 * 0.2)
+    "blight": (
+        ("say", "'{skill}' 발동... 부패의 구름이 {target}을(를) 감싼다. (생명 20% 지속피해)"),
+        ("status", "target", "부패", "power", {"damage_per_turn": ["*", "target.max_health", 0.2]}),
+    ),
+    # 적 힘봉인 2턴
+    "silence": (
+        ("say", "'{skill}' 발동... {target}의 힘을 봉인한다. (힘 사용 불가)"),
+        ("status", "target", "침묵", "power", {}),
+    ),
+    # 공격력 30 * level, 방어력 -10 * level 3턴
+    "reckless_abandon": (
+        ("say", "'{skill}' 발동... {caster}이(가) 모든 것을 내던진다. (공격 + {attack} , 방어 - {defense})",
+         {"attack": ["int", ["*", 30, "level"]], "defense": ["int", ["*", 10, "level"]]}),
+        ("status", "caster", "무모한 분노", 5, {"attack_modifier": ["*", 30, "level"], "defense_modifier": ["*", -10, "level"]}),
+    ),
+    # 회피율 50 증가 2턴
+    "mirror_image": (
+        ("say", "'{skill}' 발동... {caster}의 환영이 나타난다. (민첩 + 50)"),
+        ("status", "caster", "거울 환영", ["+", 2, "level"], {"evasion_modifier": 50}),
+    ),
+    # 방어력 20 * level 2턴
+    "bone_armor": (
+        ("say", "'{skill}' 발동... 뼈 갑옷이 {caster}을(를) 감싼다. (방어 + {value})", {"value": ["int", ["*", 20, "level"]]}),
+        ("status", "caster", "뼈 갑옷", 2, {"defense_modifier": ["*", 20, "level"]}),
+    ),
+    # 적 회피율 3턴 무시
+    "ensnare": (
+        ("say", "'{skill}' 발동... {target}의 발을 옭아맨다. (민첩 무시)"),
+        ("status", "target", "올가미", 3, {"ignore_evasion": True}),
+    ),
+    # 최대체력 * 0.15 * level * power 만큼 회복
+    "heal": (
+        ("say", "'{skill}' 발동... {caster}이(가) 죽음의 경계에서 생명을 얻는다."),
+        ("heal", "caster", ["*", "caster.max_health", 0.15, "level", "power"]),
+    ),
+    # 치명 증가
+    "sharpness": (
+        ("say", "'{skill}' 발동... {caster}이(가) 무기를 날카롭게 다듬는다. (치명 증가)"),
+        ("status", "caster", "예리함", 5, {"critical_modifier": ["+", 20, ["*", "level", 5]]}),
+    ),
+
+    # 몬스터 전용 스킬
+    "devour": (
+        ("say", "'{skill}' 발동... {caster}이(가) {target}을(를) 집어삼킨다."),
+        ("let", "damage", ["*", "caster.attack", 1.5]),
+        ("damage", "target", "damage"),
+        ("heal", "caster", ["*", "damage", 0.5]),
+    ),
+    "fire_breath": (
+        ("say", "'{skill}' 발동... {caster}이(가) 화염을 내뿜는다."),
+        ("damage", "target", "caster.attack"),
+        ("status", "target", "화상", 2, {"damage_per_turn": ["*", "caster.attack", 0.2]}),
+    ),
+    "frost_breath": (
+        ("say", "'{skill}' 발동... {caster}이(가) 냉기를 내뿜는다."),
+        ("damage", "target", ["/", "caster.attack", 2]),
+        ("status", "target", "빙결", 1, {"skip_turn": True}),
+    ),
+    "poison_breath": (
+        ("say", "'{skill}' 발동... {caster}이(가) 독기를 내뿜는다."),
+        ("status", "target", "중독", 3, {"damage_per_turn": ["*", "caster.attack", 0.5]}),
+    ),
+    "whirlpool": (
+        ("say", "'{skill}' 발동... {caster}이(가) 소용돌이를 일으킨다."),
+        ("damage", "target", ["*", "caster.attack", 1.2]),
+        ("status", "target", "바람", 3, {"evasion_modifier": -20}),
+        ("status", "caster", "소용돌이", 3, {"evasion_modifier": 20}),
+    ),
+    "pestilence": (
+        ("say", "'{skill}' 발동... 역병이 퍼진다."),
+        ("status", "target", "역병", 5, {"damage_per_turn": ["*", "caster.attack", 0.2], "attack_modifier": -5, "defense_modifier": -5}),
+    ),
+    "petrifying_gaze": (
+        ("say", "'{skill}' 발동... {target}이(가) 돌처럼 굳어간다."),
+        ("status", "target", "석화", 1, {"skip_turn": True, "defense_modifier": 50}),
+    ),
+    "soul_drain_aura": (
+        ("say", "'{skill}' 발동... {caster}이(가) 주변의 영혼을 흡수한다."),
+        ("damage", "target", ["*", "caster.attack", 0.5]),
+        ("heal", "caster", ["*", "caster.attack", 0.5]),
+    ),
+    "summon_abomination": (
+        ("say", "'{skill}' 발동... 혐오스러운 존재를 소환한다."),
+        ("status", "caster", "소환수와 함께", 99, {"attack_modifier": 10}),
+    ),
+    "time_warp": (
+        ("say", "시간의 흐름이 뒤틀린다."),
+    ),
+}
+
+# --- 힘 보상 후보 ---
+# random.choices(weights=...) 와 같은 누적 가중치를 미리 계산해 두면
+# loot_rng 를 똑같이 소비하면서 보상 화면마다 후보를 다시 훑지 않는다.
+class SkillOfferPool:
+    __slots__ = ("skills", "cum_weights", "high", "low")
+
+    def __init__(self, skills):
+        self.skills = tuple(skills)
+        self.cum_weights = tuple(itertools.accumulate(10 / s.rarity for s in self.skills))
+        self.high = tuple(s for s in self.skills if s.rarity >= 3)
+        self.low = tuple(s for s in self.skills if s.rarity < 3)
+
+# --- 콘텐츠 카탈로그 ---
+# 힘, 장비, 몬스터 템플릿. 프로세스마다 한 번 만들어 모든 Game 이 공유한다.
+# 템플릿은 바꾸지 않는다: 힘은 get_skill, 몬스터는 Monster.clone 으로 복제해서 쓴다.
+# content 를 주면 기본 콘텐츠 중 그 안에 있는 표(skills/equipment/monsters)를 갈아끼운다.
+class Catalog:
+    _shared = None
+
+    def __init__(self, content=None, validate=True):
         self.all_monsters = []
         self.all_equipment = []
         self.all_skills = []
         self.all_skills_map = {}
-        self._initialize_data()
+        self._initialize_data(content, validate)
 
-    def _initialize_data(self):
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _initialize_data(self, content=None, validate=True):
         self._initialize_skills()
         self._initialize_equipment()
         self._initialize_monsters()
+        if content:
+            self._apply_content(validate_content(content, self.effects) if validate else content)
+        self._index_monsters()
+        # 만든 뒤로는 읽기 전용
+        self.all_skills = tuple(self.all_skills)
+        self.all_skills_map = types.MappingProxyType(self.all_skills_map)
+        self.all_equipment = tuple(self.all_equipment)
+        self.all_monsters = tuple(self.all_monsters)
+        self.monster_pools = types.MappingProxyType({key: tuple(pool) for key, pool in self.monster_pools.items()})
+        self._index_skill_offers()
+
+    # 보상 화면의 후보 힘: 최대 레벨이 아니고 몬스터 전용이 아닌 템플릿.
+    # 보장 힘 하나를 뺀 경우마다 후보, 누적 가중치(10 / rarity), 보스용 희귀도 분할을 미리 만들어 둔다.
+    def _index_skill_offers(self):
+        offerable = [s for s in self.all_skills if s.level < s.max_level and not s.is_monster_only]
+        pools = {None: SkillOfferPool(offerable)}
+        for skill in offerable:
+            pools[skill.name] = SkillOfferPool([s for s in offerable if s.name != skill.name])
+        self.skill_offer_pools = types.MappingProxyType(pools)
 # 스킬 구현부
     def _initialize_skills(self):
-        # 기본 데미지 스킬
-        def damage(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 살점을 도려낸다.")
-            caster.deal_damage(target, caster.attack * (1 + skill.level/3) * skill.power, is_skill=True)
-
-        # 낮은 레벨 성장력 (power를 높혀주세요)
-        def pulverize(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 뼈를 으깬다.")
-            target.deal_damage(target, caster.attack * (1 + skill.level/5) * skill.power, is_skill=True)
-
-        # 높은 스킬 성장력 attack * level * power
-        def reaping(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 영혼을 부순다.")
-            target.deal_damage(target, caster.attack * skill.level * skill.power, is_skill=True)
-
-        # 고정 데미지 level * power
-        def fixed_damage(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}을(를) 강하게 내려친다.")
-            caster.deal_damage(target, (1 + skill.level / 3) * skill.power, is_skill=True)
-
-        # 낮은체력 대상 2배 데미지
-        def execute(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 마지막 숨통을 끊는다.")
-            damage = caster.attack * (1 + skill.level / 5) * skill.power
-            if target.current_health < target.max_health * 0.5:
-                time.sleep(0.5)
-                print(f"{target.name}의 낮은 생명은 더욱 큰 피해를 받는다.")
-                damage *= 2
-            caster.deal_damage(target, damage, is_skill=True)
-
-        # 고급 스킬 (power를 높혀주세요)
-        def advance_damage(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}을(를) 향해 일격을 날린다.")
-            caster.deal_damage(target, caster.attack * (1 + skill.level/2) * skill.power, is_skill=True)
-
-        def critical(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 급소를 노린다")
-            time.sleep(0.5)
-            caster.add_status_effect(StatusEffect("급소 포착", 0, critical_modifier=50))
-            caster.deal_damage(target, caster.attack * (1 + skill.level / 3) * skill.power, is_skill=True)
-        # 두번 공격
-        def flurry(caster, target, skill):
-            print(f"'{skill.name}' 발동... 핏빛 칼날이 춤춘다.")
-            caster.deal_damage(target, caster.attack * (skill.power + (skill.level / 5)), is_skill=True)
-            caster.deal_damage(target, caster.attack * (skill.power + (skill.level / 5)), is_skill=True)
-
-        # 생명력 흡수
-        def life_steal(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 생명을 흡수한다.")
-            caster.heal(caster.max_health * 0.2 * skill.level)
-            target.take_damage(caster.attack * skill.power)
-        # 방어력 증가 level * power
-        def iron_will(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 고통을 감내한다. (방어 + {skill.level * skill.power})")
-            caster.add_status_effect(StatusEffect("철의 의지", 5, defense_modifier=(skill.level * skill.power)))
-        # 공격력 증가 level * power
-        def war_cry(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}의 함성이 울린다.(공격 + {int(skill.level * skill.power)})")
-            caster.add_status_effect(StatusEffect("전투의 함성", 5, attack_modifier=(skill.level * skill.power)))
-        # 기절 skill.power 턴동안
-        def stun(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}을(를) 무력화시킨다. (행동 불가)")
-            target.add_status_effect(StatusEffect("기절", int(skill.power), skip_turn=True))
-        # 무적 power 턴동안
-        def shadow(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 그림자가 된다. (무적)")
-            caster.add_status_effect(StatusEffect("그림자 형상", skill.power, invincible=True))
-        # 방패로 강타 데미지 + 기절
-        def shiled_attack(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 방패로 강타한다. (방어수치 공격)")
-            target.take_damage(caster.defense * (1 + skill.level/3) * skill.power)
-        # 공격력 50% 증가 3턴 (상수)
-        def frenzy(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 광란에 휩싸인다. (공격 +50%)")
-            caster.add_status_effect(StatusEffect("광란", 3, attack_modifier=caster.attack * 0.5))
-        # 공격력 증가 power 턴 동안 1.5 + level / 2
-        def hate(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 증오를 집중한다. (공격 + {int((1 + skill.level / 2) * 100)}%)")
-            caster.add_status_effect(StatusEffect("증오 집중", skill.power, damage_dealt_modifier=(1 + skill.level / 2)))
-        # 매 턴 데미지 attack * 0.5 * level * power
-        def turn_damage(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 피를 말린다. (지속 피해)")
-            target.add_status_effect(StatusEffect("과다출혈", 3 + skill.level, damage_per_turn=caster.attack * skill.power))
-        # 적 데미지 50% 약화
-        def cripple(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 힘줄을 끊는다. (공격 -50%)")
-            target.add_status_effect(StatusEffect("불구", 1 + skill.level, attack_modifier=-target.attack * 0.5))
-        # 약자 멸시 주는피해 받는피해 100% 증가 999턴 (상수)
-        def scorn_the_weak(caster, target, skill):
-            print(f"'{skill.name}' 발동... (주는피해,받는피해 2배)")
-            target.add_status_effect(StatusEffect("약자멸시", 3, damage_taken_modifier=1.0, damage_dealt_modifier=1.0))
-        # 효과 없음
-        def taunt(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}을(를) 조롱한다...... (아무 효과 없음)")
-            pass
-        # 적 데미지 20% 3턴 약화 (상수)
-        def weaken(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}을(를) 약화시킨다. (공격 -30%)")
-            target.add_status_effect(StatusEffect("약화", 3, attack_modifier=-target.attack * 0.3))
-        # 적 받는 피해 20% 증가 3턴 (상수)
-        def shatter_bone(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 뼈를 뒤틀어 놓는다. (받는피해 +30%)")
-            target.add_status_effect(StatusEffect("골절", 5, damage_taken_modifier=0.3))
-        # 적 받는피해 증가
-        def hex(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}에게 끔찍한 저주를 내린다. (받는 피해 +60%)")
-            target.add_status_effect(StatusEffect("저주", 3 + skill.level, damage_taken_modifier=0.6))
-        # 회피율증가 10 * level 3턴
-        def fade(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}의 모습이 흐려진다. (민첩 + {int(10*skill.level)})")
-            caster.add_status_effect(StatusEffect("흐릿한 형상", 3, evasion_modifier=10 * skill.level))
-        # 방어무시 2 + level 턴
-        def break_armor(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 갑옷을 파괴한다. (방어 무시)")
-            target.add_status_effect(StatusEffect("노출", 3 + skill.level, ignore_defense=True, defense_modifier=-100))
-        # 적 부패 지속피해 (부패 최대체력 0 * 0.2)
-        def blight(caster, target, skill):
-            print(f"'{skill.name}' 발동... 부패의 구름이 {target.name}을(를) 감싼다. (생명 20% 지속피해)")
-            target.add_status_effect(StatusEffect("부패", skill.power, damage_per_turn=target.max_health * 0.2))
-        # 적 힘봉인 2턴
-        def silence(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 힘을 봉인한다. (힘 사용 불가)")
-            target.add_status_effect(StatusEffect("침묵", skill.power))
-        # 공격력 30 * level, 방어력 -10 * level 3턴
-        def reckless_abandon(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 모든 것을 내던진다. (공격 + {int(30 * skill.level)} , 방어 - {int(10 * skill.level)})")
-            caster.add_status_effect(StatusEffect("무모한 분노", 5, attack_modifier=30 * skill.level, defense_modifier=-10 * skill.level))
-       
-        # 회피율 50 증가 2턴
-        def mirror_image(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}의 환영이 나타난다. (민첩 + 50)")
-            caster.add_status_effect(StatusEffect("거울 환영", 2 + skill.level, evasion_modifier=50))
-        
-        # 방어력 20 * level 2턴
-        def bone_armor(caster, target, skill):
-            print(f"'{skill.name}' 발동... 뼈 갑옷이 {caster.name}을(를) 감싼다. (방어 + {int(20 * skill.level)})")
-            caster.add_status_effect(StatusEffect("뼈 갑옷", 2, defense_modifier=20 * skill.level))
-
-        # 적 회피율 3턴 무시
-        def ensnare(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}의 발을 옭아맨다. (민첩 무시)")
-            target.add_status_effect(StatusEffect("올가미", 3, ignore_evasion=True))
-        
-        # 최대체력 * 0.15 * level * power 만큼 회복
-        def heal(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 죽음의 경계에서 생명을 얻는다.")
-            caster.heal(caster.max_health * 0.15 * skill.level * skill.power)
-
-        # 치명 증가
-        def sharpness(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 무기를 날카롭게 다듬는다. (치명 증가)")
-            caster.add_status_effect(StatusEffect("예리함", 5, critical_modifier=(20 + skill.level * 5)))
-        
-
-        # 몬스터 전용 스킬
-        def devour(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) {target.name}을(를) 집어삼킨다.")
-            damage = caster.attack * 1.5
-            target.take_damage(damage)
-            caster.heal(damage * 0.5)
-
-        def fire_breath(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 화염을 내뿜는다.")
-            target.take_damage(caster.attack)
-            target.add_status_effect(StatusEffect("화상", 2, damage_per_turn=caster.attack * 0.2))
-
-        def frost_breath(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 냉기를 내뿜는다.")
-            target.take_damage(caster.attack / 2)
-            target.add_status_effect(StatusEffect("빙결", 1, skip_turn=True))
-
-        def poison_breath(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 독기를 내뿜는다.")
-            target.add_status_effect(StatusEffect("중독", 3, damage_per_turn=caster.attack * 0.5))
-
-        def whirlpool(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 소용돌이를 일으킨다.")
-            target.take_damage(caster.attack * 1.2)
-            target.add_status_effect(StatusEffect("바람", 3, evasion_modifier=-20))
-            caster.add_status_effect(StatusEffect("소용돌이", 3, evasion_modifier=20))
-
-        def pestilence(caster, target, skill):
-            print(f"'{skill.name}' 발동... 역병이 퍼진다.")
-            target.add_status_effect(StatusEffect("역병", 5, damage_per_turn=caster.attack * 0.2, attack_modifier=-5, defense_modifier=-5))
-
-        def petrifying_gaze(caster, target, skill):
-            print(f"'{skill.name}' 발동... {target.name}이(가) 돌처럼 굳어간다.")
-            target.add_status_effect(StatusEffect("석화", 1, skip_turn=True, defense_modifier=50))
-            
-        def soul_drain_aura(caster, target, skill):
-            print(f"'{skill.name}' 발동... {caster.name}이(가) 주변의 영혼을 흡수한다.")
-            target.take_damage(caster.attack * 0.5)
-            caster.heal(caster.attack * 0.5)
-
-        def summon_abomination(caster, target, skill):
-            print(f"'{skill.name}' 발동... 혐오스러운 존재를 소환한다.")
-            caster.add_status_effect(StatusEffect("소환수와 함께", 99, attack_modifier=10))
+        # 콘텐츠 파일의 "effect" 는 이 이름으로 찾는다
+        self.effects = {name: SkillEffect(name, steps) for name, steps in EFFECT_SPECS.items()}
+        fx = types.SimpleNamespace(**self.effects)
         self.all_skills = [
            
         # 일반 등급 (1)
 
-            Skill("찌르기", 1, 2, 1, 10, damage, power=1.0),
-            Skill("꿰뚫기", 1, 5, 1, 15, damage, power=0.9),
-            Skill("걷어차기", 1, 3, 1, 10, fixed_damage, power=20.0),
-            Skill("기습", 1, 5, 1, 2, reaping, power=1.5),
-            Skill("방패 밀어내기", 1, 5, 1, 10, shiled_attack, power=1.5),
-            Skill("물어뜯기", 1, 2, 2, 3, life_steal, power=1.0),
-            Skill("의지", 1, 3, 1, 3, iron_will, power=10),
-            Skill("함성", 1, 3, 1, 3, war_cry, power=10),
-            Skill("약화", 1, 3, 1, 10, weaken),
-            Skill("뼈 갑옷", 1, 3, 1, 2, bone_armor),
-            Skill("올가미", 1, 2, 1, 3, ensnare),
-            Skill("응급 처치", 1, 3, 1, 1, heal, power=1.0),
-            Skill("조롱", 1, 3, 1, 2, taunt, power=1.0),
-            Skill("기절", 1, 1, 1, 5, stun, power=1),
+            Skill("찌르기", 1, 2, 1, 10, fx.damage, power=1.0),
+            Skill("꿰뚫기", 1, 5, 1, 15, fx.damage, power=0.9),
+            Skill("걷어차기", 1, 3, 1, 10, fx.fixed_damage, power=20.0),
+            Skill("기습", 1, 5, 1, 2, fx.reaping, power=1.5),
+            Skill("방패 밀어내기", 1, 5, 1, 10, fx.shiled_attack, power=1.5),
+            Skill("물어뜯기", 1, 2, 2, 3, fx.life_steal, power=1.0),
+            Skill("의지", 1, 3, 1, 3, fx.iron_will, power=10),
+            Skill("함성", 1, 3, 1, 3, fx.war_cry, power=10),
+            Skill("약화", 1, 3, 1, 10, fx.weaken),
+            Skill("뼈 갑옷", 1, 3, 1, 2, fx.bone_armor),
+            Skill("올가미", 1, 2, 1, 3, fx.ensnare),
+            Skill("응급 처치", 1, 3, 1, 1, fx.heal, power=1.0),
+            Skill("조롱", 1, 3, 1, 2, fx.taunt, power=1.0),
+            Skill("기절", 1, 1, 1, 5, fx.stun, power=1),
 
         # 레어 등급 (2)
             
             #공격
-            Skill("방패 강타", 1, 3, 2, 10, shiled_attack, power=1.5),
-            Skill("예리한 일격", 1, 3, 2, 10, critical, power=1.2),
-            Skill("무릎 차기", 1, 3, 2, 5, fixed_damage, power=50.0),
-            Skill("분쇄", 1, 5, 2, 6, pulverize, power=1.5),
-            Skill("저돌적 돌진", 1, 2, 2, 2, advance_damage, power=1.5),
-            Skill("칼날의 춤", 1, 3, 2, 3, flurry, power=0.9),
-            Skill("이중 공격", 1, 3, 2, 4, flurry, power=1.0),
-            Skill("흡혈", 1, 3, 2, 3, life_steal, power=1.3),
-            Skill("과다출혈", 1, 3, 2, 5, turn_damage, power=1.2),
-            Skill("상완골 분쇄", 1, 2, 2, 5, cripple),
-            Skill("예리함 연마", 1, 2, 2, 5, sharpness),
-            Skill("광기의 함성", 1, 2, 2, 5, war_cry, power=20),
-            Skill("저주", 1, 1, 2, 5, hex, power=1.0),
-            Skill("악의 기도", 1, 2, 2, 3, hex, power=1.0),
-            Skill("침묵의 인장", 1, 2, 2, 2, silence, power=2),
-            Skill("무모한 분노", 1, 2, 2, 2, reckless_abandon),
-            Skill("거울 환영", 1, 3, 2, 5, mirror_image),
-            Skill("갑옷 부수기", 1, 3, 2, 3, break_armor),
-            Skill("증오", 1, 3, 2, 5, hate, power=2),
-            Skill("후두부 강타", 1, 1, 1, 5, stun, power=2),
+            Skill("방패 강타", 1, 3, 2, 10, fx.shiled_attack, power=1.5),
+            Skill("예리한 일격", 1, 3, 2, 10, fx.critical, power=1.2),
+            Skill("무릎 차기", 1, 3, 2, 5, fx.fixed_damage, power=50.0),
+            Skill("분쇄", 1, 5, 2, 6, fx.pulverize, power=1.5),
+            Skill("저돌적 돌진", 1, 2, 2, 2, fx.advance_damage, power=1.5),
+            Skill("칼날의 춤", 1, 3, 2, 3, fx.flurry, power=0.9),
+            Skill("이중 공격", 1, 3, 2, 4, fx.flurry, power=1.0),
+            Skill("흡혈", 1, 3, 2, 3, fx.life_steal, power=1.3),
+            Skill("과다출혈", 1, 3, 2, 5, fx.turn_damage, power=1.2),
+            Skill("상완골 분쇄", 1, 2, 2, 5, fx.cripple),
+            Skill("예리함 연마", 1, 2, 2, 5, fx.sharpness),
+            Skill("광기의 함성", 1, 2, 2, 5, fx.war_cry, power=20),
+            Skill("저주", 1, 1, 2, 5, fx.hex, power=1.0),
+            Skill("악의 기도", 1, 2, 2, 3, fx.hex, power=1.0),
+            Skill("침묵의 인장", 1, 2, 2, 2, fx.silence, power=2),
+            Skill("무모한 분노", 1, 2, 2, 2, fx.reckless_abandon),
+            Skill("거울 환영", 1, 3, 2, 5, fx.mirror_image),
+            Skill("갑옷 부수기", 1, 3, 2, 3, fx.break_armor),
+            Skill("증오", 1, 3, 2, 5, fx.hate, power=2),
+            Skill("후두부 강타", 1, 1, 1, 5, fx.stun, power=2),
 
         # 영웅 등급 (3)
 
-            Skill("처단", 1, 2, 3, 3, execute, power=2.0),
-            Skill("영혼 기절", 1, 1, 3, 5, stun, power=2),
-            Skill("그림자 형상", 1, 1, 3, 4, shadow, power=2),
-            Skill("약자멸시", 1, 1, 3, 10, scorn_the_weak),
-            Skill("영혼 갈취", 1, 1, 3, 5, life_steal, power=2.5),
-            Skill("생명 갈취", 1, 1, 2, 5, life_steal, power=2.1),
-            Skill("전장의 포효", 1, 1, 3, 10, war_cry, power=30),
-            Skill("최후의 방어", 1, 1, 3, 2, iron_will, power=50.0),
+            Skill("처단", 1, 2, 3, 3, fx.execute, power=2.0),
+            Skill("영혼 기절", 1, 1, 3, 5, fx.stun, power=2),
+            Skill("그림자 형상", 1, 1, 3, 4, fx.shadow, power=2),
+            Skill("약자멸시", 1, 1, 3, 10, fx.scorn_the_weak),
+            Skill("영혼 갈취", 1, 1, 3, 5, fx.life_steal, power=2.5),
+            Skill("생명 갈취", 1, 1, 2, 5, fx.life_steal, power=2.1),
+            Skill("전장의 포효", 1, 1, 3, 10, fx.war_cry, power=30),
+            Skill("최후의 방어", 1, 1, 3, 2, fx.iron_will, power=50.0),
             #Skill("정화", 1, 1, 1, 10, lambda c, t, s: c.status_effects.clear(), power=1.0),
-            Skill("어둠의 가호", 1, 1, 3, 1, bone_armor, power=40),
-            Skill("흐릿한 형상", 1, 1, 3, 5, fade, power=3),
-            Skill("피의 폭풍", 1, 1, 3, 2, turn_damage, power=2.0),
-            Skill("실명의 빛", 1, 1, 3, 5, stun, power=3),
-            Skill("초월의 그림자", 1, 1, 3, 3, shadow, power=3),
+            Skill("어둠의 가호", 1, 1, 3, 1, fx.bone_armor, power=40),
+            Skill("흐릿한 형상", 1, 1, 3, 5, fx.fade, power=3),
+            Skill("피의 폭풍", 1, 1, 3, 2, fx.turn_damage, power=2.0),
+            Skill("실명의 빛", 1, 1, 3, 5, fx.stun, power=3),
+            Skill("초월의 그림자", 1, 1, 3, 3, fx.shadow, power=3),
 
         # 전설 등급 (4)
 
-            Skill("유성우", 1, 1, 4, 3, advance_damage, power=4.0),
-            Skill("종말", 1, 1, 4, 5, advance_damage, power=4.0),
+            Skill("유성우", 1, 1, 4, 3, fx.advance_damage, power=4.0),
+            Skill("종말", 1, 1, 4, 5, fx.advance_damage, power=4.0),
 
             #피흡
-            Skill("영혼 포식", 1, 1, 4, 1, life_steal, power=2.5),
-            Skill("철옹성", 1, 1, 4, 5, iron_will, power=30.0),
-            Skill("태초 복구", 1, 1, 4, 5, heal, power=100.0), # 체력 전부 회복
+            Skill("영혼 포식", 1, 1, 4, 1, fx.life_steal, power=2.5),
+            Skill("철옹성", 1, 1, 4, 5, fx.iron_will, power=30.0),
+            Skill("태초 복구", 1, 1, 4, 5, fx.heal, power=100.0), # 체력 전부 회복
 
-            Skill("광전사의 격노", 1, 1, 4, 1, frenzy),
-            Skill("불멸의 그림자", 1, 1, 4, 2, shadow, power=4),
+            Skill("광전사의 격노", 1, 1, 4, 1, fx.frenzy),
+            Skill("불멸의 그림자", 1, 1, 4, 2, fx.shadow, power=4),
 
-            Skill("고대의 외침", 1, 1, 4, 5, war_cry, power=50),
-            Skill("차원 붕괴", 1, 1, 4, 1, pulverize, power=3.2),
+            Skill("고대의 외침", 1, 1, 4, 5, fx.war_cry, power=50),
+            Skill("차원 붕괴", 1, 1, 4, 1, fx.pulverize, power=3.2),
 
         # 몬스터 전용
-            Skill("사라지기", 1, 1, 5, 2, shadow, power=2.0,is_monster_only=True),
-            Skill("뼈 부수기", 1, 1, 5, 2, shatter_bone, power=1.0,is_monster_only=True),
-            Skill("부패의 손길", 1, 1, 5, 99, weaken, is_monster_only=True),
-            Skill("대지 분쇄", 1, 1, 5, 2, advance_damage, power=2.0,is_monster_only=True),
-            Skill("역병의 숨결", 1, 1, 5, 5, blight, power=2,is_monster_only=True),
-            Skill("시간 왜곡", 1, 1, 5, 99, lambda c, t, s: print("시간의 흐름이 뒤틀린다."),is_monster_only=True),
-            Skill("전염병", 1, 1, 5, 99, pestilence, is_monster_only=True, power=5),
-            Skill("석화의 시선", 1, 1, 5, 99, petrifying_gaze, is_monster_only=True, power=1),
-            Skill("영혼 흡수 오라", 1, 1, 5, 99, soul_drain_aura, is_monster_only=True, power=0.8),
-            Skill("혐오체 소환", 1, 1, 5, 99, summon_abomination, is_monster_only=True, power=99),
-            Skill("죽음의 손아귀", 1, 1, 5, 99, execute, is_monster_only=True, power=1.5),
-            Skill("공포의 눈빛", 1, 1, 5, 99, weaken, is_monster_only=True),
-            Skill("부패시키는 저주", 1, 1, 5, 99, turn_damage, is_monster_only=True, power=0.2),
-            Skill("지옥불 폭풍", 1, 1, 5, 99, advance_damage, is_monster_only=True, power=2.8),
-            Skill("영혼의 절규", 1, 1, 5, 99, silence, is_monster_only=True, power=2),
-            Skill("포식", 1, 1, 5, 99, devour, is_monster_only=True, power=3.0),
-            Skill("화염 숨결", 1, 1, 5, 99, fire_breath, is_monster_only=True, power=2.0),
-            Skill("빙결 숨결", 1, 1, 5, 99, frost_breath, is_monster_only=True, power=1),
-            Skill("독액 분출", 1, 1, 5, 99, poison_breath, is_monster_only=True, power=3),
-            Skill("소용돌이", 1, 1, 5, 99, whirlpool, is_monster_only=True, power=2),
-            Skill("영겁의 나락", 1, 1, 5, 99, stun, power=2,is_monster_only=True),
-            Skill("존재 소각", 1, 1, 5, 99, execute, power=3,is_monster_only=True),
-            Skill("신벌", 1, 1, 5, 99, execute, power=2.0,is_monster_only=True),
-            Skill("대지 가르기", 1, 1, 5, 4, advance_damage, power=1.2,is_monster_only=True),
-            Skill("그림자 암살", 1, 1, 5, 4, advance_damage, power=1.2,is_monster_only=True),
-            Skill("태초의 광기", 1, 1, 5, 4, frenzy ,is_monster_only=True),
+            Skill("사라지기", 1, 1, 5, 2, fx.shadow, power=2.0,is_monster_only=True),
+            Skill("뼈 부수기", 1, 1, 5, 2, fx.shatter_bone, power=1.0,is_monster_only=True),
+            Skill("부패의 손길", 1, 1, 5, 99, fx.weaken, is_monster_only=True),
+            Skill("대지 분쇄", 1, 1, 5, 2, fx.advance_damage, power=2.0,is_monster_only=True),
+            Skill("역병의 숨결", 1, 1, 5, 5, fx.blight, power=2,is_monster_only=True),
+            Skill("시간 왜곡", 1, 1, 5, 99, fx.time_warp,is_monster_only=True),
+            Skill("전염병", 1, 1, 5, 99, fx.pestilence, is_monster_only=True, power=5),
+            Skill("석화의 시선", 1, 1, 5, 99, fx.petrifying_gaze, is_monster_only=True, power=1),
+            Skill("영혼 흡수 오라", 1, 1, 5, 99, fx.soul_drain_aura, is_monster_only=True, power=0.8),
+            Skill("혐오체 소환", 1, 1, 5, 99, fx.summon_abomination, is_monster_only=True, power=99),
+            Skill("죽음의 손아귀", 1, 1, 5, 99, fx.execute, is_monster_only=True, power=1.5),
+            Skill("공포의 눈빛", 1, 1, 5, 99, fx.weaken, is_monster_only=True),
+            Skill("부패시키는 저주", 1, 1, 5, 99, fx.turn_damage, is_monster_only=True, power=0.2),
+            Skill("지옥불 폭풍", 1, 1, 5, 99, fx.advance_damage, is_monster_only=True, power=2.8),
+            Skill("영혼의 절규", 1, 1, 5, 99, fx.silence, is_monster_only=True, power=2),
+            Skill("포식", 1, 1, 5, 99, fx.devour, is_monster_only=True, power=3.0),
+            Skill("화염 숨결", 1, 1, 5, 99, fx.fire_breath, is_monster_only=True, power=2.0),
+            Skill("빙결 숨결", 1, 1, 5, 99, fx.frost_breath, is_monster_only=True, power=1),
+            Skill("독액 분출", 1, 1, 5, 99, fx.poison_breath, is_monster_only=True, power=3),
+            Skill("소용돌이", 1, 1, 5, 99, fx.whirlpool, is_monster_only=True, power=2),
+            Skill("영겁의 나락", 1, 1, 5, 99, fx.stun, power=2,is_monster_only=True),
+            Skill("존재 소각", 1, 1, 5, 99, fx.execute, power=3,is_monster_only=True),
+            Skill("신벌", 1, 1, 5, 99, fx.execute, power=2.0,is_monster_only=True),
+            Skill("대지 가르기", 1, 1, 5, 4, fx.advance_damage, power=1.2,is_monster_only=True),
+            Skill("그림자 암살", 1, 1, 5, 4, fx.advance_damage, power=1.2,is_monster_only=True),
+            Skill("태초의 광기", 1, 1, 5, 4, fx.frenzy ,is_monster_only=True),
 
         ]
         self.all_skills_map = {skill.name: skill for skill in self.all_skills}
@@ -849,6 +1522,12 @@ class Game:
             Monster("심연의 끝", 10, True, 2000, 150, 80, 20, 50, 0, [self.get_skill("존재 소각"), self.get_skill("영겁의 나락"), self.get_skill("지옥불 폭풍")]),
         ])
 
+    # (장, 보스 여부) 별 조우 목록
+    def _index_monsters(self):
+        self.monster_pools = {}
+        for monster in self.all_monsters:
+            self.monster_pools.setdefault((monster.stage, monster.is_boss), []).append(monster)
+
     def get_skill(self, name):
         skill_template = self.all_skills_map.get(name)
         if skill_template:
@@ -863,194 +1542,527 @@ class Game:
                          )
         return None
 
+    # --- 콘텐츠 표 ---
+    def export_content(self):
+        return {
+            "skills": [{field: getattr(s, field) if field != "effect" else s.effect.name
+                        for field in SKILL_FIELDS} for s in self.all_skills],
+            "equipment": [{field: getattr(e, field) for field in EQUIPMENT_FIELDS} for e in self.all_equipment],
+            "monsters": [{field: getattr(m, field) if field != "skills" else [s.name for s in m.skills]
+                          for field in MONSTER_FIELDS} for m in self.all_monsters],
+        }
+
+    def _apply_content(self, content):
+        content = dict(content)
+        if "skills" in content:
+            # 몬스터는 힘을 이름으로 들고 있으므로 새 힘 목록에 다시 연결한다
+            content.setdefault("monsters", self.export_content()["monsters"])
+            self.all_skills = [Skill(row["name"], row["level"], row["max_level"], row["rarity"], row["use_count"],
+                                     self.effects[row["effect"]], row["is_monster_only"], row["power"], row["desc"])
+                               for row in content["skills"]]
+            self.all_skills_map = {skill.name: skill for skill in self.all_skills}
+        if "equipment" in content:
+            self.all_equipment = [Equipment(**row) for row in content["equipment"]]
+        if "monsters" in content:
+            self.all_monsters = []
+            for row in content["monsters"]:
+                missing = [name for name in row["skills"] if name not in self.all_skills_map]
+                if missing:
+                    raise ContentError(f"monsters {row['name']}: 없는 힘 {missing}")
+                self.all_monsters.append(Monster(row["name"], row["stage"], row["is_boss"], row["max_health"],
+                                                 row["attack"], row["defense"], row["evasion"], row["critical"],
+                                                 row["gold"], [self.get_skill(name) for name in row["skills"]]))
+
+# --- 콘텐츠 파일 ---
+# 폴더에 skills.json, equipment.json, monsters.json 중 있는 것만 기본 콘텐츠를 대신한다.
+# 각 파일은 행(객체)의 목록이고, 몬스터는 힘을 이름으로 가리킨다.
+# 검사를 마친 결과는 사용자 캐시 폴더(CONTENT_CACHE_DIR)에 파일 내용 해시 이름의 JSON 으로 저장해 두고 다음부터 그대로 읽는다.
+# 콘텐츠 폴더는 남이 준 것일 수 있으므로 그 안에는 아무것도 쓰지 않고, 캐시는 실행되지 않는 형식으로만 둔다.
+CONTENT_FORMAT = 2
+CONTENT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                 "i_was_bored", "content")
+CONTENT_TABLES = ("skills", "equipment", "monsters")
+EQUIPMENT_PARTS = ("무기", "투구", "흉갑", "각반", "장신구")
+# (필드, 타입, 기본값) — 기본값이 REQUIRED 면 반드시 있어야 한다
+REQUIRED = object()
+NUMBER = (int, float)
+CONTENT_SCHEMA = {
+    "skills": (
+        ("name", str, REQUIRED), ("level", int, 1), ("max_level", int, REQUIRED), ("rarity", int, REQUIRED),
+        ("use_count", int, REQUIRED), ("effect", str, REQUIRED), ("is_monster_only", bool, False),
+        ("power", NUMBER, 1.0), ("desc", (str, type(None)), None),
+    ),
+    "equipment": (
+        ("name", str, REQUIRED), ("part", str, REQUIRED), ("stage", int, REQUIRED), ("health", NUMBER, 0),
+        ("attack", NUMBER, 0), ("defense", NUMBER, 0), ("price", int, 0), ("critical", NUMBER, 0),
+        ("evasion", NUMBER, 0), ("special", str, ""),
+    ),
+    "monsters": (
+        ("name", str, REQUIRED), ("stage", int, REQUIRED), ("is_boss", bool, REQUIRED),
+        ("max_health", NUMBER, REQUIRED), ("attack", NUMBER, REQUIRED), ("defense", NUMBER, 0),
+        ("evasion", NUMBER, 0), ("critical", NUMBER, 0), ("gold", int, 0), ("skills", list, REQUIRED),
+    ),
+}
+SKILL_FIELDS = tuple(field for field, _, _ in CONTENT_SCHEMA["skills"])
+EQUIPMENT_FIELDS = tuple(field for field, _, _ in CONTENT_SCHEMA["equipment"])
+MONSTER_FIELDS = tuple(field for field, _, _ in CONTENT_SCHEMA["monsters"])
+
+class ContentError(ValueError):
+    pass
+
+def _check_rows(table, rows, problems):
+    checked = []
+    if not isinstance(rows, list):
+        problems.append(f"{table}: 행의 목록이어야 한다")
+        return checked
+    for i, row in enumerate(rows):
+        where = f"{table}[{i}]"
+        if not isinstance(row, dict):
+            problems.append(f"{where}: 객체여야 한다")
+            continue
+        where = f"{table}[{i}] {row.get('name', '?')}"
+        unknown = set(row) - {field for field, _, _ in CONTENT_SCHEMA[table]}
+        if unknown:
+            problems.append(f"{where}: 알 수 없는 필드 {sorted(unknown)}")
+        normalized = {}
+        for field, kind, default in CONTENT_SCHEMA[table]:
+            if field not in row:
+                if default is REQUIRED:
+                    problems.append(f"{where}: {field} 가 없다")
+                normalized[field] = default
+                continue
+            value = row[field]
+            # bool 은 int 의 하위 타입이라 따로 막는다
+            if not isinstance(value, kind) or (isinstance(value, bool) and kind is not bool):
+                problems.append(f"{where}: {field} 의 타입이 잘못되었다 ({value!r})")
+            normalized[field] = value
+        checked.append(normalized)
+    return checked
+
+def validate_content(content, effects):
+    problems = []
+    unknown = set(content) - set(CONTENT_TABLES)
+    if unknown:
+        problems.append(f"알 수 없는 표 {sorted(unknown)}")
+    checked = {table: _check_rows(table, content[table], problems) for table in CONTENT_TABLES if table in content}
+
+    skill_names = set()
+    for row in checked.get("skills", ()):
+        if row["name"] in skill_names:
+            problems.append(f"skills {row['name']}: 이름이 겹친다")
+        skill_names.add(row["name"])
+        if row["effect"] not in effects:
+            problems.append(f"skills {row['name']}: 알 수 없는 효과 {row['effect']!r}")
+        if isinstance(row["level"], int) and isinstance(row["max_level"], int) and not 1 <= row["level"] <= row["max_level"]:
+            problems.append(f"skills {row['name']}: 1 <= level <= max_level 이어야 한다")
+        if isinstance(row["use_count"], int) and row["use_count"] < 1:
+            problems.append(f"skills {row['name']}: use_count 는 1 이상이어야 한다")
+        if isinstance(row["rarity"], int) and row["rarity"] < 1:
+            problems.append(f"skills {row['name']}: rarity 는 1 이상이어야 한다")
+    if "skills" not in checked:
+        skill_names = None
+
+    equipment_keys = set()
+    for row in checked.get("equipment", ()):
+        if row["part"] not in EQUIPMENT_PARTS:
+            problems.append(f"equipment {row['name']}: 알 수 없는 부위 {row['part']!r}")
+        if (row["part"], row["name"]) in equipment_keys:
+            problems.append(f"equipment {row['name']}: 같은 부위에 같은 이름이 있다")
+        equipment_keys.add((row["part"], row["name"]))
+        if isinstance(row["price"], int) and row["price"] < 0:
+            problems.append(f"equipment {row['name']}: price 는 0 이상이어야 한다")
+
+    for row in checked.get("monsters", ()):
+        if isinstance(row["max_health"], NUMBER) and row["max_health"] <= 0:
+            problems.append(f"monsters {row['name']}: max_health 는 0 보다 커야 한다")
+        if isinstance(row["skills"], list) and skill_names is not None:
+            for name in row["skills"]:
+                if name not in skill_names:
+                    problems.append(f"monsters {row['name']}: 없는 힘 {name!r}")
+    if problems:
+        raise ContentError("콘텐츠 오류:\n" + "\n".join(problems))
+    return checked
+
+def load_content(path, use_cache=True):
+    effects = Catalog.shared().effects
+    digest = hashlib.sha256(f"{CONTENT_FORMAT}:{','.join(sorted(effects))}".encode())
+    raw = {}
+    for table in CONTENT_TABLES:
+        file_path = os.path.join(path, table + ".json")
+        if os.path.exists(file_path):
+            with open(file_path, "rb") as f:
+                raw[table] = f.read()
+            digest.update(f"\0{table}\0".encode() + raw[table])
+    if not raw:
+        raise ContentError(f"{path} 에 콘텐츠 파일이 없다")
+    cache_path = os.path.join(CONTENT_CACHE_DIR, digest.hexdigest() + ".json")
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    content = validate_content({table: json.loads(data) for table, data in raw.items()}, effects)
+    if use_cache:
+        try:
+            os.makedirs(CONTENT_CACHE_DIR, exist_ok=True)
+            with open(f"{cache_path}.{os.getpid()}.tmp", "w", encoding="utf-8") as f:
+                json.dump(content, f, ensure_ascii=False)
+            os.replace(f"{cache_path}.{os.getpid()}.tmp", cache_path)
+        except OSError:
+            pass
+    return content
+
+def load_catalog(path, use_cache=True):
+    return Catalog(load_content(path, use_cache), validate=False)
+
+def save_content(content, path):
+    os.makedirs(path, exist_ok=True)
+    for table in CONTENT_TABLES:
+        if table in content:
+            with open(os.path.join(path, table + ".json"), "w", encoding="utf-8") as f:
+                f.write("[\n")
+                f.write(",\n".join(json.dumps(row, ensure_ascii=False) for row in content[table]))
+                f.write("\n]\n")
+
+# --- 게임 클래스 ---
+class Game:
+    # profiling.Profiler.attach 가 설정하고, 새 몬스터에도 넘겨준다
+    profiler = None
+
+    # headless=True 면 연출 대기 없이 진행하고, 서술은 sink 로 보낸다 (None 이면 버림)
+    # decider 는 모든 선택을 대신한다 (기본: 키보드 입력)
+    # seed 가 같으면 같은 선택에 대해 같은 판이 재현된다 (None 이면 전역 random 에서 뽑음)
+    # checkpoint_dir 를 주면 매 장을 시작할 때 그 폴더에 stage_N.sav 를 남긴다
+    # catalog 를 주지 않으면 프로세스 공용 카탈로그를 쓴다
+    # narrator 를 주면 headless/sink 대신 그것으로 서술한다
+    # events 는 이 판의 플레이어와 몬스터가 함께 쓰는 EventBus 이다 (game.events.subscribe(DamageTaken, f))
+    # headless 가 아니고 sink 도 없으면 화면 단위로 모아 쓰고, 연출 대기는 speed 배가 된다 (0 이면 대기 없음)
+    def __init__(self, headless=False, sink=None, decider=None, seed=None, checkpoint_dir=None, catalog=None,
+                 narrator=None, speed=1.0):
+        self.headless = headless
+        self.checkpoint_dir = checkpoint_dir
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        self.decider = decider or HumanDecider()
+        if narrator is not None:
+            self.narrator = narrator
+        elif headless:
+            self.narrator = Narrator(sink, pacing=False)
+        elif sink is not None:
+            self.narrator = Narrator(sink)
+        else:
+            self.narrator = FrameNarrator(speed=speed)
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        # 전투, 조우, 전리품, 상점 난수는 서로 독립된 흐름을 쓴다
+        self.combat_rng = random.Random(f"{self.seed}/combat")
+        self.encounter_rng = random.Random(f"{self.seed}/encounter")
+        self.loot_rng = random.Random(f"{self.seed}/loot")
+        self.shop_rng = random.Random(f"{self.seed}/shop")
+        self.player = Player("방랑자(당신)")
+        self.player.narrator = self.narrator
+        self.player.rng = self.combat_rng
+        self.events = self.player.events = EventBus()
+        self.stage = 1
+        self.battle_count = 0
+        self.catalog = catalog or Catalog.shared()
+        self.all_monsters = self.catalog.all_monsters
+        self.all_equipment = self.catalog.all_equipment
+        self.all_skills = self.catalog.all_skills
+        self.all_skills_map = self.catalog.all_skills_map
+        self.monster_pools = self.catalog.monster_pools
+
+    def get_skill(self, name):
+        return self.catalog.get_skill(name)
+
+    # --- 저장/불러오기 ---
+    # 저장 파일: SAVE_MAGIC + 버전 1바이트 + zlib 으로 압축한 JSON
+    # 힘의 효과는 함수라 이름만 저장하고 all_skills_map 으로 다시 연결한다
+    def save_state(self):
+        player = self.player
+        state = {
+            "seed": self.seed,
+            "stage": self.stage,
+            "battle_count": self.battle_count,
+            "rng": {name: rng_state(getattr(self, name)) for name in RNG_STREAMS},
+            "player": {
+                "name": player.name,
+                "stats": [getattr(player, key) for key in PLAYER_STATE_FIELDS],
+                "special": player.special,
+                "equipment": {part: item.name if item else None for part, item in player.equipment.items()},
+                "skills": [[s.name, s.level, s.use_count, s.initial_use_count] for s in player.skills],
+                "status_effects": [[getattr(e, key) for key in EffectDefinition.__slots__] + [e.duration]
+                                   for e in player.status_effects],
+            },
+        }
+        if hasattr(self.decider, "rng"):
+            state["decider_rng"] = rng_state(self.decider.rng)
+        data = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return SAVE_MAGIC + bytes([SAVE_VERSION]) + zlib.compress(data)
+
+    def load_state(self, blob):
+        if blob[:len(SAVE_MAGIC)] != SAVE_MAGIC:
+            raise ValueError("i_was_bored 저장 파일이 아니다")
+        version = blob[len(SAVE_MAGIC)]
+        if version != SAVE_VERSION:
+            raise ValueError(f"지원하지 않는 저장 파일 버전: {version}")
+        state = json.loads(zlib.decompress(blob[len(SAVE_MAGIC) + 1:]).decode("utf-8"))
+
+        self.seed = state["seed"]
+        self.stage = state["stage"]
+        self.battle_count = state["battle_count"]
+        for name in RNG_STREAMS:
+            getattr(self, name).setstate(rng_from_state(state["rng"][name]))
+        if "decider_rng" in state and hasattr(self.decider, "rng"):
+            self.decider.rng.setstate(rng_from_state(state["decider_rng"]))
+
+        saved = state["player"]
+        player = self.player
+        player.name = saved["name"]
+        for key, value in zip(PLAYER_STATE_FIELDS, saved["stats"]):
+            setattr(player, key, value)
+        player.special = saved["special"]
+        items = {(item.part, item.name): item for item in self.all_equipment}
+        player.equipment = {part: items[(part, name)] if name else None
+                            for part, name in saved["equipment"].items()}
+        player.skills = []
+        for name, level, use_count, initial_use_count in saved["skills"]:
+            skill = self.get_skill(name)
+            skill.level = level
+            skill.use_count = use_count
+            skill.initial_use_count = initial_use_count
+            player.skills.append(skill)
+        player.status_effects = []
+        for row in saved["status_effects"]:
+            player.status_effects.append(StatusEffect(row[0], row[-1], *row[1:-1]))
+        player._rebuild_effect_cache()
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.save_state())
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        game = cls(**kwargs)
+        with open(path, "rb") as f:
+            game.load_state(f.read())
+        return game
+
     def start(self):
-        print("...어둠 속에서 희미한 의식이 깨어난다...\n")
-        time.sleep(2)
-        print("심연의 깊은 구멍 속 종소리가 메아리친다...\n")
-        time.sleep(2)
-        print("너는 부름을 받았다. 움직이자.")
-        time.sleep(2)
+        alive = self.play(self.run())
+        if not self.headless:
+            self.narrator.present()
+            input()
+        return alive
+
+    # 진행 흐름(제너레이터)을 decider 로 끝까지 돌리고 흐름의 반환값을 돌려준다
+    def play(self, flow):
+        try:
+            request = next(flow)
+            while True:
+                request = flow.send(self.decider.decide(self, request.kind, request.options, request.subject))
+        except StopIteration as stop:
+            return stop.value
+
+    def run(self):
+        self.narrator.say("...어둠 속에서 희미한 의식이 깨어난다...\n")
+        self.narrator.wait(2)
+        self.narrator.say("심연의 깊은 구멍 속 종소리가 메아리친다...\n")
+        self.narrator.wait(2)
+        self.narrator.say("너는 부름을 받았다. 움직이자.")
+        self.narrator.wait(2)
         while self.player.is_alive() and self.stage <= 10:
-            self.progress_stage()
+            yield from self.progress_stage()
         if self.player.is_alive():
-            print("너의 발자취는 피로 쓰였고, 이곳엔 아무것도 남아있지 않다")
-            time.sleep(2)
-            print("끈질긴 생명이다. 하지만 이 저주받은 땅에서 네놈의 공허한 여정은 끝나지 않았다.\n")
-            time.sleep(2)
-            print("Thanks for playing :3")
-            input()
+            self.narrator.say("너의 발자취는 피로 쓰였고, 이곳엔 아무것도 남아있지 않다")
+            self.narrator.wait(2)
+            self.narrator.say("끈질긴 생명이다. 하지만 이 저주받은 땅에서 네놈의 공허한 여정은 끝나지 않았다.\n")
+            self.narrator.wait(2)
+            self.narrator.say("Thanks for playing :3")
         else:
-            print("결국, 너의 영혼도 이 땅의 일부가 되었다.\n")
-            input()
+            self.narrator.say("결국, 너의 영혼도 이 땅의 일부가 되었다.\n")
+        return self.player.is_alive()
 
     def progress_stage(self):
-        print(f"\n--------- 제 {self.stage} 장 ---------\n")
+        if self.checkpoint_dir:
+            self.save(os.path.join(self.checkpoint_dir, f"stage_{self.stage}.sav"))
+        self.narrator.say(f"\n--------- 제 {self.stage} 장 ---------\n")
         if self.stage == 1:
-            print("           깨어난 곳         ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("어둠 속에서 길을 찾는다...\n"); time.sleep(1.5)
-            print("동굴의 음습함은 너를 기분 좋게 만들었다.\n"); time.sleep(1.5)
-            print("하지만, 이곳은 결코 안전하지 않다.\n"); time.sleep(1.5)
+            self.narrator.say("           깨어난 곳         ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("어둠 속에서 길을 찾는다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("동굴의 음습함은 너를 기분 좋게 만들었다.\n"); self.narrator.wait(1.5)
+            self.narrator.say("하지만, 이곳은 결코 안전하지 않다.\n"); self.narrator.wait(1.5)
         if self.stage == 2:
-            print("             깊은 동굴         ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("깊은 동굴 속, 차가운 공기가 피부를 스친다.\n"); time.sleep(1.5)
-            print("어둠 속에서 무언가가 너를 지켜보고 있다...\n"); time.sleep(1.5)
-            print("긴장감을 늦추지 말아야 한다.\n"); time.sleep(1.5)
+            self.narrator.say("             깊은 동굴         ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("깊은 동굴 속, 차가운 공기가 피부를 스친다.\n"); self.narrator.wait(1.5)
+            self.narrator.say("어둠 속에서 무언가가 너를 지켜보고 있다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("긴장감을 늦추지 말아야 한다.\n"); self.narrator.wait(1.5)
         if self.stage == 3:
-            print("             물 웅덩이         ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("동굴의 벽이 점점 좁아진다...\n"); time.sleep(1.5)
-            print("발밑에서 물방울이 떨어지는 소리가 메아리친다.\n"); time.sleep(1.5)
-            print("너는 물 웅덩이를 힘껏 즈려밟는다.\n"); time.sleep(1.5)
+            self.narrator.say("             물 웅덩이         ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("동굴의 벽이 점점 좁아진다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("발밑에서 물방울이 떨어지는 소리가 메아리친다.\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 물 웅덩이를 힘껏 즈려밟는다.\n"); self.narrator.wait(1.5)
         if self.stage == 4:
-            print("             심연의 소리        ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("어둠 속에서 무언가가 꿈틀거린다...\n"); time.sleep(1.5)
-            print("숨을 죽이고, 귀를 기울인다...\n"); time.sleep(1.5)
-            print("너는 이곳에서 살아남아야 한다.\n"); time.sleep(1.5)
+            self.narrator.say("             심연의 소리        ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("어둠 속에서 무언가가 꿈틀거린다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("숨을 죽이고, 귀를 기울인다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이곳에서 살아남아야 한다.\n"); self.narrator.wait(1.5)
         if self.stage == 5:
-            print("             빛의 흔적         ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("동굴의 벽이 빛을 반사한다...\n"); time.sleep(1.5)
-            print("희미한 빛줄기가 너의 길을 비춘다...\n"); time.sleep(1.5)
-            print("너는 이 빛을 따라가야 한다.\n"); time.sleep(1.5)
+            self.narrator.say("             빛의 흔적         ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("동굴의 벽이 빛을 반사한다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("희미한 빛줄기가 너의 길을 비춘다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이 빛을 따라가야 한다.\n"); self.narrator.wait(1.5)
         if self.stage == 6:
-            print("             차가운 바람        ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("차가운 바람이 동굴 속을 휘감는다...\n"); time.sleep(1.5)
-            print("너는 이 바람 속에서 무언가를 느낀다...\n"); time.sleep(1.5)
-            print("이 바람은 너를 시험에 들게 할 것이다.\n"); time.sleep(1.5)
+            self.narrator.say("             차가운 바람        ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("차가운 바람이 동굴 속을 휘감는다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이 바람 속에서 무언가를 느낀다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("이 바람은 너를 시험에 들게 할 것이다.\n"); self.narrator.wait(1.5)
         if self.stage == 7:
-            print("             거친 벽          ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("동굴의 벽이 점점 더 거칠어진다...\n"); time.sleep(1.5)
-            print("너는 이 거친 벽을 지나야 한다...\n"); time.sleep(1.5)
-            print("너는 이곳에서 길을 잃지 말아야 한다.\n"); time.sleep(1.5)
+            self.narrator.say("             거친 벽          ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("동굴의 벽이 점점 더 거칠어진다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이 거친 벽을 지나야 한다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이곳에서 길을 잃지 말아야 한다.\n"); self.narrator.wait(1.5)
         if self.stage == 8:
-            print("             속삭이는 어둠       ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("어둠 속에서 무언가가 속삭인다...\n"); time.sleep(1.5)
-            print("너는 이 속삭임에 귀를 기울인다...\n"); time.sleep(1.5)
-            print("이 속삭임은 너를 미치게 할 것이다.\n"); time.sleep(1.5)
+            self.narrator.say("             속삭이는 어둠       ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("어둠 속에서 무언가가 속삭인다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이 속삭임에 귀를 기울인다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("이 속삭임은 너를 미치게 할 것이다.\n"); self.narrator.wait(1.5)
         if self.stage == 9:
-            print("             빛 속의 그림자         ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("동굴의 벽이 점점 더 빛난다...\n"); time.sleep(1.5)
-            print("너는 이 빛 속에서 무언가를 본다...\n"); time.sleep(1.5)
-            print("끝이 다가오고 있다는것을 직감한다.\n"); time.sleep(1.5)
+            self.narrator.say("             빛 속의 그림자         ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("동굴의 벽이 점점 더 빛난다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이 빛 속에서 무언가를 본다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("끝이 다가오고 있다는것을 직감한다.\n"); self.narrator.wait(1.5)
         if self.stage == 10:
-            print("             심연의 끝         ")
-            print("-----------------------------"); time.sleep(1.5)
-            print("어둠 속에서 무언가가 울부짖는다...\n"); time.sleep(1.5)
-            print("너는 이 울부짖음에 귀를 기울인다...\n"); time.sleep(1.5)
-            print("마지막이 되리란 예감이 든다.\n"); time.sleep(1.5)
-        print("- 한발짝 더 나아간다... -\n")
-        time.sleep(2)
+            self.narrator.say("             심연의 끝         ")
+            self.narrator.say("-----------------------------"); self.narrator.wait(1.5)
+            self.narrator.say("어둠 속에서 무언가가 울부짖는다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("너는 이 울부짖음에 귀를 기울인다...\n"); self.narrator.wait(1.5)
+            self.narrator.say("마지막이 되리란 예감이 든다.\n"); self.narrator.wait(1.5)
+        self.narrator.say("- 한발짝 더 나아간다... -\n")
+        self.narrator.wait(2)
         self.battle_count = 0
         while self.battle_count < 3:
             self.battle_count += 1
-            print(f"\n--- 피비린내 나는 전투 {self.battle_count}/3 ---")
+            if not self.narrator.silent:
+                self.narrator.say(f"\n--- 피비린내 나는 전투 {self.battle_count}/3 ---")
             monster = self.get_random_monster(self.stage, is_boss=False)
-            if not self.battle(monster):
+            if not (yield from self.battle(monster)):
                 return
-        time.sleep(1)
+        self.narrator.wait(1)
         boss = self.get_random_monster(self.stage, is_boss=True)
-        if self.battle(boss):
+        if (yield from self.battle(boss)):
             self.player.heal(round(self.player.max_health * 0.5))
             self.stage += 1
-            self.shop()
+            yield from self.shop()
         else:
             return
 
     def get_random_monster(self, stage, is_boss):
-        monster_pool = [m for m in self.all_monsters if m.stage == stage and m.is_boss == is_boss]
-        monster_template = random.choice(monster_pool) if monster_pool else None
-        if not monster_template:
+        monster_pool = self.monster_pools.get((stage, is_boss))
+        if not monster_pool:
             return None
-        monster = Monster(monster_template.name, monster_template.stage, monster_template.is_boss, 
-                          monster_template.max_health, monster_template.attack, monster_template.defense, 
-                          monster_template.evasion, monster_template.critical, monster_template.gold, monster_template.skills)
-        
+        monster = self.encounter_rng.choice(monster_pool).clone()
+        monster.narrator = self.narrator
+        monster.rng = self.combat_rng
+        monster.events = self.events
+        if self.profiler is not None:
+            monster.profiler = self.profiler
         return monster
 
     def battle(self, monster):
-        print(f"\n{monster.name}이(가) 모습을 드러냈다.\n")
-        time.sleep(1)
+        if not self.narrator.silent:
+            self.narrator.say(f"\n{monster.name}이(가) 모습을 드러냈다.\n")
+        self.narrator.wait(1)
+        turns = 0
         while self.player.is_alive() and monster.is_alive():
+            turns += 1
             monster.show_stats()
             self.player.show_stats()
             if not monster.is_alive(): break            
             if self.player.apply_turn_effects():
-                self.player_turn(monster)
+                yield from self.player_turn(monster)
             self.player.after_turn_effects()
             if not monster.is_alive(): break
             if monster.apply_turn_effects():
                 self.monster_turn(monster)
             if not self.player.is_alive(): break
             monster.after_turn_effects()
+            self.narrator.end_turn()
+        self.narrator.end_turn()
+        if BattleEnded in self.events.listening:
+            self.events.emit(BattleEnded(self.player, monster, self.stage, self.player.is_alive(), turns))
         if self.player.is_alive():
-            print(f"\n{monster.name}의 시체를 넘고 전진한다.\n")
-            time.sleep(1)
+            if not self.narrator.silent:
+                self.narrator.say(f"\n{monster.name}의 시체를 넘고 전진한다.\n")
+            self.narrator.wait(1)
             self.player.gold += monster.gold
-            print(f"{monster.gold}G의 피 묻은 금화를 챙겼다. (현재 소지량: {self.player.gold}G)\n")
-            time.sleep(1)
-            self.battle_reward(is_boss=monster.is_boss)
+            if GoldGained in self.events.listening:
+                self.events.emit(GoldGained(self.player, monster.gold, self.player.gold, "battle"))
+            if not self.narrator.silent:
+                self.narrator.say(f"{monster.gold}G의 피 묻은 금화를 챙겼다. (현재 소지량: {self.player.gold}G)\n")
+            self.narrator.wait(1)
+            yield from self.battle_reward(is_boss=monster.is_boss)
             return True
         else:
-            print(f"\n{self.player.name}은(는) 결국 쓰러졌다...\n")
-            time.sleep(1)
+            if not self.narrator.silent:
+                self.narrator.say(f"\n{self.player.name}은(는) 결국 쓰러졌다...\n")
+            self.narrator.wait(1)
             return False
 
     def player_turn(self, monster):
-        time.sleep(0.5)
-        print("\n1. 휘두르기 Lv.1 (*)")
+        self.narrator.wait(0.5)
+        self.narrator.say("\n1. 휘두르기 Lv.1 (*)")
         if self.player.has_status("침묵"):
-            print("너는 침묵 상태이다. 힘을 사용할 수 없다.")
-            time.sleep(0.5)
+            self.narrator.say("너는 침묵 상태이다. 힘을 사용할 수 없다.")
+            self.narrator.wait(0.5)
         else:
             for i, skill in enumerate(self.player.skills):
-                print(f"{i+2}. {skill.name} Lv.{skill.level} ({skill.use_count}/{skill.initial_use_count})")
-                time.sleep(0.5)
-        while True:
-            try:
-                choice = int(input("행동을 선택하자: "))
-                if 1 <= choice <= len(self.player.skills) + 1:
-                    break
-                else:
-                    print("어둠 속에서 길을 잃었는가? 다시 선택하라.")
-            except ValueError:
-                print("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
+                if not self.narrator.silent:
+                    self.narrator.say(f"{i+2}. {skill.name} Lv.{skill.level} ({skill.use_count}/{skill.initial_use_count})")
+                self.narrator.wait(0.5)
+        options = [None] + self.player.skills
+        skill = options[(yield Decision("action", options, monster))]
 
-        if choice == 1:
+        if skill is None:
             #self.player.deal_physical_damage(monster, self.player.attack)
             self.player.deal_damage(monster, self.player.attack)
         else:
-            skill = self.player.skills[choice-2]
             skill.execute(self.player, monster)
             if skill.use_count <= 0:
                 self.player.skills.remove(skill)
-                print(f"{skill.name}의 힘을 모두 소진했다.\n")
+                if SkillExhausted in self.events.listening:
+                    self.events.emit(SkillExhausted(self.player, skill))
+                self.narrator.say(f"{skill.name}의 힘을 모두 소진했다.\n")
 
 
     def monster_turn(self, monster_obj):
-        if monster_obj.skills and random.random() < 0.3 and not monster_obj.has_status("침묵"):
-            skill = random.choice(monster_obj.skills)
-            print(f"{monster_obj.name}이(가) {skill.name}을(를) 사용한다.")
+        if monster_obj.skills and self.combat_rng.random() < 0.3 and not monster_obj.has_status("침묵"):
+            skill = self.combat_rng.choice(monster_obj.skills)
+            if not self.narrator.silent:
+                self.narrator.say(f"{monster_obj.name}이(가) {skill.name}을(를) 사용한다.")
             skill.execute(monster_obj, self.player)
         else:
-            print(f"{monster_obj.name}의 공격.")
+            if not self.narrator.silent:
+                self.narrator.say(f"{monster_obj.name}의 공격.")
             monster_obj.deal_damage(self.player, monster_obj.attack)
-    time.sleep(1.5)
 
     def battle_reward(self, is_boss):
-        print("\n--- 적을 무로 돌렸다 ---")
-        time.sleep(2)
+        self.narrator.say("\n--- 적을 무로 돌렸다 ---")
+        self.narrator.wait(2)
         heal_amount = round(self.player.max_health * 0.2)
         self.player.heal(heal_amount)
     
-        print("너는 이 전투에서 무엇을 얻었는가:\n")
-        time.sleep(1.5)
+        self.narrator.say("너는 이 전투에서 무엇을 얻었는가:\n")
+        self.narrator.wait(1.5)
     
         health_increase = 10 + (self.stage * 2)
         attack_increase = 3 + (self.stage // 2)
@@ -1066,116 +2078,96 @@ class Game:
             choices_data.append(("예리함 연마", "critical", crit_increase, "치명"))
     
         for i, (name, stat_key, value, unit_text) in enumerate(choices_data):
-            print(f"{i+1}. {name} (+{value} {unit_text})\n")
-            time.sleep(0.5)
+            self.narrator.say(f"{i+1}. {name} (+{value} {unit_text})\n")
+            self.narrator.wait(0.5)
     
-        while True:
-            try:
-                prompt = f"선택의 시간이다. (1-{len(choices_data)}): "
-                choice = int(input(prompt))
-                if 1 <= choice <= len(choices_data):
-                    chosen_name, stat_key, value, _ = choices_data[choice - 1]
-                    if stat_key == "max_health":
-                        self.player.max_health += value
-                        self.player.current_health += value
-                        print(f"{chosen_name}으로 생명력이 {value}만큼 증가했다.\n")
-                    elif stat_key == "attack":
-                        self.player._base_attack += value
-                        self.player.attack += value
-                        print(f"{chosen_name}으로 공격력이 {value}만큼 증가했다.\n")
-                    elif stat_key == "defense":
-                        self.player._base_defense += value
-                        self.player.defense += value
-                        print(f"{chosen_name}으로 방어력이 {value}만큼 증가했다.\n")
-                    elif stat_key == "critical":
-                        self.player.critical += value
-                        print(f"{chosen_name}으로 치명타가 {value}만큼 증가했다.\n")
-                    break
-                else:
-                    print("어둠 속에서 길을 잃었는가? 다시 선택하라.")
-            except ValueError:
-                print("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
-        time.sleep(1)
+        choice = yield Decision("upgrade", choices_data)
+        chosen_name, stat_key, value, _ = choices_data[choice]
+        if stat_key == "max_health":
+            self.player.max_health += value
+            self.player.current_health += value
+            self.narrator.say(f"{chosen_name}으로 생명력이 {value}만큼 증가했다.\n")
+        elif stat_key == "attack":
+            self.player._base_attack += value
+            self.player.attack += value
+            self.narrator.say(f"{chosen_name}으로 공격력이 {value}만큼 증가했다.\n")
+        elif stat_key == "defense":
+            self.player._base_defense += value
+            self.player.defense += value
+            self.narrator.say(f"{chosen_name}으로 방어력이 {value}만큼 증가했다.\n")
+        elif stat_key == "critical":
+            self.player.critical += value
+            self.narrator.say(f"{chosen_name}으로 치명타가 {value}만큼 증가했다.\n")
+        self.narrator.wait(1)
     
-        self.skill_acquisition(is_boss)
-
-    def skill_acquisition(self, is_boss):
-        print("\n어둠 속에서 새로운 힘이 느껴진다...\n")
-        time.sleep(1)
-
-        potential_skills_to_offer = [s for s in self.all_skills if s.level < s.max_level and not s.is_monster_only]
+        yield from self.skill_acquisition(is_boss)
 
+    # 보상으로 제안할 힘 (최대 3개, 이름 중복 없음)
+    def skill_offers(self, is_boss):
         player_unmaxed_skills = [s for s in self.player.skills if s.level < s.max_level]
 
         choices = []
-
+        pools = self.catalog.skill_offer_pools
+        offers = pools[None]
 
         if player_unmaxed_skills:
-            guaranteed_skill = random.choice(player_unmaxed_skills)
+            guaranteed_skill = self.loot_rng.choice(player_unmaxed_skills)
             choices.append(guaranteed_skill)
 
-            potential_skills_to_offer = [s for s in potential_skills_to_offer if s.name != guaranteed_skill.name]
+            offers = pools.get(guaranteed_skill.name, offers)
 
         remaining_slots = 3 - len(choices)
 
         if remaining_slots > 0:
             if is_boss:
-                high_rarity_skills = [s for s in potential_skills_to_offer if s.rarity >= 3]
-                low_rarity_skills = [s for s in potential_skills_to_offer if s.rarity < 3]
-
-                if high_rarity_skills:
-                    choices.extend(random.sample(high_rarity_skills, min(remaining_slots, len(high_rarity_skills))))
+                if offers.high:
+                    choices.extend(self.loot_rng.sample(offers.high, min(remaining_slots, len(offers.high))))
                     remaining_slots = 3 - len(choices)
 
-                if remaining_slots > 0 and low_rarity_skills:
-                    choices.extend(random.sample(low_rarity_skills, min(remaining_slots, len(low_rarity_skills))))
+                if remaining_slots > 0 and offers.low:
+                    choices.extend(self.loot_rng.sample(offers.low, min(remaining_slots, len(offers.low))))
 
             else: # 보스가 아닐때
-                if potential_skills_to_offer:
-
-                    weights = [10 / s.rarity for s in potential_skills_to_offer]
-
-                    num_to_pick = min(remaining_slots, len(potential_skills_to_offer))
-                    choices.extend(random.choices(potential_skills_to_offer, weights=weights, k=num_to_pick))
+                if offers.skills:
+                    num_to_pick = min(remaining_slots, len(offers.skills))
+                    choices.extend(self.loot_rng.choices(offers.skills, cum_weights=offers.cum_weights, k=num_to_pick))
         unique_choices = []
         seen_names = set()
         for skill in choices:
             if skill.name not in seen_names:
                 unique_choices.append(skill)
                 seen_names.add(skill.name)
-        choices = unique_choices
+        return unique_choices
+
+    def skill_acquisition(self, is_boss):
+        self.narrator.say("\n어둠 속에서 새로운 힘이 느껴진다...\n")
+        self.narrator.wait(1)
+
+        choices = self.skill_offers(is_boss)
         
         if not choices:
-            print("더 이상 얻을 수 있는 힘이 없다.\n")
-            time.sleep(1)
+            self.narrator.say("더 이상 얻을 수 있는 힘이 없다.\n")
+            self.narrator.wait(1)
             return
 
-        print("어떤 힘을 받아들이겠는가, 가진 힘을 고르면 해당 힘이 더욱 강해진다:\n")
-        time.sleep(1)
+        self.narrator.say("어떤 힘을 받아들이겠는가, 가진 힘을 고르면 해당 힘이 더욱 강해진다:\n")
+        self.narrator.wait(1)
         for i, skill in enumerate(choices):
             current_level = next((s.level for s in self.player.skills if s.name == skill.name), 0)
-            print(f"{i+1}. {skill.name} (시전 가능 횟수: {skill.use_count}, 희귀도: {skill.rarity}, 레벨: {current_level}/{skill.max_level})")
-            time.sleep(0.5)
+            self.narrator.say(f"{i+1}. {skill.name} (시전 가능 횟수: {skill.use_count}, 희귀도: {skill.rarity}, 레벨: {current_level}/{skill.max_level})")
+            self.narrator.wait(0.5)
             if getattr(skill, "desc", None):
-                print(f" - {skill.desc}")
-                time.sleep(0.5)
-            print("")
-        print(f"{len(choices)+1}. 이 힘을 거부한다.\n")
-
-        while True:
-            try:
-                choice = int(input("어떤 힘을 받아들이겠는가?: "))
-                if 1 <= choice <= len(choices):
-                    chosen_skill = choices[choice-1]
-                    self.add_or_level_up_skill(chosen_skill)
-                    break
-                elif choice == len(choices) + 1:
-                    print("힘을 거부했다.\n")
-                    break
-                else:
-                    print("어둠 속에서 길을 잃었는가? 다시 선택하라.")
-            except ValueError:
-                print("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
+                self.narrator.say(f" - {skill.desc}")
+                self.narrator.wait(0.5)
+            self.narrator.say("")
+        self.narrator.say(f"{len(choices)+1}. 이 힘을 거부한다.\n")
+
+        options = choices + [None]
+        chosen_skill = options[(yield Decision("skill", options))]
+        if chosen_skill is not None:
+            yield from self.add_or_level_up_skill(chosen_skill)
+        else:
+            self.narrator.say("힘을 거부했다.\n")
 
     def player_has_skill(self, skill_name):
         return any(s.name == skill_name for s in self.player.skills)
@@ -1185,44 +2177,37 @@ class Game:
             if skill.name == skill_to_add.name:
                 skill.level += 1
                 skill.reset_use_count()
-                print(f"{skill.name}이(가) 더욱 강해졌다. Lv.{skill.level}\n")
+                self.narrator.say(f"{skill.name}이(가) 더욱 강해졌다. Lv.{skill.level}\n")
                 return
         if len(self.player.skills) >= 4:
-            print("영혼의 그릇은 가득 찼다. 새로운 힘을 담으려면, 낡은 것을 비워야 할 것이다.")
+            self.narrator.say("영혼의 그릇은 가득 찼다. 새로운 힘을 담으려면, 낡은 것을 비워야 할 것이다.")
             for i, skill in enumerate(self.player.skills):
-                print(f"{i+1}. {skill.name} (Lv.{skill.level})")
-            print(f"{len(self.player.skills)+1}. 거부한다.")
-            
-            while True:
-                try:
-                    choice = int(input("어떤 힘을 버리고 새로운 힘을 받아들이겠는가? "))
-                    if 1 <= choice <= len(self.player.skills):
-                        forgotten_skill = self.player.skills.pop(choice - 1)
-                        print(f"힘 '{forgotten_skill.name}'은(는) 기억 속에서 희미해졌다.")
-                        new_skill = self.get_skill(skill_to_add.name)
-                        self.player.skills.append(new_skill)
-                        print(f"새로운 힘 '{new_skill.name}'이(가) 영혼에 각인되었다!\n")
-                        break
-                    elif choice == len(self.player.skills) + 1:
-                        print("새로운 힘을 거부하고, 익숙한 그림자에 머물렀다.\n")
-                        break
-                    else:
-                        print("어둠 속에서 길을 잃었는가? 다시 선택하라.")
-                except ValueError:
-                    print("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
+                self.narrator.say(f"{i+1}. {skill.name} (Lv.{skill.level})")
+            self.narrator.say(f"{len(self.player.skills)+1}. 거부한다.")
+
+            options = self.player.skills + [None]
+            choice = yield Decision("forget", options, skill_to_add)
+            if options[choice] is not None:
+                forgotten_skill = self.player.skills.pop(choice)
+                self.narrator.say(f"힘 '{forgotten_skill.name}'은(는) 기억 속에서 희미해졌다.")
+                new_skill = self.get_skill(skill_to_add.name)
+                self.player.skills.append(new_skill)
+                self.narrator.say(f"새로운 힘 '{new_skill.name}'이(가) 영혼에 각인되었다!\n")
+            else:
+                self.narrator.say("새로운 힘을 거부하고, 익숙한 그림자에 머물렀다.\n")
         else:
             new_skill = self.get_skill(skill_to_add.name)
             self.player.skills.append(new_skill)
-            print(f"새로운 힘 '{new_skill.name}'을(를) 얻었다.\n")
+            self.narrator.say(f"새로운 힘 '{new_skill.name}'을(를) 얻었다.\n")
 
     def shop(self):
-        print("\n[ 수상한 상점 ]")
-        time.sleep(1)
-        print("필요한 게 있나, 이방인...?\n")
-        time.sleep(1)
+        self.narrator.say("\n[ 수상한 상점 ]")
+        self.narrator.wait(1)
+        self.narrator.say("필요한 게 있나, 이방인...?\n")
+        self.narrator.wait(1)
         self.player.show_stats()
         self.player.show_inv()
-        time.sleep(1)
+        self.narrator.wait(1)
         self.shop_inventory = []
         self.available_items = []
         def get_available_items():
@@ -1231,10 +2216,10 @@ class Game:
                 item for item in self.all_equipment
                 if item.stage <= self.stage and item not in equipped
             ]
-            self.shop_inventory = random.sample(self.available_items, min(5, len(self.available_items)))
+            self.shop_inventory = self.shop_rng.sample(self.available_items, min(5, len(self.available_items)))
         get_available_items()
         while True:
-            print(f"\n[피 묻은 금화: {self.player.gold}G]\n")
+            self.narrator.say(f"\n[피 묻은 금화: {self.player.gold}G]\n")
             for i, item in enumerate(self.shop_inventory):
                 stats_display = []
                 if item.health != 0:
@@ -1250,52 +2235,50 @@ class Game:
                 
                 stats_str = ", ".join(stats_display)
                 
-                print(f"{i+1}. {item.name} ({item.part}) - {item.price}G ({stats_str})")
-                time.sleep(0.5)
-            print(f"{len(self.shop_inventory)+1}. 새로고침 (10G)\n")
-            time.sleep(0.5)
-            print(f"{len(self.shop_inventory)+2}. 떠난다\n")
-            time.sleep(0.5)
-
-
-            while True:
-                try:
-                    choice = int(input("선택의 시간이다. :"))
-                    if 1 <= choice <= len(self.shop_inventory) + 2:
-                        break
-                    else:
-                        print("어둠 속에서 길을 잃었는가? 다시 선택하라.")
-                except ValueError:
-                    print("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
-
-            if choice == len(self.shop_inventory) + 2:
-                print("상점 주인이 어둠 속으로 사라진다.\n")
+                self.narrator.say(f"{i+1}. {item.name} ({item.part}) - {item.price}G ({stats_str})")
+                self.narrator.wait(0.5)
+            self.narrator.say(f"{len(self.shop_inventory)+1}. 새로고침 (10G)\n")
+            self.narrator.wait(0.5)
+            self.narrator.say(f"{len(self.shop_inventory)+2}. 떠난다\n")
+            self.narrator.wait(0.5)
+
+            options = self.shop_inventory + [SHOP_REFRESH, SHOP_LEAVE]
+            choice = yield Decision("shop", options)
+
+            if options[choice] == SHOP_LEAVE:
+                self.narrator.say("상점 주인이 어둠 속으로 사라진다.\n")
                 break
-            if choice == len(self.shop_inventory) + 1:
+            if options[choice] == SHOP_REFRESH:
                 if self.player.gold >= 10:
                     self.player.gold -= 10
                     get_available_items()
                     self.shop_inventory = self.shop_inventory
                 else:
-                    print("금화가 부족하다.")
+                    self.narrator.say("금화가 부족하다.")
             else:
-                chosen_item = self.shop_inventory[choice-1]
+                chosen_item = self.shop_inventory[choice]
                 if self.player.gold >= chosen_item.price:
                     if chosen_item.health < 0 and self.player.max_health < abs(chosen_item.health):
-                        print("생명이 부족하여 장비를 받아들일 수 없다.")
+                        self.narrator.say("생명이 부족하여 장비를 받아들일 수 없다.")
                     else:
                         self.player.gold -= chosen_item.price
+                        if ItemBought in self.events.listening:
+                            self.events.emit(ItemBought(self.player, chosen_item, chosen_item.price))
                         self.player.equip(chosen_item)
-                        self.shop_inventory.pop(choice-1)
+                        self.shop_inventory.pop(choice)
                 else:
-                    print("금화가 부족하다.")
-            time.sleep(1)
+                    self.narrator.say("금화가 부족하다.")
+            self.narrator.wait(1)
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="i_was_bored")
+    parser.add_argument("--speed", type=float, default=1.0, help="연출 대기 배율 (0.5 면 두 배 빠르게, 0 이면 대기 없음)")
+    args = parser.parse_args()
     print(i_was_bored)
     if input() == "help":
         print(help_text)
         input()
-    game = Game()
+    game = Game(speed=args.speed)
     game.start()
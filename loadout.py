@@ -0,0 +1,218 @@
+# 상점 장비 조합 최적화
+# 부위(무기/투구/흉갑/각반/장신구)마다 하나씩, 가진 금화 안에서 점수가 가장 높은 조합을 찾는다.
+# 장비를 바꾸면 unequip 이 예전 장비 값의 70% 를 돌려주므로 실제 비용은 (가격 - 되판 값)이고,
+# 살 때는 되판 값을 받기 전 금화로 가격을 내야 하므로 사는 순서까지 정해서 가능한지 확인한다.
+# 같은 부위에서 모든 능력치가 같거나 낮으면서 비싼 장비는 처음부터 후보에서 뺀다.
+#
+#   python loadout.py --stage 5 --gold 300
+
+import argparse
+import functools
+import itertools
+import logging
+from types import SimpleNamespace
+
+import fight_odds
+import i_was_bored
+
+PARTS = i_was_bored.EQUIPMENT_PARTS
+STATS = ("health", "attack", "defense", "critical", "evasion")
+RESALE = 0.7
+MAX_REFRESH = 3
+
+log = logging.getLogger("i_was_bored.loadout")
+
+def resale(item):
+    return int(item.price * RESALE) if item else 0
+
+# a 가 b 보다 나을 게 하나도 없으면 True (완전히 같으면 tie 로 가른다)
+def dominated(a, b, tie=False):
+    if a is b or a.part != b.part or a.special != b.special:
+        return False
+    if any(getattr(a, stat) > getattr(b, stat) for stat in STATS) or a.price < b.price:
+        return False
+    return any(getattr(a, stat) < getattr(b, stat) for stat in STATS) or a.price > b.price or tie
+
+# 완전히 같은 장비끼리는 앞의 것만 남긴다
+def prune(items):
+    items = list(items)
+    return [item for i, item in enumerate(items)
+            if not any(dominated(item, other, j < i) for j, other in enumerate(items))]
+
+# 장마다 상점에 나올 수 있는 장비의 부위별 후보 (지배당한 장비 제외)
+@functools.lru_cache(maxsize=8)
+def stage_candidates(catalog):
+    table = {}
+    for stage in range(1, 11):
+        available = [item for item in catalog.all_equipment if item.stage <= stage]
+        table[stage] = {part: tuple(sorted(prune(i for i in available if i.part == part), key=lambda i: i.price))
+                        for part in PARTS}
+    return table
+
+# 장비를 바꾼 뒤의 능력치
+def loadout_stats(player, loadout):
+    stats = {"max_health": player.max_health, "attack": player.attack, "defense": player.defense,
+             "critical": player.critical, "evasion": player.evasion}
+    for part, item in loadout.items():
+        old = player.equipment[part]
+        for stat in STATS:
+            key = "max_health" if stat == "health" else stat
+            stats[key] += getattr(item, stat) - (getattr(old, stat) if old else 0)
+    return stats
+
+# 기본 점수: equipment_score 와 같은 가중치의 능력치 합
+def linear_score(stats, gold):
+    return (stats["attack"] * 3 + stats["defense"] * 1.5 + stats["max_health"] * 0.5
+            + stats["critical"] + stats["evasion"])
+
+# 되판 값이 가격보다 큰 교체부터(싼 것 먼저), 나머지는 되판 값이 큰 것부터 사면
+# 중간에 금화가 모자랄 일이 가장 적다
+def purchase_order(player, loadout):
+    gains = [(part, item) for part, item in loadout.items() if resale(player.equipment[part]) >= item.price]
+    costs = [(part, item) for part, item in loadout.items() if resale(player.equipment[part]) < item.price]
+    gains.sort(key=lambda pair: pair[1].price)
+    costs.sort(key=lambda pair: -resale(player.equipment[pair[0]]))
+    return gains + costs
+
+# 그 순서대로 살 수 있으면 남는 금화, 아니면 None
+def affordable(player, order, gold):
+    max_health = player.max_health
+    for part, item in order:
+        old = player.equipment[part]
+        if gold < item.price or (item.health < 0 and max_health < abs(item.health)):
+            return None
+        gold += resale(old) - item.price
+        max_health += item.health - (old.health if old else 0)
+    return gold
+
+# 능력치 합처럼 부위별 점수를 더하기만 하는 점수면 부위마다 (가격, 점수) 경계만 남기고
+# 남은 부위의 최대 이득으로 가지치기한다. 아니면 금화 안의 조합을 모두 평가한다.
+# pruned 이면 items 가 이미 서로 지배하지 않는 후보(stage_candidates)이므로 착용 중인 장비와만 비교한다.
+def best_loadout(player, items, gold, score=linear_score, additive=None, pruned=False):
+    if additive is None:
+        additive = score is linear_score
+    base = loadout_stats(player, {})
+    base_value = score(base, gold)
+    by_part = {part: [] for part in PARTS}
+    if pruned:
+        for item in items:
+            old = player.equipment[item.part]
+            if item is not old and not (old and dominated(item, old)):
+                by_part[item.part].append(item)
+    else:
+        for item in prune(list(items) + [e for e in player.equipment.values() if e]):
+            if item is not player.equipment[item.part]:
+                by_part[item.part].append(item)
+    gains = {}
+    for part, candidates in by_part.items():
+        candidates.sort(key=lambda item: item.price)
+        if additive:
+            frontier = []
+            for item in candidates:
+                gain = score(loadout_stats(player, {part: item}), gold) - base_value
+                if gain > 0 and (not frontier or gain > frontier[-1][1]):
+                    frontier.append((item, gain))
+            by_part[part] = [item for item, _ in frontier]
+            gains[part] = frontier[-1][1] if frontier else 0
+    parts = [part for part in PARTS if by_part[part]]
+    bound = [sum(gains.get(part, 0) for part in parts[i:]) for i in range(len(parts) + 1)]
+    best = [{}, gold, base_value]
+    loadout = {}
+
+    def search(i, net, gain):
+        if additive and base_value + gain + bound[i] <= best[2]:
+            return
+        if i == len(parts):
+            if not loadout:
+                return
+            left = affordable(player, purchase_order(player, loadout), gold)
+            if left is None:
+                return
+            value = score(loadout_stats(player, loadout), left)
+            if value > best[2]:
+                best[:] = [dict(loadout), left, value]
+            return
+        part = parts[i]
+        old = resale(player.equipment[part])
+        for item in by_part[part]:
+            cost = item.price - old
+            if net + cost > gold:
+                break
+            loadout[part] = item
+            search(i + 1, net + cost, gain + (score(loadout_stats(player, {part: item}), gold) - base_value
+                                              if additive else 0))
+            del loadout[part]
+        search(i + 1, net, gain)
+
+    search(0, 0, 0)
+    return tuple(best)
+
+# 다음 장 일반 몬스터들에 대한 평균 정확 승률 (fight_odds) 을 점수로 쓴다.
+# 상점은 장을 올린 뒤에 열리므로 game.stage 가 곧 다음 장이다 (10장을 넘긴 뒤에는 10장).
+# 조합마다 전투를 풀기 때문에 능력치 합보다 훨씬 느리다: LoadoutDecider(win_rate_score)
+# fight_odds 가 풀 수 없는 몬스터(상태이상을 거는 힘)는 빼고, 하나도 없으면 (지금 콘텐츠의 10장)
+# 경고를 남기고 능력치 합을 쓴다.
+def win_rate_score(game):
+    player = game.player
+    stage = min(game.stage, 10)
+    pool = [monster for monster in game.monster_pools.get((stage, False), ())
+            if fight_odds.unsupported_reason(monster) is None]
+    if not pool:
+        if stage not in _reported_fallbacks:
+            _reported_fallbacks.add(stage)
+            log.warning("%d장에는 fight_odds 로 풀 수 있는 일반 몬스터가 없어 능력치 합(linear_score)으로 점수를 매긴다", stage)
+        return linear_score
+
+    def score(stats, gold):
+        ratio = player.current_health / player.max_health
+        candidate = SimpleNamespace(name=player.name, current_health=stats["max_health"] * ratio,
+                                    _damage_taken_modifier=0, _damage_dealt_modifier=0, **stats)
+        return sum(fight_odds.odds(candidate, monster)["win"] for monster in pool) / max(len(pool), 1)
+    return score
+
+# 경고는 장마다 한 번만 남긴다 (상점마다 불리므로)
+_reported_fallbacks = set()
+
+# 상점에서 최적 조합을 사는 정책. scorer(game) 가 그 상점에서 쓸 점수 함수를 만든다.
+# 지금 진열로는 나아질 게 없는데 그 장의 후보로는 나아질 수 있으면 몇 번까지 새로고침한다.
+# 그 장의 후보 전체로는 금화 안의 조합이 너무 많아 승률 점수처럼 느린 점수로 모두 평가할 수 없으므로,
+# 능력치 합으로 가장 좋은 조합을 찾고 그 조합이 같은 점수로도 나아지는지 본다.
+class LoadoutDecider(i_was_bored.GreedyDecider):
+    def __init__(self, scorer=None):
+        self.scorer = scorer
+        self.refreshes = 0
+
+    def choose_shop(self, game, options, subject):
+        player = game.player
+        leave = len(options) - 1
+        score = self.scorer(game) if self.scorer else linear_score
+        loadout, _, _ = best_loadout(player, options[:-2], player.gold, score)
+        if loadout:
+            first_part, first_item = purchase_order(player, loadout)[0]
+            return options.index(first_item)
+        if self.refreshes < MAX_REFRESH and player.gold >= 10:
+            gold = player.gold - 10
+            plan, left, _ = best_loadout(player, itertools.chain(*stage_candidates(game.catalog)[min(game.stage, 10)].values()),
+                                         gold, pruned=True)
+            if plan and (score is linear_score
+                         or score(loadout_stats(player, plan), left) > score(loadout_stats(player, {}), gold)):
+                self.refreshes += 1
+                return leave - 1
+        self.refreshes = 0
+        return leave
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="장의 후보 장비로 만들 수 있는 최적 조합")
+    parser.add_argument("--stage", type=int, default=5)
+    parser.add_argument("--gold", type=int, default=300)
+    args = parser.parse_args()
+
+    game = i_was_bored.Game(headless=True, seed=0)
+    candidates = stage_candidates(game.catalog)[args.stage]
+    total = sum(1 for item in game.all_equipment if item.stage <= args.stage)
+    print(f"{args.stage}장 후보 {sum(map(len, candidates.values()))}개 (전체 {total}개)")
+    loadout, left, value = best_loadout(game.player, itertools.chain(*candidates.values()), args.gold, pruned=True)
+    for part in PARTS:
+        item = loadout.get(part)
+        print(f"{part}: {item.name + f' ({item.price}G)' if item else '-'}")
+    print(f"남는 금화 {left}G, 점수 {value:.1f}")
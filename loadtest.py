@@ -0,0 +1,113 @@
+# server.py 부하 시험
+# 대본대로 고르는 접속을 여러 개 동시에 열어 끝까지 한 판씩 하고,
+# 처리량과 질문마다의 응답 시간(답을 보낸 뒤 다음 질문이 올 때까지) p50/p99 를 보고한다.
+#
+#   python loadtest.py --local --sessions 2000 --concurrency 500
+#   python loadtest.py --port 7777 --sessions 1000
+
+import argparse
+import asyncio
+import random
+import re
+import time
+
+PROMPT = re.compile(rb"^\? \(1-(\d+)\) ")
+# 서버가 꽉 찼을 때 보내는 한 줄
+BUSY = "접속자가 너무 많다.".encode()
+
+class Totals:
+    def __init__(self):
+        self.latencies = []
+        self.finished = 0
+        self.rejected = 0
+        self.failed = 0
+        self.lines = 0
+
+# 대본: 상점(마지막이 떠나기)에서는 자주 떠나고, 나머지는 무작위로 고른다
+def scripted_choice(rng, line, count):
+    if "선택의 시간이다. :" in line and rng.random() < 0.5:
+        return count
+    return rng.randint(1, count)
+
+async def session(host, port, rng, totals, timeout):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        totals.failed += 1
+        return
+    sent = time.perf_counter()
+    received = 0
+    try:
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if not line:
+                break
+            if received == 0 and line.startswith(BUSY):
+                totals.rejected += 1
+                return
+            received += 1
+            totals.lines += 1
+            match = PROMPT.match(line)
+            if match:
+                now = time.perf_counter()
+                totals.latencies.append(now - sent)
+                choice = scripted_choice(rng, line.decode(errors="replace"), int(match.group(1)))
+                writer.write(f"{choice}\n".encode())
+                await writer.drain()
+                sent = time.perf_counter()
+        totals.finished += 1
+    except (OSError, asyncio.TimeoutError):
+        totals.failed += 1
+    finally:
+        writer.close()
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+async def run(host, port, sessions, concurrency, seed=0, timeout=60.0):
+    totals = Totals()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with gate:
+            await session(host, port, random.Random(seed + i), totals, timeout)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(sessions)))
+    return totals, time.perf_counter() - start
+
+def report(totals, elapsed):
+    prompts = len(totals.latencies)
+    print(f"세션 {totals.finished} 완료 / {totals.rejected} 거절 / {totals.failed} 실패, {elapsed:.2f}s")
+    print(f"질문 {prompts}개 ({prompts / elapsed:.0f}/s), 서술 {totals.lines}줄 ({totals.lines / elapsed:.0f}/s)")
+    print(f"응답 시간 p50 {percentile(totals.latencies, 0.5) * 1000:.2f}ms, "
+          f"p99 {percentile(totals.latencies, 0.99) * 1000:.2f}ms, 최대 {max(totals.latencies, default=0) * 1000:.2f}ms")
+
+async def main(args):
+    port = args.port
+    server = None
+    if args.local:
+        import server as game_server
+        server = game_server.GameServer(max_sessions=args.concurrency, speed=args.speed, seed=args.seed)
+        port = await server.start(args.host, 0)
+    totals, elapsed = await run(args.host, port, args.sessions, args.concurrency, args.seed, args.timeout)
+    report(totals, elapsed)
+    if server:
+        stats = server.stats()
+        print(f"서버: 완료 {stats['finished']}, 거절 {stats['rejected']}, 끊김 {stats['dropped']}, 시간초과 {stats['timed_out']}")
+        server.server.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="i_was_bored 서버 부하 시험")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--local", action="store_true", help="같은 프로세스에 서버를 띄워 시험한다")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--speed", type=float, default=0.0, help="--local 서버의 연출 대기 배율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
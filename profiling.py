@@ -0,0 +1,158 @@
+# 단계별 시간 측정과 핫패스 호출 수
+# Profiler.attach(game) 은 그 판의 진행 메서드(progress_stage, battle, player_turn, monster_turn,
+# battle_reward, skill_acquisition, shop)와 결정자를 감싸 호출 경로별 벽시계/CPU 시간을 재고,
+# 플레이어와 그 판의 몬스터가 take_damage, deal_damage, add_status_effect, _apply_stat_modifiers 를
+# 몇 번 불렀는지, status_effects 가 가장 길 때 몇 개였는지 센다.
+# 붙이지 않은 판은 메서드가 그대로이고 핫패스에는 profiler 가 None 인지 보는 비교 하나만 남는다.
+# 결정자가 고민하는 시간은 "decide" 단계로 따로 잡힌다. (async_game 처럼 여러 판이 번갈아 돌면
+# 벽시계 시간에는 다른 판의 시간도 섞인다)
+#
+#   python simulate.py -n 1000 --workers 1 --profile run.folded
+#   flamegraph.pl run.folded > run.svg
+
+import functools
+import inspect
+import time
+from collections import Counter
+
+PHASES = ("progress_stage", "battle", "player_turn", "monster_turn", "battle_reward", "skill_acquisition", "shop")
+COUNTERS = ("take_damage", "deal_damage", "add_status_effect", "_apply_stat_modifiers")
+
+class ProfiledDecider:
+    def __init__(self, profiler, inner):
+        self.profiler = profiler
+        self.inner = inner
+
+    def decide(self, game, kind, options, subject=None):
+        self.profiler.enter("decide")
+        try:
+            return self.inner.decide(game, kind, options, subject)
+        finally:
+            self.profiler.leave()
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+class Profiler:
+    def __init__(self):
+        # 호출 경로(단계 이름 튜플)별 합계
+        self.calls = Counter()
+        self.wall = Counter()
+        self.cpu = Counter()
+        self.self_wall = Counter()
+        self.self_cpu = Counter()
+        self.counts = Counter()
+        self.peaks = Counter()
+        self.stack = []
+
+    def count(self, name):
+        self.counts[name] += 1
+
+    def peak(self, name, value):
+        if value > self.peaks[name]:
+            self.peaks[name] = value
+
+    def enter(self, name):
+        path = (self.stack[-1][0] if self.stack else ()) + (name,)
+        # [경로, 시작 벽시계, 시작 CPU, 자식 벽시계, 자식 CPU]
+        self.stack.append([path, time.perf_counter(), time.process_time(), 0.0, 0.0])
+
+    def leave(self):
+        path, wall0, cpu0, child_wall, child_cpu = self.stack.pop()
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+        self.calls[path] += 1
+        self.wall[path] += wall
+        self.cpu[path] += cpu
+        self.self_wall[path] += wall - child_wall
+        self.self_cpu[path] += cpu - child_cpu
+        if self.stack:
+            self.stack[-1][3] += wall
+            self.stack[-1][4] += cpu
+
+    # 진행 메서드는 제너레이터를 돌려주므로(하위 클래스가 super() 의 것을 그대로 돌려줄 때도) 그 흐름이 끝날 때까지 잰다
+    def phase(self, name, method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            self.enter(name)
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                self.leave()
+                raise
+            if inspect.isgenerator(result):
+                self.stack.pop()
+                return self.flow(name, result)
+            self.leave()
+            return result
+        return timed
+
+    def flow(self, name, steps):
+        self.enter(name)
+        try:
+            return (yield from steps)
+        finally:
+            self.leave()
+
+    # 인스턴스 속성으로 덮어쓰므로 클래스와 다른 판에는 영향이 없다
+    def attach(self, game):
+        for name in PHASES:
+            setattr(game, name, self.phase(name, getattr(game, name)))
+        game.decider = ProfiledDecider(self, game.decider)
+        game.profiler = game.player.profiler = self
+        return game
+
+    def detach(self, game):
+        for name in PHASES:
+            vars(game).pop(name, None)
+        if isinstance(game.decider, ProfiledDecider):
+            game.decider = game.decider.inner
+        vars(game).pop("profiler", None)
+        vars(game.player).pop("profiler", None)
+        return game
+
+    # 다른 worker 의 결과를 합친다 (simulate 의 집계처럼 += 로 쓴다)
+    def __iadd__(self, other):
+        for field in ("calls", "wall", "cpu", "self_wall", "self_cpu", "counts"):
+            getattr(self, field).update(getattr(other, field))
+        for name, value in other.peaks.items():
+            self.peak(name, value)
+        return self
+
+    def __getstate__(self):
+        state = dict(vars(self))
+        state["stack"] = []
+        return state
+
+    # 단계 이름별 합계 (같은 단계가 여러 경로에서 불려도 한 줄로 모은다)
+    def by_phase(self):
+        table = {}
+        for path, calls in self.calls.items():
+            row = table.setdefault(path[-1], Counter())
+            row["calls"] += calls
+            row["self_wall"] += self.self_wall[path]
+            row["self_cpu"] += self.self_cpu[path]
+            row["wall"] += self.wall[path]
+            row["cpu"] += self.cpu[path]
+        return table
+
+    def summary(self):
+        lines = ["단계                 호출      벽시계(s)    CPU(s)   자체 벽시계(s)   호출당(us)"]
+        for name, row in sorted(self.by_phase().items(), key=lambda item: -item[1]["wall"]):
+            lines.append(f"{name:<18} {row['calls']:>8} {row['wall']:>12.3f} {row['cpu']:>9.3f}"
+                         f" {row['self_wall']:>15.3f} {row['wall'] / row['calls'] * 1e6:>12.1f}")
+        lines.append("")
+        lines.append("핫패스                    호출")
+        for name in COUNTERS:
+            lines.append(f"{name:<22} {self.counts[name]:>9}")
+        lines.append(f"{'최대 status_effects':<22} {self.peaks['status_effects']:>9}")
+        return "\n".join(lines)
+
+    # flamegraph.pl / speedscope 가 읽는 접힌 스택 형식 (값은 자체 벽시계 마이크로초)
+    def folded(self):
+        return "".join(f"{';'.join(path)} {round(self.self_wall[path] * 1e6)}\n"
+                       for path in sorted(self.calls) if self.self_wall[path] > 0)
+
+    def write_folded(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.folded())
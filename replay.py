@@ -0,0 +1,162 @@
+# 재현 기록과 재실행
+# 한 판의 seed, 모든 선택(kind, 인덱스), 전투 난수(회피/치명 판정, 몬스터 힘 사용 판정과 선택)를
+# 작은 기록으로 남기고, 그 기록만으로 같은 판을 headless 로 다시 돌려 최종 상태를 검증한다.
+# 전투 난수 흐름은 회피, 치명, 몬스터 힘 사용 판정(random)과 몬스터 힘 선택(choice)에만 쓰인다.
+#
+#   python replay.py record --seed 1234 --policy greedy -o run.log
+#   python replay.py run run.log
+
+import argparse
+import hashlib
+import json
+import random
+import time
+import zlib
+
+import i_was_bored
+
+LOG_MAGIC = b"IWBR"
+LOG_VERSION = 1
+
+class ReplayMismatch(Exception):
+    pass
+
+# --- 기록 ---
+class RecordingDecider(i_was_bored.Decider):
+    def __init__(self, inner):
+        self.inner = inner
+        self.decisions = []
+
+    def decide(self, game, kind, options, subject=None):
+        choice = self.inner.decide(game, kind, options, subject)
+        self.decisions.append([kind, choice])
+        return choice
+
+class RecordingRandom(random.Random):
+    def __init__(self, outcomes):
+        super().__init__()
+        self.outcomes = outcomes
+
+    def random(self):
+        value = super().random()
+        self.outcomes.append(value)
+        return value
+
+    def choice(self, seq):
+        index = self._randbelow(len(seq))
+        self.outcomes.append(index)
+        return seq[index]
+
+# --- 재실행 ---
+class ReplayDecider(i_was_bored.Decider):
+    def __init__(self, decisions):
+        self.decisions = decisions
+        self.position = 0
+
+    def decide(self, game, kind, options, subject=None):
+        if self.position >= len(self.decisions):
+            raise ReplayMismatch(f"{self.position}번째 선택({kind})이 기록에 없다")
+        recorded_kind, choice = self.decisions[self.position]
+        if recorded_kind != kind or not 0 <= choice < len(options):
+            raise ReplayMismatch(f"{self.position}번째 선택이 다르다: 기록 {recorded_kind}/{choice}, 실행 {kind}/{len(options)}개")
+        self.position += 1
+        return choice
+
+class CheckingRandom(random.Random):
+    def __init__(self, outcomes):
+        super().__init__()
+        self.outcomes = outcomes
+        self.position = 0
+
+    def _check(self, value):
+        if self.position >= len(self.outcomes) or self.outcomes[self.position] != value:
+            expected = self.outcomes[self.position] if self.position < len(self.outcomes) else None
+            raise ReplayMismatch(f"{self.position}번째 전투 난수가 다르다: 기록 {expected}, 실행 {value}")
+        self.position += 1
+
+    def random(self):
+        value = super().random()
+        self._check(value)
+        return value
+
+    def choice(self, seq):
+        index = self._randbelow(len(seq))
+        self._check(index)
+        return seq[index]
+
+def install_combat_rng(game, rng):
+    rng.setstate(game.combat_rng.getstate())
+    game.combat_rng = rng
+    game.player.rng = rng
+
+def final_state(game):
+    return {
+        "digest": hashlib.sha256(game.save_state()).hexdigest(),
+        "stage": game.stage,
+        "alive": game.player.is_alive(),
+        "health": game.player.current_health,
+        "gold": game.player.gold,
+    }
+
+def record(seed, decider):
+    game = i_was_bored.Game(headless=True, decider=RecordingDecider(decider), seed=seed)
+    outcomes = []
+    install_combat_rng(game, RecordingRandom(outcomes))
+    game.start()
+    return {
+        "seed": seed,
+        "decisions": game.decider.decisions,
+        "combat": outcomes,
+        "final": final_state(game),
+    }
+
+# 기록대로 다시 돌리고 어긋나면 ReplayMismatch 를 던진다
+def replay(log):
+    game = i_was_bored.Game(headless=True, decider=ReplayDecider(log["decisions"]), seed=log["seed"])
+    checker = CheckingRandom(log["combat"])
+    install_combat_rng(game, checker)
+    game.start()
+    if game.decider.position != len(log["decisions"]) or checker.position != len(log["combat"]):
+        raise ReplayMismatch("기록이 끝나기 전에 판이 끝났다")
+    final = final_state(game)
+    if final != log["final"]:
+        raise ReplayMismatch(f"최종 상태가 다르다: 기록 {log['final']}, 실행 {final}")
+    return game
+
+def dumps_log(log):
+    data = json.dumps(log, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return LOG_MAGIC + bytes([LOG_VERSION]) + zlib.compress(data, 9)
+
+def loads_log(blob):
+    if blob[:len(LOG_MAGIC)] != LOG_MAGIC:
+        raise ValueError("i_was_bored 재현 기록이 아니다")
+    version = blob[len(LOG_MAGIC)]
+    if version != LOG_VERSION:
+        raise ValueError(f"지원하지 않는 재현 기록 버전: {version}")
+    return json.loads(zlib.decompress(blob[len(LOG_MAGIC) + 1:]).decode("utf-8"))
+
+if __name__ == "__main__":
+    from simulate import POLICIES
+
+    parser = argparse.ArgumentParser(description="i_was_bored 재현 기록")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="한 판을 돌려 기록을 남긴다 (simulate.py 의 seed + 판 번호)")
+    record_parser.add_argument("--seed", type=int, required=True)
+    record_parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    record_parser.add_argument("-o", "--output", required=True)
+    run_parser = commands.add_parser("run", help="기록을 다시 돌려 검증한다")
+    run_parser.add_argument("log")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        log = record(args.seed, POLICIES[args.policy](args.seed))
+        with open(args.output, "wb") as f:
+            f.write(dumps_log(log))
+        print(f"선택 {len(log['decisions'])}개, 전투 난수 {len(log['combat'])}개 -> {args.output}")
+    else:
+        with open(args.log, "rb") as f:
+            log = loads_log(f.read())
+        start = time.perf_counter()
+        game = replay(log)
+        elapsed = time.perf_counter() - start
+        print(f"일치: {game.stage}장, 생명 {game.player.current_health}, 금화 {game.player.gold} ({elapsed * 1000:.1f}ms)")
@@ -0,0 +1,179 @@
+# 탐색형 전투 AI
+# player_turn 의 행동을 MCTS(UCT)로 고른다. 회피, 치명, 몬스터 힘 사용 같은 우연은
+# 전투 상태 사본 위에서 탐색용 난수로 뽑고, 뽑힌 결과 국면을 combat_key 로 찾아
+# 전치표(transposition table)의 같은 노드로 모은다. 전치표는 크기 제한이 있고 오래 안 쓴 국면부터 버린다.
+# 행동 외의 선택(강화, 힘, 상점)은 GreedyDecider 를 따른다.
+#
+#   python simulate.py -n 200 --policy search
+#   python search_ai.py -n 10 --budget 0.05
+
+import argparse
+import math
+import random
+import time
+from collections import OrderedDict
+
+import i_was_bored
+
+SILENT = i_was_bored.Narrator(sink=None, pacing=False)
+# 탐색 중의 가상 전투는 판의 구독자에게 알리지 않는다
+NO_EVENTS = i_was_bored.NO_EVENTS
+
+class Node:
+    __slots__ = ("actions", "visits", "counts", "totals")
+
+    def __init__(self, actions):
+        self.actions = actions
+        self.visits = 0
+        self.counts = [0] * len(actions)
+        self.totals = [0.0] * len(actions)
+
+    def select(self, exploration):
+        for i, count in enumerate(self.counts):
+            if count == 0:
+                return i
+        log_visits = math.log(self.visits)
+        return max(range(len(self.actions)),
+                   key=lambda i: self.totals[i] / self.counts[i] + exploration * math.sqrt(log_visits / self.counts[i]))
+
+def combat_key(player, monster):
+    return player.combat_key(), monster.combat_key()
+
+def action_options(player):
+    return [None] + player.skills
+
+# Game.battle 의 한 턴: 플레이어 행동, 몬스터 행동(Game.monster_turn 과 같은 규칙), 턴 끝 처리
+def play_round(player, monster, action, rng):
+    if player.apply_turn_effects():
+        skill = action_options(player)[action]
+        if skill is None:
+            player.deal_damage(monster, player.attack)
+        else:
+            skill.execute(player, monster)
+            if skill.use_count <= 0:
+                player.skills.remove(skill)
+    player.after_turn_effects()
+    if not monster.is_alive():
+        return
+    if monster.apply_turn_effects():
+        if monster.skills and rng.random() < 0.3 and not monster.has_status("침묵"):
+            rng.choice(monster.skills).execute(monster, player)
+        else:
+            monster.deal_damage(player, monster.attack)
+    if player.is_alive():
+        monster.after_turn_effects()
+
+# 이긴 판은 남은 생명만큼 더 좋고, 끝나지 않은 판은 생명 비율 차이로 어림한다
+def evaluate(player, monster):
+    if not player.is_alive():
+        return 0.0
+    player_ratio = player.current_health / player.max_health
+    if not monster.is_alive():
+        return 0.5 + 0.5 * player_ratio
+    return 0.25 + 0.25 * (player_ratio - monster.current_health / monster.max_health)
+
+class SearchDecider(i_was_bored.GreedyDecider):
+    def __init__(self, budget=0.05, iterations=None, seed=None, depth=8, rollout=30,
+                 exploration=0.7, table_size=200_000):
+        self.budget = budget
+        self.iterations = iterations
+        self.rng = random.Random(seed)
+        self.depth = depth
+        self.rollout = rollout
+        self.exploration = exploration
+        self.table_size = table_size
+        self.table = OrderedDict()
+        self.monster = None
+        self.hits = 0
+        self.lookups = 0
+
+    def choose_action(self, game, options, monster):
+        usable = i_was_bored.usable_actions(game.player, options)
+        # 턴 효과로 이미 쓰러졌어도 player_turn 은 불린다
+        if len(usable) == 1 or not game.player.is_alive():
+            return usable[0]
+        # 전투가 바뀌면 기본 능력치가 달라지므로 전치표를 비운다
+        if monster is not self.monster:
+            self.table.clear()
+            self.monster = monster
+        player, monster = self._clone(game.player), self._clone(monster)
+        deadline = time.perf_counter() + self.budget if self.budget else None
+        done = 0
+        while True:
+            self._iterate(player, monster)
+            done += 1
+            if self.iterations is not None and done >= self.iterations:
+                break
+            if deadline is not None and done % 8 == 0 and time.perf_counter() >= deadline:
+                break
+        root = self.table[combat_key(player, monster)]
+        best = max(range(len(root.actions)), key=lambda i: (root.counts[i], root.totals[i]))
+        return root.actions[best]
+
+    def _clone(self, character):
+        character = character.combat_clone()
+        character.narrator = SILENT
+        character.events = NO_EVENTS
+        character.rng = self.rng
+        return character
+
+    def _node(self, key, player):
+        self.lookups += 1
+        node = self.table.get(key)
+        if node is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+            return node, False
+        node = self.table[key] = Node(i_was_bored.usable_actions(player, action_options(player)))
+        if len(self.table) > self.table_size:
+            self.table.popitem(last=False)
+        return node, True
+
+    # 선택 -> 확장 -> 기본 공격 굴리기 -> 역전파
+    def _iterate(self, root_player, root_monster):
+        player, monster = root_player.combat_clone(), root_monster.combat_clone()
+        path = []
+        for _ in range(self.depth):
+            if not (player.is_alive() and monster.is_alive()):
+                break
+            node, created = self._node(combat_key(player, monster), player)
+            i = node.select(self.exploration)
+            path.append((node, i))
+            play_round(player, monster, node.actions[i], self.rng)
+            if created:
+                break
+        for _ in range(self.rollout):
+            if not (player.is_alive() and monster.is_alive()):
+                break
+            play_round(player, monster, 0, self.rng)
+        value = evaluate(player, monster)
+        for node, i in path:
+            node.visits += 1
+            node.counts[i] += 1
+            node.totals[i] += value
+
+# 같은 seed 들로 greedy 와 탐색 AI 가 각각 어디까지 가는지
+def compare(runs, budget, seed=0):
+    reached = {}
+    for name, make in (("greedy", lambda s: i_was_bored.GreedyDecider()),
+                       ("search", lambda s: SearchDecider(budget=budget, seed=s))):
+        stages = []
+        for run_seed in range(seed, seed + runs):
+            game = i_was_bored.Game(headless=True, decider=make(run_seed), seed=run_seed)
+            stages.append(11 if game.start() else game.stage)
+        reached[name] = stages
+    return reached
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="탐색형 전투 AI 와 greedy 비교")
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=0.05, help="한 수당 탐색 시간(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reached = compare(args.runs, args.budget, args.seed)
+    print(f"{args.runs}판씩, {time.perf_counter() - start:.1f}s")
+    for name, stages in reached.items():
+        cleared = sum(stage > 10 for stage in stages)
+        print(f"{name:<8} 평균 도달 {sum(min(stage, 10) for stage in stages) / len(stages):.2f}장, 클리어 {cleared}판")
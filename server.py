@@ -0,0 +1,198 @@
+# 줄 단위 TCP 게임 서버
+# 접속마다 Game 하나를 async_game 으로 돌린다. 서술은 한 줄씩 보내고, 선택을 물을 때는
+# "? (1-N) 안내문" 줄을 보낸 뒤 숫자 한 줄을 기다린다. (nc/telnet 으로 그대로 할 수 있다)
+# 동시 접속 수 제한, 입력 대기 제한 시간, 세션별 메모리 집계(게임 객체 + 보낼 버퍼)를 둔다.
+#
+#   python server.py --port 7777
+#   nc localhost 7777
+
+import argparse
+import asyncio
+import itertools
+import logging
+import sys
+import time
+import types
+
+import async_game
+import i_was_bored
+
+log = logging.getLogger("i_was_bored.server")
+
+# 모든 세션이 함께 쓰는 카탈로그 객체는 세션 메모리에 넣지 않는다
+def shared_ids(catalog):
+    ids = {id(catalog)}
+    ids.update(id(table) for table in vars(catalog).values())
+    for item in itertools.chain(catalog.all_skills, catalog.all_equipment, catalog.all_monsters):
+        ids.add(id(item))
+        ids.update(id(skill) for skill in getattr(item, "skills", ()))
+    ids.update(id(effect) for effect in catalog.effects.values())
+    return ids
+
+SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+              i_was_bored.EffectDefinition, i_was_bored.Decider)
+
+# 객체가 혼자 붙잡고 있는 바이트 수 (sys.getsizeof 합, 공유 객체 제외)
+def deep_size(root, skip):
+    seen = set(skip)
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SKIP_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+class Session:
+    def __init__(self, number, game, writer):
+        self.number = number
+        self.game = game
+        self.writer = writer
+        self.started = time.monotonic()
+        self.decisions = 0
+        self.memory = 0
+
+class StreamDecider(async_game.AsyncDecider):
+    def __init__(self, server, session, reader):
+        self.server = server
+        self.session = session
+        self.reader = reader
+
+    async def decide(self, game, kind, options, subject=None):
+        writer = self.session.writer
+        prompt = i_was_bored.HumanDecider.prompts[kind].format(n=len(options))
+        while True:
+            writer.write(f"? (1-{len(options)}) {prompt}\n".encode())
+            await asyncio.wait_for(writer.drain(), self.server.idle_timeout)
+            line = await asyncio.wait_for(self.reader.readline(), self.server.idle_timeout)
+            if not line:
+                raise ConnectionResetError("접속이 끊겼다")
+            try:
+                choice = int(line.strip())
+            except ValueError:
+                game.narrator.say("알 수 없는 속삭임이다. 명확한 답을 내놓아라.")
+            else:
+                if 1 <= choice <= len(options):
+                    self.session.decisions += 1
+                    if self.session.decisions % self.server.account_every == 0:
+                        self.server.measure(self.session)
+                    return choice - 1
+                game.narrator.say("어둠 속에서 길을 잃었는가? 다시 선택하라.")
+            await game.narrator.flush()
+
+class GameServer:
+    def __init__(self, max_sessions=500, idle_timeout=300.0, speed=1.0, max_line=256,
+                 account_every=20, seed=None, catalog=None):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.speed = speed
+        self.max_line = max_line
+        self.account_every = account_every
+        self.seed = seed
+        self.catalog = catalog or i_was_bored.Catalog.shared()
+        self.shared = shared_ids(self.catalog)
+        self.sessions = {}
+        self.numbers = itertools.count(1)
+        self.counts = {"accepted": 0, "rejected": 0, "finished": 0, "timed_out": 0, "dropped": 0}
+        self.server = None
+
+    # 게임 객체(공유 카탈로그 제외)를 다시 잰다. 한 번 다 훑으므로 시작할 때와 결정 account_every 번마다만 부른다.
+    def measure(self, session):
+        session.memory = deep_size(session.game, self.shared)
+
+    # 세션 메모리: 마지막으로 잰 게임 객체 + 소켓 쓰기 버퍼
+    def account(self, session):
+        return session.memory + session.writer.transport.get_write_buffer_size()
+
+    def stats(self):
+        memory = [self.account(session) for session in self.sessions.values()]
+        return dict(self.counts, active=len(self.sessions), memory=sum(memory),
+                    memory_per_session=sum(memory) / len(memory) if memory else 0)
+
+    async def handle(self, reader, writer):
+        if len(self.sessions) >= self.max_sessions:
+            self.counts["rejected"] += 1
+            try:
+                writer.write("접속자가 너무 많다. 나중에 다시 오라.\n".encode())
+                await asyncio.wait_for(writer.drain(), self.idle_timeout)
+            except (ConnectionError, asyncio.TimeoutError):
+                pass
+            finally:
+                writer.close()
+            return
+        number = next(self.numbers)
+        self.counts["accepted"] += 1
+
+        def send(text):
+            writer.write((text + "\n").encode())
+
+        seed = None if self.seed is None else self.seed + number
+        game, _ = async_game.new_game(sink=send, speed=self.speed, seed=seed, catalog=self.catalog)
+        session = self.sessions[number] = Session(number, game, writer)
+        self.measure(session)
+        try:
+            await async_game.play(game, StreamDecider(self, session, reader))
+            await asyncio.wait_for(writer.drain(), self.idle_timeout)
+            self.counts["finished"] += 1
+        except asyncio.TimeoutError:
+            self.counts["timed_out"] += 1
+            try:
+                writer.write("너무 오래 머뭇거렸다. 어둠이 너를 삼킨다.\n".encode())
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            self.counts["dropped"] += 1
+        finally:
+            del self.sessions[number]
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=7777):
+        self.server = await asyncio.start_server(self.handle, host, port, limit=self.max_line,
+                                                 backlog=min(self.max_sessions, 4096))
+        return self.server.sockets[0].getsockname()[1]
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.stats()
+            log.info("접속 %(active)d, 완료 %(finished)d, 시간초과 %(timed_out)d, 끊김 %(dropped)d, 거절 %(rejected)d, "
+                     "메모리 %(memory)d B (세션당 %(memory_per_session).0f B)", stats)
+
+async def serve(args):
+    server = GameServer(args.max_sessions, args.idle_timeout, args.speed, seed=args.seed)
+    port = await server.start(args.host, args.port)
+    log.info("%s:%d 에서 대기 중 (최대 %d 명)", args.host, port, args.max_sessions)
+    if args.stats_interval:
+        asyncio.create_task(server.report(args.stats_interval))
+    async with server.server:
+        await server.server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="i_was_bored TCP 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--max-sessions", type=int, default=500)
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="입력을 기다리는 최대 초")
+    parser.add_argument("--speed", type=float, default=1.0, help="연출 대기 배율 (0 이면 대기 없음)")
+    parser.add_argument("--seed", type=int, default=None, help="주면 세션 n 은 seed + n 으로 시작한다")
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,207 @@
+# 몬테카를로 밸런스 시뮬레이터
+# i_was_bored.Game 을 headless 로 N번 돌려서 스테이지별 승률, 사망 분포, 골드 곡선,
+# 많이 고른 힘과 장비를 집계한다. 각 판은 seed + 판 번호로 시드를 고정하고,
+# 집계는 합산이라 worker 수와 관계없이 같은 seed 면 결과가 같다.
+#
+#   python simulate.py -n 100000 --policy greedy --seed 0
+
+import argparse
+import functools
+import gc
+import json
+import multiprocessing.util
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import i_was_bored
+import loadout
+import profiling
+import search_ai
+import telemetry
+
+POLICIES = {
+    "random": lambda seed: i_was_bored.RandomDecider(seed),
+    "greedy": lambda seed: i_was_bored.GreedyDecider(),
+    "loadout": lambda seed: loadout.LoadoutDecider(),
+    # 시간 대신 반복 횟수로 끊어야 같은 seed 에서 결과가 같다
+    "search": lambda seed: search_ai.SearchDecider(budget=None, iterations=200, seed=seed),
+}
+
+# content 폴더별 카탈로그 (None 이면 기본 콘텐츠)
+@functools.lru_cache(maxsize=None)
+def catalog_for(content):
+    return i_was_bored.load_catalog(content) if content else i_was_bored.Catalog.shared()
+
+# 진행 기록용 Game
+class SimGame(i_was_bored.Game):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gold_at_stage = {}
+        self.picked_skills = []
+        self.bought_equipment = []
+
+    def progress_stage(self):
+        self.gold_at_stage[self.stage] = self.player.gold
+        return super().progress_stage()
+
+    def add_or_level_up_skill(self, skill_to_add):
+        self.picked_skills.append(skill_to_add.name)
+        return super().add_or_level_up_skill(skill_to_add)
+
+    def shop(self):
+        before = {id(item) for item in self.player.equipment.values() if item}
+        yield from super().shop()
+        self.bought_equipment.extend(item.name for item in self.player.equipment.values()
+                                     if item and id(item) not in before)
+
+# profile 이면 단계별 시간과 핫패스 호출 수(profiling.Profiler)도 모은다
+def empty_result(profile=False):
+    result = {
+        "runs": 0,
+        "wins": 0,
+        "reached": Counter(),
+        "cleared": Counter(),
+        "deaths": Counter(),
+        "gold_sum": Counter(),
+        "skills": Counter(),
+        "equipment": Counter(),
+    }
+    if profile:
+        result["profile"] = profiling.Profiler()
+    return result
+
+def merge(total, part):
+    for key, value in part.items():
+        total[key] += value
+    return total
+
+# recorder 를 주면 그 판의 전투마다 telemetry 에 한 행씩 쓴다
+def play_one(seed, policy, content=None, profile=False, recorder=None):
+    game = SimGame(headless=True, decider=POLICIES[policy](seed), seed=seed, catalog=catalog_for(content))
+    result = empty_result(profile)
+    if profile:
+        result["profile"].attach(game)
+    if recorder:
+        telemetry.FightRecorder(recorder, game)
+    won = game.start()
+    final_stage = min(game.stage, 10)
+    result["runs"] = 1
+    result["wins"] = int(won)
+    for stage in range(1, final_stage + 1):
+        result["reached"][stage] += 1
+    for stage in range(1, game.stage):
+        result["cleared"][stage] += 1
+    if not won:
+        result["deaths"][game.stage] += 1
+    result["gold_sum"].update(game.gold_at_stage)
+    result["skills"].update(game.picked_skills)
+    result["equipment"].update(game.bought_equipment)
+    return result
+
+# 프로세스마다 실행 하나에 기록기 하나: 판 묶음이 바뀌어도 같은 조각을 이어서 채운다.
+# pool worker 는 끝날 때 남은 행을 내보내고, 한 프로세스에서 돌면 run 이 닫는다.
+_recorders = {}
+
+def recorder_for(telemetry_dir, run_id, content):
+    key = (telemetry_dir, run_id)
+    if key not in _recorders:
+        recorder = telemetry.fight_writer(telemetry_dir, f"{run_id}-{os.getpid()}", catalog_for(content), run=run_id)
+        _recorders[key] = recorder, multiprocessing.util.Finalize(recorder, recorder.close, exitpriority=10)
+    return _recorders[key][0]
+
+def close_recorder(telemetry_dir, run_id):
+    recorder = _recorders.pop((telemetry_dir, run_id), None)
+    if recorder:
+        recorder[1]()
+
+def run_chunk(args):
+    start, stop, seed, policy, content, profile, telemetry_dir, run_id = args
+    total = empty_result(profile)
+    recorder = recorder_for(telemetry_dir, run_id, content) if telemetry_dir else None
+    for i in range(start, stop):
+        merge(total, play_one(seed + i, policy, content, profile, recorder))
+    return total
+
+def run(runs, seed=0, policy="greedy", workers=None, chunk_size=250, content=None, profile=False,
+        telemetry_dir=None):
+    workers = workers or os.cpu_count() or 1
+    run_id = telemetry.new_run_id() if telemetry_dir else None
+    chunks = [(start, min(start + chunk_size, runs), seed, policy, content, profile, telemetry_dir, run_id)
+              for start in range(0, runs, chunk_size)]
+    total = empty_result(profile)
+    if workers == 1:
+        for chunk in chunks:
+            merge(total, run_chunk(chunk))
+        close_recorder(telemetry_dir, run_id)
+        return total
+    # 카탈로그를 먼저 만들고 GC 대상에서 빼 두면 fork 된 worker 가 쓰기 없이 공유한다
+    # (worker 가 끝나면 되돌린다: 여러 번 부르는 쪽의 객체가 영구 세대에 쌓이지 않게)
+    catalog_for(content)
+    gc.freeze()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(run_chunk, chunks):
+                merge(total, part)
+    finally:
+        gc.unfreeze()
+    return total
+
+def summarize(result, top=10):
+    runs = result["runs"]
+    stages = {}
+    for stage in range(1, 11):
+        reached = result["reached"][stage]
+        cleared = result["cleared"][stage]
+        stages[stage] = {
+            "reached": reached,
+            "cleared": cleared,
+            "clear_rate": cleared / reached if reached else 0.0,
+            "cumulative_clear_rate": cleared / runs if runs else 0.0,
+            "deaths": result["deaths"][stage],
+            "avg_gold": result["gold_sum"][stage] / reached if reached else 0.0,
+        }
+    return {
+        "runs": runs,
+        "win_rate": result["wins"] / runs if runs else 0.0,
+        "stages": stages,
+        "top_skills": result["skills"].most_common(top),
+        "top_equipment": result["equipment"].most_common(top),
+    }
+
+def print_summary(summary):
+    print(f"{summary['runs']}판, 최종 승률 {summary['win_rate']:.2%}\n")
+    print("장   도달    돌파   돌파율  누적돌파   사망   평균골드")
+    for stage, row in summary["stages"].items():
+        print(f"{stage:>2} {row['reached']:>7} {row['cleared']:>7} {row['clear_rate']:>7.1%}"
+              f" {row['cumulative_clear_rate']:>8.1%} {row['deaths']:>6} {row['avg_gold']:>9.1f}")
+    print("\n[ 많이 고른 힘 ]")
+    for name, count in summary["top_skills"]:
+        print(f"{name}: {count}")
+    print("\n[ 많이 산 장비 ]")
+    for name, count in summary["top_equipment"]:
+        print(f"{name}: {count}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="i_was_bored 밸런스 시뮬레이터")
+    parser.add_argument("-n", "--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--content", help="기본 콘텐츠 대신 쓸 콘텐츠 폴더")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    parser.add_argument("--profile", metavar="PATH", help="단계별 시간을 재고 접힌 스택(flame graph 용)을 PATH 에 쓴다")
+    parser.add_argument("--telemetry", metavar="DIR", help="전투마다 한 행씩 DIR 에 열 단위로 기록한다 (telemetry.py)")
+    args = parser.parse_args()
+    result = run(args.runs, args.seed, args.policy, args.workers, args.chunk_size, args.content, bool(args.profile),
+                 args.telemetry)
+    if args.profile:
+        result["profile"].write_folded(args.profile)
+        print(result["profile"].summary() + "\n", file=sys.stderr)
+    summary = summarize(result)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print_summary(summary)
@@ -0,0 +1,203 @@
+# 전투 기록 열 저장소
+# 판의 전투마다 (판 seed, 장, 몬스터, 보스 여부, 승패, 턴 수, 받은/준 피해, 쓴 힘 수, 남은 생명) 한 행을
+# 열(column)마다 array 에 모으다가 chunk_rows 행이 차면 열마다 .npy 파일 하나로 내보낸다.
+# 쓰는 쪽은 numpy 없이 돌고, 메모리는 한 조각 분량(열 크기 합 x chunk_rows)을 넘지 않는다.
+# worker 마다 다른 part 이름으로 같은 폴더에 쓰고, part 마다 매니페스트(part.json)를 조각을 낼 때마다 갱신한다.
+# 매니페스트에는 실행(run) 이름을 적는다. 읽는 쪽은 기본으로 가장 최근 실행만 읽으므로
+# 같은 폴더에 예전 실행의 part 가 남아 있어도 섞이지 않는다.
+# 읽는 쪽은 조각을 numpy 로 메모리 매핑해서 복사 없이 훑는다. (numpy 필요)
+#
+#   python simulate.py -n 100000 --telemetry fights/
+#   python telemetry.py fights/
+
+import argparse
+import array
+import glob
+import json
+import os
+import sys
+import time
+
+import i_was_bored
+
+# (열 이름, array 형식 문자)
+COLUMNS = (
+    ("run", "Q"),
+    ("stage", "b"),
+    ("monster", "h"),
+    ("boss", "B"),
+    ("won", "B"),
+    ("turns", "h"),
+    ("damage_in", "i"),
+    ("damage_out", "i"),
+    ("skills_used", "h"),
+    ("hp_after", "i"),
+)
+CHUNK_ROWS = 65536
+NPY_KIND = {"b": "i", "h": "i", "i": "i", "l": "i", "q": "i", "B": "u", "H": "u", "I": "u", "L": "u", "Q": "u",
+            "f": "f", "d": "f"}
+
+# 몬스터 이름 -> 번호 (카탈로그가 같으면 어느 worker 에서나 같다)
+def monster_names(catalog):
+    return sorted({monster.name for monster in catalog.all_monsters})
+
+def npy_descr(values):
+    return f"{'<' if sys.byteorder == 'little' else '>'}{NPY_KIND[values.typecode]}{values.itemsize}"
+
+# .npy 1.0 형식: 매직, 버전, 헤더 길이, 64 바이트로 맞춘 헤더 사전, 날것의 값
+def write_npy(path, values):
+    header = f"{{'descr': '{npy_descr(values)}', 'fortran_order': False, 'shape': ({len(values)},), }}"
+    header += " " * (63 - (10 + len(header)) % 64) + "\n"
+    with open(path, "wb") as f:
+        f.write(b"\x93NUMPY\x01\x00")
+        f.write(len(header).to_bytes(2, "little"))
+        f.write(header.encode("latin1"))
+        values.tofile(f)
+
+# 시간 순으로 정렬되는 실행 이름
+def new_run_id():
+    now = time.time()
+    return time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f".{int(now * 1e6) % 1000000:06d}-{os.getpid()}"
+
+class TelemetryWriter:
+    def __init__(self, path, part="0", columns=COLUMNS, chunk_rows=CHUNK_ROWS, categories=None, run=""):
+        self.path = path
+        self.part = part
+        self.run = run
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.categories = categories or {}
+        self.chunks = []
+        self.buffers = [array.array(code) for _, code in columns]
+        self.rows = 0
+        os.makedirs(path, exist_ok=True)
+
+    def append(self, *row):
+        for buffer, value in zip(self.buffers, row):
+            buffer.append(value)
+        self.rows += 1
+        if self.rows == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        chunk = f"{self.part}-{len(self.chunks):05d}"
+        os.makedirs(os.path.join(self.path, chunk), exist_ok=True)
+        for (name, code), buffer in zip(self.columns, self.buffers):
+            write_npy(os.path.join(self.path, chunk, name + ".npy"), buffer)
+        self.chunks.append([chunk, self.rows])
+        self.buffers = [array.array(code) for _, code in self.columns]
+        self.rows = 0
+        self.write_manifest()
+
+    # 조각을 다 쓴 뒤에만 목록에 올리므로 도중에 멈춰도 읽을 수 있다
+    def write_manifest(self):
+        manifest = {"run": self.run, "columns": [list(column) for column in self.columns],
+                    "categories": self.categories, "chunks": self.chunks}
+        path = os.path.join(self.path, self.part + ".json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        self.flush()
+        self.write_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# 판 하나의 전투를 사건으로 지켜보다가 전투가 끝날 때마다 한 행을 쓴다
+class FightRecorder:
+    def __init__(self, writer, game):
+        self.writer = writer
+        self.game = game
+        self.codes = {name: i for i, name in enumerate(writer.categories["monster"])}
+        self.damage_in = self.damage_out = self.skills_used = 0
+        game.events.subscribe(i_was_bored.DamageTaken, self.on_damage)
+        game.events.subscribe(i_was_bored.SkillCast, self.on_skill)
+        game.events.subscribe(i_was_bored.BattleEnded, self.on_battle)
+
+    def on_damage(self, event):
+        if event.target is self.game.player:
+            self.damage_in += event.amount
+        else:
+            self.damage_out += event.amount
+
+    def on_skill(self, event):
+        if event.caster is self.game.player:
+            self.skills_used += 1
+
+    def on_battle(self, event):
+        self.writer.append(self.game.seed, event.stage, self.codes[event.monster.name], event.monster.is_boss,
+                           event.won, event.turns, self.damage_in, self.damage_out, self.skills_used,
+                           int(event.player.current_health))
+        self.damage_in = self.damage_out = self.skills_used = 0
+
+def fight_writer(path, part, catalog, chunk_rows=CHUNK_ROWS, run=""):
+    return TelemetryWriter(path, part, chunk_rows=chunk_rows, categories={"monster": monster_names(catalog)},
+                           run=run)
+
+# run 을 주지 않으면 폴더에서 가장 최근 실행의 part 만 읽는다 (runs 에 폴더의 모든 실행 이름)
+class TelemetryReader:
+    def __init__(self, path, run=None):
+        self.path = path
+        manifests = []
+        for manifest_path in sorted(glob.glob(os.path.join(path, "*.json"))):
+            with open(manifest_path, encoding="utf-8") as f:
+                manifests.append(json.load(f))
+        if not manifests:
+            raise FileNotFoundError(f"{path} 에 기록이 없다")
+        self.runs = sorted({manifest.get("run", "") for manifest in manifests})
+        self.run = self.runs[-1] if run is None else run
+        self.manifests = [manifest for manifest in manifests if manifest.get("run", "") == self.run]
+        if not self.manifests:
+            raise FileNotFoundError(f"{path} 에 실행 {run!r} 의 기록이 없다")
+        self.columns = [name for name, _ in self.manifests[0]["columns"]]
+        self.categories = self.manifests[0]["categories"]
+        self.rows = sum(rows for manifest in self.manifests for _, rows in manifest["chunks"])
+
+    # 조각마다 {열 이름: 메모리 매핑된 배열} (columns 를 주면 그 열만 연다)
+    def chunks(self, columns=None):
+        import numpy as np
+        for manifest in self.manifests:
+            for chunk, rows in manifest["chunks"]:
+                yield {name: np.load(os.path.join(self.path, chunk, name + ".npy"), mmap_mode="r")
+                       for name in columns or self.columns}
+
+    # 한 열 전체 (조각을 이어 붙이므로 이때만 복사한다)
+    def column(self, name):
+        import numpy as np
+        return np.concatenate([chunk[name] for chunk in self.chunks([name])])
+
+# 장별 전투 수, 승률, 평균 턴, 평균 받은/준 피해
+def stage_summary(reader):
+    import numpy as np
+    totals = np.zeros((5, 11))
+    for chunk in reader.chunks(["stage", "won", "turns", "damage_in", "damage_out"]):
+        stage = chunk["stage"]
+        totals[0] += np.bincount(stage, minlength=11)
+        for i, name in enumerate(("won", "turns", "damage_in", "damage_out"), 1):
+            totals[i] += np.bincount(stage, weights=chunk[name], minlength=11)
+    return totals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전투 기록 요약")
+    parser.add_argument("path")
+    parser.add_argument("--run", help="읽을 실행 이름 (기본: 가장 최근)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reader = TelemetryReader(args.path, args.run)
+    totals = stage_summary(reader)
+    print(f"실행 {reader.run}: 전투 {reader.rows}개, 조각 {sum(len(m['chunks']) for m in reader.manifests)}개, "
+          f"{time.perf_counter() - start:.2f}s" + (f" (다른 실행 {len(reader.runs) - 1}개는 읽지 않음)" if len(reader.runs) > 1 else "") + "\n")
+    print("장     전투     승률    평균턴  받은피해   준피해")
+    for stage in range(1, 11):
+        fights = totals[0][stage]
+        if fights:
+            won, turns, damage_in, damage_out = totals[1:, stage] / fights
+            print(f"{stage:>2} {int(fights):>8} {won:>8.1%} {turns:>9.2f} {damage_in:>9.1f} {damage_out:>8.1f}")
@@ -0,0 +1,272 @@
+# 몬스터 능력치 자동 조정
+# 장마다 그 장 몬스터(보스 포함)의 능력치(기본: 생명, 공격)에 곱할 배율 하나를 찾아
+# 기준 정책의 장별 돌파율(그 장에 도달한 판 중 돌파한 비율)을 목표에 맞춘다.
+# 돌파율은 앞 장들에만 달려 있으므로 1장부터 차례로 정하고, 한 장을 잴 때는 그 장을 넘기면 판을 멈춘다.
+# 한 장 안에서는 배율을 로그 눈금의 구간으로 좁혀 간다: 구간 안의 여러 배율을 동시에(병렬로) 재고,
+# 목표보다 확실히 쉬운(돌파율 - z*표준오차 > 목표) 가장 큰 배율과 확실히 어려운 가장 작은 배율로 구간을 줄인다.
+# 어느 쪽도 확실하지 않으면 판 수를 두 배로 늘려 다시 잰다.
+# 모든 후보가 같은 seed 들로 돌기 때문에(공통 난수) 배율 사이의 차이가 잡음에 덜 묻힌다.
+# 평가 결과는 (정책, 조정 필드, 그 장까지의 배율) 로 기억하고, 판 수를 늘릴 때는 모자란 seed 만 더 돌린다.
+# --cache 파일은 콘텐츠 파일과 게임/정책 코드의 해시가 같을 때만 다시 쓴다.
+#
+#   python tuner.py --policy greedy -o tuned/
+#   python simulate.py --content tuned/
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import i_was_bored
+import simulate
+
+FIELDS = ("max_health", "attack", "defense", "evasion", "critical", "gold")
+DEFAULT_FIELDS = ("max_health", "attack")
+# 장별 목표 돌파율
+TARGETS = {1: 0.95, 2: 0.93, 3: 0.9, 4: 0.88, 5: 0.85, 6: 0.82, 7: 0.8, 8: 0.77, 9: 0.74, 10: 0.7}
+MIN_SCALE = 0.25
+MAX_SCALE = 4.0
+# 판 결과를 바꿀 수 있는 코드 (게임, 정책, 이 파일)
+CODE_MODULES = ("i_was_bored", "simulate", "loadout", "search_ai", "fight_odds", "tuner")
+
+# 배율을 곱한 몬스터 행 (정수였던 값은 정수로, 생명과 공격은 1 이상으로)
+def scaled_rows(rows, multipliers, fields):
+    scaled = []
+    for row in rows:
+        row = dict(row)
+        k = multipliers[row["stage"] - 1] if row["stage"] <= len(multipliers) else 1.0
+        for field in fields:
+            value = row[field] * k
+            value = round(value) if isinstance(row[field], int) else round(value, 2)
+            row[field] = max(value, 1) if field in ("max_health", "attack") else value
+        scaled.append(row)
+    return scaled
+
+def base_content(content):
+    return i_was_bored.load_content(content) if content else {}
+
+# worker 마다 배율별 카탈로그를 하나씩 만들어 둔다
+_catalogs = {}
+
+def catalog_for(content, multipliers, fields):
+    key = (content, multipliers, fields)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        if len(_catalogs) >= 64:
+            _catalogs.clear()
+        base = base_content(content)
+        rows = base.get("monsters") or simulate.catalog_for(content).export_content()["monsters"]
+        catalog = _catalogs[key] = i_was_bored.Catalog(dict(base, monsters=scaled_rows(rows, multipliers, fields)),
+                                                       validate=False)
+    return catalog
+
+# 파일 내용의 해시 (없는 파일은 건너뛴다)
+def files_digest(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f"\0{os.path.basename(path)}\0".encode() + f.read())
+    return digest.hexdigest()
+
+def code_digest():
+    here = os.path.dirname(os.path.abspath(__file__))
+    return files_digest([os.path.join(here, name + ".py") for name in CODE_MODULES])
+
+def content_digest(content):
+    if not content:
+        return None
+    return files_digest([os.path.join(content, table + ".json") for table in i_was_bored.CONTENT_TABLES])
+
+# last_stage 를 넘기면 멈추는 한 판 (도달한 장, 돌파한 장)
+def play_until(game, last_stage):
+    flow = game.run()
+    try:
+        request = next(flow)
+        while game.stage <= last_stage:
+            request = flow.send(game.decider.decide(game, request.kind, request.options, request.subject))
+    except StopIteration:
+        pass
+    flow.close()
+    return min(game.stage, last_stage), min(game.stage - 1, last_stage)
+
+def run_seeds(args):
+    policy, content, fields, multipliers, seed, start, stop = args
+    catalog = catalog_for(content, multipliers, fields)
+    reached, cleared = Counter(), Counter()
+    for i in range(start, stop):
+        game = i_was_bored.Game(headless=True, decider=simulate.POLICIES[policy](seed + i), seed=seed + i,
+                                catalog=catalog)
+        last_reached, last_cleared = play_until(game, len(multipliers))
+        reached.update(range(1, last_reached + 1))
+        cleared.update(range(1, last_cleared + 1))
+    return multipliers, stop - start, reached, cleared
+
+class Evaluations:
+    def __init__(self, policy, fields, content=None, seed=0, workers=None, chunk_size=50, cache=None):
+        self.policy = policy
+        self.fields = tuple(fields)
+        self.content = content
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.pool = None
+        # 배율 튜플 -> {"runs", "reached", "cleared"}
+        self.results = {}
+        self.games = 0
+        if cache and os.path.exists(cache):
+            with open(cache, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved["key"] == self.key():
+                for key, value in saved["results"].items():
+                    self.results[tuple(json.loads(key))] = {
+                        "runs": value["runs"],
+                        "reached": Counter({int(stage): n for stage, n in value["reached"].items()}),
+                        "cleared": Counter({int(stage): n for stage, n in value["cleared"].items()}),
+                    }
+
+    def key(self):
+        return [self.policy, list(self.fields), self.content, self.seed, content_digest(self.content), code_digest()]
+
+    # 배율마다 적어도 runs 판을 돌린 결과를 갖춘다 (모자란 seed 만 병렬로 더 돌린다)
+    def ensure(self, candidates, runs):
+        tasks = []
+        for multipliers in candidates:
+            result = self.results.setdefault(multipliers, {"runs": 0, "reached": Counter(), "cleared": Counter()})
+            for start in range(result["runs"], runs, self.chunk_size):
+                tasks.append((self.policy, self.content, self.fields, multipliers, self.seed,
+                              start, min(start + self.chunk_size, runs)))
+        if not tasks:
+            return
+        if self.workers == 1:
+            parts = map(run_seeds, tasks)
+        else:
+            # worker 의 배율별 카탈로그(_catalogs)를 다음 회에도 쓰도록 pool 을 한 번만 만든다
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            parts = self.pool.map(run_seeds, tasks)
+        for multipliers, count, reached, cleared in parts:
+            result = self.results[multipliers]
+            result["runs"] += count
+            result["reached"].update(reached)
+            result["cleared"].update(cleared)
+            self.games += count
+        self.save()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save(self):
+        if not self.cache:
+            return
+        saved = {"key": self.key(),
+                 "results": {json.dumps(list(k)): {"runs": v["runs"], "reached": v["reached"], "cleared": v["cleared"]}
+                             for k, v in self.results.items()}}
+        with open(self.cache + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(saved, f)
+        os.replace(self.cache + ".tmp", self.cache)
+
+    # (돌파율, 표준오차, 도달 판 수)
+    def clear_rate(self, multipliers, stage):
+        result = self.results[multipliers]
+        reached = result["reached"][stage]
+        if not reached:
+            return 0.0, 1.0, 0
+        rate = result["cleared"][stage] / reached
+        # 0 이나 1 이 나와도 구간이 닫히지 않게 반 판을 더해 어림한다
+        p = (result["cleared"][stage] + 0.5) / (reached + 1)
+        return rate, math.sqrt(p * (1 - p) / reached), reached
+
+# 앞 장 배율(fixed)을 고정하고 이 장의 배율과 마지막에 쓴 판 수를 찾는다
+def tune_stage(evals, fixed, stage, target, samples=400, max_samples=6400, width=4, z=2.0, tolerance=0.05,
+               max_rounds=12, log=print):
+    lo, hi = math.log(MIN_SCALE), math.log(MAX_SCALE)
+    runs = None
+    for round_number in range(max_rounds):
+        scales = [round(math.exp(lo + (hi - lo) * (i + 1) / (width + 1)), 3) for i in range(width)]
+        candidates = [fixed + (k,) for k in scales]
+        if runs is None:
+            # 앞 장이 고정이고 seed 가 같으므로 이 장에 도달하는 판 수는 후보마다 같다
+            evals.ensure(candidates[:1], samples)
+            reach = evals.clear_rate(candidates[0], stage)[2] / samples
+            runs = math.ceil(samples / max(reach, 0.01))
+        evals.ensure(candidates, runs)
+        new_lo, new_hi = lo, hi
+        rows = []
+        for k, multipliers in zip(scales, candidates):
+            rate, error, reached = evals.clear_rate(multipliers, stage)
+            rows.append(f"x{k:.3f} {rate:.1%}±{error:.1%}")
+            if rate - z * error > target:
+                new_lo = max(new_lo, math.log(k))
+            elif rate + z * error < target:
+                new_hi = min(new_hi, math.log(k))
+        log(f"  {stage}장 {round_number + 1}회 ({runs}판): " + ", ".join(rows))
+        if (new_lo, new_hi) == (lo, hi):
+            # 구간 안이 모두 목표와 구별되지 않는다: 판 수를 늘려 다시 잰다
+            if runs * 2 > max_samples / max(reach, 0.01):
+                break
+            runs *= 2
+            continue
+        lo, hi = new_lo, new_hi
+        if hi - lo < tolerance:
+            break
+    return round(math.exp((lo + hi) / 2), 3), runs
+
+def tune(evals, targets, stages=range(1, 11), log=print, **options):
+    fixed = ()
+    for stage in stages:
+        while len(fixed) < stage - 1:
+            fixed += (1.0,)
+        k, runs = tune_stage(evals, fixed, stage, targets[stage], log=log, **options)
+        fixed += (k,)
+        evals.ensure([fixed], runs)
+        rate, error, _ = evals.clear_rate(fixed, stage)
+        log(f"{stage}장 배율 x{k:.3f}: 돌파율 {rate:.1%}±{error:.1%} (목표 {targets[stage]:.0%})")
+    return fixed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="장별 목표 돌파율에 맞춰 몬스터 능력치 배율을 찾는다")
+    parser.add_argument("--policy", choices=sorted(simulate.POLICIES), default="greedy")
+    parser.add_argument("--content", help="기본 콘텐츠 대신 조정할 콘텐츠 폴더")
+    parser.add_argument("--fields", default=",".join(DEFAULT_FIELDS), help=f"배율을 곱할 필드 ({','.join(FIELDS)})")
+    parser.add_argument("--targets", help="1장부터의 목표 돌파율 (쉼표로 구분, 10개)")
+    parser.add_argument("--stages", type=int, default=10, help="1장부터 몇 장까지 조정할지")
+    parser.add_argument("--samples", type=int, default=400, help="한 후보를 처음 잴 때 그 장에 도달시킬 판 수")
+    parser.add_argument("--max-samples", type=int, default=6400)
+    parser.add_argument("--width", type=int, default=4, help="한 번에 재는 후보 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", help="평가 결과를 저장해 두고 다음 실행에서 다시 쓸 파일")
+    parser.add_argument("-o", "--output", help="조정한 monsters.json 을 쓸 폴더")
+    args = parser.parse_args()
+
+    fields = tuple(args.fields.split(","))
+    unknown = set(fields) - set(FIELDS)
+    if unknown:
+        parser.error(f"알 수 없는 필드 {sorted(unknown)}")
+    targets = dict(TARGETS)
+    if args.targets:
+        targets = {stage: float(rate) for stage, rate in enumerate(args.targets.split(","), 1)}
+
+    start = time.perf_counter()
+    with Evaluations(args.policy, fields, args.content, args.seed, args.workers, cache=args.cache) as evals:
+        multipliers = tune(evals, targets, range(1, args.stages + 1), samples=args.samples,
+                           max_samples=args.max_samples, width=args.width)
+    print(f"\n배율 {list(multipliers)}, {evals.games}판, {time.perf_counter() - start:.1f}s")
+    if args.output:
+        rows = catalog_for(args.content, multipliers, fields).export_content()["monsters"]
+        i_was_bored.save_content({"monsters": rows}, args.output)
+        print(f"-> {os.path.join(args.output, 'monsters.json')}")